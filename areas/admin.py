@@ -6,10 +6,12 @@ class ServiceAreaAdmin(admin.ModelAdmin):
     list_display = ['name', 'city', 'phone', 'is_active', 'created_at']
     list_filter = ['is_active', 'city', 'created_at']
     search_fields = ['name', 'phone', 'email', 'city']
+    readonly_fields = ['slug', 'review_count', 'avg_rating']
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
     list_display = ['customer_name', 'platform', 'rating', 'service_area', 'is_featured', 'date']
+    list_select_related = ['service_area']
     list_filter = ['platform', 'rating', 'is_featured', 'service_area', 'date']
     search_fields = ['customer_name', 'review_text']
 
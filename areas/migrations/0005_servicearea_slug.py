@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+from areas.slugs import area_slug
+
+
+def populate_slugs(apps, schema_editor):
+    ServiceArea = apps.get_model('areas', 'ServiceArea')
+    seen = set()
+    for area in ServiceArea.objects.order_by('pk'):
+        slug = area_slug(area.name, area.pk, seen.__contains__)
+        seen.add(slug)
+        ServiceArea.objects.filter(pk=area.pk).update(slug=slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('areas', '0004_servicearea_reddit_url_servicearea_trustpilot_url_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicearea',
+            name='slug',
+            field=models.SlugField(db_index=False, editable=False, max_length=100, null=True),
+        ),
+        migrations.RunPython(populate_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='servicearea',
+            name='slug',
+            field=models.SlugField(editable=False, help_text='URL slug, kept in sync with the name', max_length=100, unique=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:04
+
+from django.db import migrations, models
+from django.db.models import Avg, Count
+
+
+def populate_rating_summary(apps, schema_editor):
+    ServiceArea = apps.get_model('areas', 'ServiceArea')
+    Review = apps.get_model('areas', 'Review')
+    stats = (Review.objects
+             .filter(service_area__isnull=False)
+             .values('service_area_id')
+             .annotate(avg_rating=Avg('rating'), review_count=Count('id')))
+    for row in stats:
+        ServiceArea.objects.filter(pk=row['service_area_id']).update(
+            review_count=row['review_count'],
+            avg_rating=round(row['avg_rating'], 2)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('areas', '0005_servicearea_slug'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicearea',
+            name='avg_rating',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=3),
+        ),
+        migrations.AddField(
+            model_name='servicearea',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_rating_summary, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,16 @@
 from django.db import models
+from django.db.models import Avg, Count
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.utils.text import slugify
 from phonenumber_field.modelfields import PhoneNumberField
 from core.constants import RATING_CHOICES, PLATFORM_CHOICES
 
+from .slugs import area_slug, base_slug, slug_matches_name
+
 
 class ServiceArea(models.Model):
     name = models.CharField(max_length=100, db_index=True)
+    slug = models.SlugField(max_length=100, unique=True, editable=False, help_text="URL slug, kept in sync with the name")
     phone = PhoneNumberField(region='CA')
     email = models.EmailField()
     address = models.TextField()
@@ -21,6 +25,8 @@ class ServiceArea(models.Model):
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     is_active = models.BooleanField(default=True, db_index=True)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    avg_rating = models.DecimalField(max_digits=3, decimal_places=2, default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -29,14 +35,45 @@ class ServiceArea(models.Model):
         verbose_name = 'Service Area'
         verbose_name_plural = 'Service Areas'
 
-
-
     def __str__(self):
         return self.name
 
+    def _slug_taken(self, slug):
+        return ServiceArea.objects.filter(slug=slug).exclude(pk=self.pk).exists()
+
+    def clean(self):
+        super().clean()
+        # Renaming onto another area's URL is an editing mistake; save() would quietly add -<pk>
+        if slug_matches_name(self.slug, self.name):
+            return
+        slug = base_slug(self.name)
+        if slug and self._slug_taken(slug):
+            raise ValidationError({'name': f'Another service area already uses the URL "/{slug}/".'})
+
+    def save(self, *args, **kwargs):
+        # Keep the slug in sync with the name so location URLs follow renames
+        self.slug = area_slug(self.name, self.pk, self._slug_taken, current=self.slug)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'slug'}
+        super().save(*args, **kwargs)
+
     def get_absolute_url(self):
         from django.urls import reverse
-        return reverse('location_home', kwargs={'location_slug': slugify(self.name)})
+        return reverse('location_home', kwargs={'location_slug': self.slug})
+
+    @classmethod
+    def refresh_rating_summary(cls, area_id):
+        """Recompute the denormalized review count and average rating for an area"""
+        stats = Review.objects.filter(service_area_id=area_id).aggregate(
+            avg_rating=Avg('rating'),
+            review_count=Count('id')
+        )
+        # update() rather than save() so the slug index is not invalidated
+        cls.objects.filter(pk=area_id).update(
+            review_count=stats['review_count'],
+            avg_rating=round(stats['avg_rating'] or 0, 2)
+        )
 
 
 class Review(models.Model):
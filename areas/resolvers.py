@@ -0,0 +1,57 @@
+"""
+Slug resolution for location pages.
+
+Keeps a process-local slug -> id map of active service areas so that
+/<location_slug>/ pages resolve with a single primary key lookup. The map
+is dropped by the ServiceArea save/delete signals (see areas.signals).
+"""
+import threading
+
+from django.http import Http404
+
+from .models import ServiceArea
+
+_lock = threading.Lock()
+_slug_index = None
+
+
+def _load_slug_index():
+    return dict(ServiceArea.objects.filter(is_active=True).values_list('slug', 'id'))
+
+
+def get_area_id_for_slug(location_slug):
+    """Return the id of the active area for a slug, or None"""
+    global _slug_index
+    index = _slug_index
+    if index is None:
+        with _lock:
+            if _slug_index is None:
+                _slug_index = _load_slug_index()
+            index = _slug_index
+    return index.get(location_slug)
+
+
+def invalidate_slug_index():
+    """Drop the slug map; it is rebuilt on the next lookup"""
+    global _slug_index
+    with _lock:
+        _slug_index = None
+
+
+def get_service_area_by_slug(location_slug):
+    """Find the active ServiceArea for a location slug or raise Http404"""
+    area_id = get_area_id_for_slug(location_slug)
+    if area_id is not None:
+        area = ServiceArea.objects.filter(pk=area_id, slug=location_slug, is_active=True).first()
+        if area is not None:
+            return area
+        # The area was renamed or deactivated in another worker
+        invalidate_slug_index()
+
+    # Areas created in another worker are not in our map yet; the indexed
+    # slug column keeps this fallback cheap
+    area = ServiceArea.objects.filter(slug=location_slug, is_active=True).first()
+    if area is None:
+        raise Http404("Service area not found")
+    invalidate_slug_index()
+    return area
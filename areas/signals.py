@@ -0,0 +1,29 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import ServiceArea, Review
+from .resolvers import invalidate_slug_index
+
+
+@receiver(post_save, sender=ServiceArea)
+@receiver(post_delete, sender=ServiceArea)
+def service_area_changed(sender, **kwargs):
+    invalidate_slug_index()
+
+
+@receiver(pre_save, sender=Review)
+def remember_review_area(sender, instance, **kwargs):
+    """Keep the previous area so a review moved between areas updates both summaries"""
+    instance._previous_service_area_id = None
+    if instance.pk:
+        instance._previous_service_area_id = (
+            Review.objects.filter(pk=instance.pk).values_list('service_area_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    area_ids = {instance.service_area_id, getattr(instance, '_previous_service_area_id', None)}
+    for area_id in area_ids - {None}:
+        ServiceArea.refresh_rating_summary(area_id)
@@ -0,0 +1,46 @@
+"""
+URL slugs for service areas.
+
+A slug follows the area's name. When the name's slug is empty or already
+used by another area it is disambiguated with the primary key
+(`{slug}-{pk}`, `area-{pk}`), or a counter for an area that has no pk
+yet; an existing slug that is still valid for
+the name is kept, so re-saving a disambiguated area doesn't change its
+URL. Shared by ServiceArea.save() and the migration that backfilled the
+slugs, so it only depends on the name, pk and a lookup callback.
+"""
+import re
+from itertools import chain, count
+
+from django.utils.text import slugify
+
+SLUG_MAX_LENGTH = 100
+
+
+def base_slug(name):
+    return slugify(name)[:SLUG_MAX_LENGTH]
+
+
+def slug_matches_name(slug, name):
+    """True when slug is the name's slug or one of its disambiguated forms"""
+    if not slug:
+        return False
+    base = base_slug(name) or 'area'
+    return slug == base or re.fullmatch(rf'{re.escape(base)}-\d+', slug) is not None
+
+
+def area_slug(name, pk, is_taken, current=None):
+    """
+    Slug for an area with this name. is_taken(slug) says whether another
+    area already uses a slug.
+    """
+    if slug_matches_name(current, name) and not is_taken(current):
+        return current
+    base = base_slug(name) or (f'area-{pk}' if pk is not None else 'area')
+    if not is_taken(base):
+        return base
+    suffixes = [pk] if pk is not None else []
+    for suffix in chain(suffixes, count(2)):
+        slug = f'{base[:SLUG_MAX_LENGTH - len(str(suffix)) - 1]}-{suffix}'
+        if not is_taken(slug):
+            return slug
@@ -1,7 +1,6 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import Http404
-from django.utils.text import slugify
 from .models import ServiceArea, Review, TrustBadge
+from .resolvers import get_service_area_by_slug
 from services.models import Service, Testimonial
 from bookings.models import Booking, ContactMessage
 from django.contrib import messages
@@ -14,13 +13,6 @@ from core.email_utils import (
 )
 from main.forms import BookingForm, ContactForm
 
-def get_service_area_by_slug(location_slug):
-    """Find ServiceArea by matching slugified name"""
-    for area in ServiceArea.objects.filter(is_active=True):
-        if slugify(area.name) == location_slug:
-            return area
-    raise Http404("Service area not found")
-
 def location_home(request, location_slug=None):
     if location_slug:
         service_area = get_service_area_by_slug(location_slug)
@@ -34,15 +26,9 @@ def location_home(request, location_slug=None):
     reviews = Review.objects.filter(service_area=service_area, is_featured=True)[:3] if service_area else []
     trust_badges = TrustBadge.objects.filter(is_active=True)
     
-    # Calculate average rating
-    avg_rating = 0
-    total_reviews = Review.objects.filter(service_area=service_area).count() if service_area else 0
-    if total_reviews > 0:
-        avg_rating = sum([r.rating for r in Review.objects.filter(service_area=service_area)]) / total_reviews
-    
-    # Add slug to service_area for template URLs
-    if service_area:
-        service_area.slug = slugify(service_area.name)
+    # Rating summary is denormalized onto the area by the Review signals
+    avg_rating = float(service_area.avg_rating) if service_area else 0
+    total_reviews = service_area.review_count if service_area else 0
     
     context = {
         'service_area': service_area,
@@ -61,10 +47,6 @@ def location_services(request, location_slug):
     emergency_services = Service.objects.filter(is_emergency=True)
     regular_services = Service.objects.filter(is_emergency=False)
     
-    # Add slug to service_area for template URLs
-    if service_area:
-        service_area.slug = slugify(service_area.name)
-    
     context = {
         'service_area': service_area,
         'services': services,
@@ -103,7 +85,7 @@ def location_booking(request, location_slug):
                 success_message = f'Booking request submitted successfully for {service_area.name}! Create an account in our Customer Portal at {portal_link} to track your booking status. We will contact you soon to confirm your appointment.'
             
             messages.success(request, success_message)
-            return redirect('location_booking', location_slug=slugify(service_area.name))
+            return redirect('location_booking', location_slug=service_area.slug)
         else:
             # Form has validation errors
             messages.error(request, 'Please correct the errors below and try again.')
@@ -112,10 +94,6 @@ def location_booking(request, location_slug):
     
     services = Service.objects.all()
     
-    # Add slug to service_area for template URLs
-    if service_area:
-        service_area.slug = slugify(service_area.name)
-    
     context = {
         'service_area': service_area,
         'services': services,
@@ -153,17 +131,13 @@ def location_contact(request, location_slug):
                 success_message = f'Message sent successfully from {service_area.name}! Create an account in our Customer Portal at {portal_link} to track communications. We will get back to you soon.'
             
             messages.success(request, success_message)
-            return redirect('location_contact', location_slug=slugify(service_area.name))
+            return redirect('location_contact', location_slug=service_area.slug)
         else:
             # Form has validation errors
             messages.error(request, 'Please correct the errors below and try again.')
     else:
         form = ContactForm()
     
-    # Add slug to service_area for template URLs
-    if service_area:
-        service_area.slug = slugify(service_area.name)
-    
     context = {
         'service_area': service_area,
         'form': form
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import BlogPost
+from .models import BlogPost, Tag
 
 
 @admin.register(BlogPost)
@@ -8,4 +8,10 @@ class BlogPostAdmin(admin.ModelAdmin):
     list_filter = ['category', 'is_published', 'is_featured', 'created_at']
     search_fields = ['title', 'content']
     prepopulated_fields = {'slug': ('title',)}
-    readonly_fields = ['views']
\ No newline at end of file
+    readonly_fields = ['views']
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug']
+    search_fields = ['name', 'slug']
@@ -3,4 +3,10 @@ from django.apps import AppConfig
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'blog'
\ No newline at end of file
+    name = 'blog'
+    def ready(self):
+        from django.core.signals import request_finished
+
+        from . import signals  # noqa: F401
+        from .view_counter import flush_views_if_due
+        request_finished.connect(flush_views_if_due, dispatch_uid='blog_flush_views_if_due')
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:05
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# Frozen copies of the names in blog.search, which may change after this migration
+FTS_TABLE = 'blog_blogpost_fts'
+MYSQL_FULLTEXT_INDEX = 'blog_post_fulltext_idx'
+POSTGRES_SEARCH_INDEX = 'blog_post_search_idx'
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(title, excerpt, content, tags)'
+            )
+        except OperationalError:
+            # SQLite built without FTS5: search falls back to icontains
+            return
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content, tags) '
+            f'SELECT id, title, excerpt, content, tags FROM blog_blogpost'
+        )
+    elif vendor == 'mysql':
+        schema_editor.execute(
+            f'ALTER TABLE blog_blogpost ADD FULLTEXT INDEX {MYSQL_FULLTEXT_INDEX} (title, excerpt, content, tags)'
+        )
+    elif vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+        BlogPost = apps.get_model('blog', 'BlogPost')
+        # Must match blog.search.search_vector() for searches to use the index
+        vector = (
+            SearchVector('title', weight='A', config='english')
+            + SearchVector('excerpt', 'tags', weight='B', config='english')
+            + SearchVector('content', weight='C', config='english')
+        )
+        schema_editor.add_index(BlogPost, GinIndex(vector, name=POSTGRES_SEARCH_INDEX))
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif vendor == 'mysql':
+        schema_editor.execute(f'ALTER TABLE blog_blogpost DROP INDEX {MYSQL_FULLTEXT_INDEX}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {POSTGRES_SEARCH_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:40
+
+from itertools import combinations
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils.text import slugify
+
+# Frozen copies of blog.related as of this migration
+TAG_WEIGHT = 3
+SERVICE_WEIGHT = 2
+AREA_WEIGHT = 1
+RELATED_POSTS_STORED = 10
+
+
+def parse_tags(raw):
+    tags = {}
+    for name in raw.split(','):
+        name = name.strip()
+        slug = slugify(name)[:60]
+        if slug and slug not in tags:
+            tags[slug] = name[:50]
+    return tags
+
+
+def backfill_tags_and_relations(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    Tag = apps.get_model('blog', 'Tag')
+    RelatedPost = apps.get_model('blog', 'RelatedPost')
+
+    posts = list(BlogPost.objects.all())
+    tags = {}
+    post_tags = {}
+    for post in posts:
+        parsed = parse_tags(post.tags)
+        for slug, name in parsed.items():
+            if slug not in tags:
+                tags[slug] = Tag.objects.create(slug=slug, name=name)
+        post.tag_index.set([tags[slug] for slug in parsed])
+        post_tags[post.pk] = set(parsed)
+
+    scores = {post.pk: {} for post in posts}
+    for a, b in combinations(posts, 2):
+        score = TAG_WEIGHT * len(post_tags[a.pk] & post_tags[b.pk])
+        if a.related_service_id and a.related_service_id == b.related_service_id:
+            score += SERVICE_WEIGHT
+        if a.related_area_id and a.related_area_id == b.related_area_id:
+            score += AREA_WEIGHT
+        if score:
+            scores[a.pk][b.pk] = score
+            scores[b.pk][a.pk] = score
+
+    links = []
+    for post_id, related in scores.items():
+        best = sorted(related.items(), key=lambda item: (item[1], item[0]), reverse=True)[:RELATED_POSTS_STORED]
+        links.extend(RelatedPost(post_id=post_id, related_id=other_id, score=score) for other_id, score in best)
+    RelatedPost.objects.bulk_create(links, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_blogpost_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('slug', models.SlugField(max_length=60, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='tag_index',
+            field=models.ManyToManyField(blank=True, editable=False, help_text='Normalized copy of tags, kept in sync on save', related_name='posts', to='blog.tag'),
+        ),
+        migrations.CreateModel(
+            name='RelatedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='blog.blogpost')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.blogpost')),
+            ],
+            options={
+                'ordering': ['-score'],
+                'indexes': [models.Index(fields=['post', '-score'], name='blog_related_score_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relatedpost',
+            constraint=models.UniqueConstraint(fields=('post', 'related'), name='blog_related_post_unique'),
+        ),
+        migrations.RunPython(backfill_tags_and_relations, migrations.RunPython.noop),
+    ]
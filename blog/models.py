@@ -5,6 +5,20 @@ from services.models import Service
 from areas.models import ServiceArea
 
 
+class Tag(models.Model):
+    name = models.CharField(max_length=50)
+    slug = models.SlugField(max_length=60, unique=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    def get_absolute_url(self):
+        return f"{reverse('blog:blog_list')}?tag={self.slug}"
+
+
 class BlogPost(models.Model):
     CATEGORY_CHOICES = [
         ('diy', 'DIY Tips'),
@@ -25,6 +39,13 @@ class BlogPost(models.Model):
     meta_title = models.CharField(max_length=60, blank=True, help_text="SEO title")
     meta_description = models.CharField(max_length=160, blank=True, help_text="SEO description")
     tags = models.CharField(max_length=200, blank=True, help_text="Comma-separated tags")
+    tag_index = models.ManyToManyField(
+        Tag,
+        blank=True,
+        editable=False,
+        related_name='posts',
+        help_text="Normalized copy of tags, kept in sync on save"
+    )
     is_published = models.BooleanField(default=False)
     is_featured = models.BooleanField(default=False)
     views = models.PositiveIntegerField(default=0)
@@ -47,7 +68,29 @@ class BlogPost(models.Model):
         super().save(*args, **kwargs)
     
     def get_absolute_url(self):
-        return reverse('blog_detail', kwargs={'slug': self.slug})
+        return reverse('blog:blog_detail', kwargs={'slug': self.slug})
     
     def get_tags_list(self):
-        return [tag.strip() for tag in self.tags.split(',') if tag.strip()]
\ No newline at end of file
+        return [tag.strip() for tag in self.tags.split(',') if tag.strip()]
+
+
+class RelatedPost(models.Model):
+    """
+    Precomputed relation between two posts, stored in both directions and
+    scored by shared tags, service and area (see blog.related)
+    """
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='related_links')
+    related = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='+')
+    score = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['-score']
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'related'], name='blog_related_post_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['post', '-score'], name='blog_related_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.post} -> {self.related} ({self.score})"
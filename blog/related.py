@@ -0,0 +1,193 @@
+"""
+Normalized tags and precomputed related posts.
+
+BlogPost.tags stays the editable comma-separated field; on save it is
+mirrored into Tag rows (BlogPost.tag_index) and the related posts are
+recomputed. Two posts are related when they share something:
+
+    score = 3 * shared tags + 2 * same related service + 1 * same related area
+
+Only each post's RELATED_POSTS_STORED best links are kept (highest score,
+newest post first), so RelatedPost grows linearly with the number of
+posts and the detail page reads its recommendations with one indexed
+lookup. A few more are stored than shown so that unpublished posts can be
+skipped at read time.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils.text import slugify
+
+from .models import BlogPost, RelatedPost, Tag
+
+TAG_WEIGHT = 3
+SERVICE_WEIGHT = 2
+AREA_WEIGHT = 1
+
+RELATED_POSTS_SHOWN = 3
+RELATED_POSTS_STORED = 10
+
+
+def parse_tags(raw):
+    """Map tag slug -> display name for a comma-separated tag string"""
+    tags = {}
+    for name in raw.split(','):
+        name = name.strip()
+        slug = slugify(name)[:60]
+        if slug and slug not in tags:
+            tags[slug] = name[:50]
+    return tags
+
+
+def get_or_create_tags(parsed):
+    """Tag rows for {slug: name}, creating the missing ones in bulk"""
+    if not parsed:
+        return []
+    existing = {tag.slug: tag for tag in Tag.objects.filter(slug__in=parsed)}
+    missing = [Tag(slug=slug, name=name) for slug, name in parsed.items() if slug not in existing]
+    if missing:
+        Tag.objects.bulk_create(missing, ignore_conflicts=True)
+        existing = {tag.slug: tag for tag in Tag.objects.filter(slug__in=parsed)}
+    return list(existing.values())
+
+
+def sync_tags(post):
+    post.tag_index.set(get_or_create_tags(parse_tags(post.tags)))
+
+
+def score_related(post):
+    """Return {post_id: score} for every other post sharing a tag, service or area"""
+    scores = Counter()
+    Through = BlogPost.tag_index.through
+
+    tag_ids = Through.objects.filter(blogpost_id=post.pk).values_list('tag_id', flat=True)
+    shared = (
+        Through.objects.filter(tag_id__in=list(tag_ids))
+        .exclude(blogpost_id=post.pk)
+        .values_list('blogpost_id', flat=True)
+    )
+    for other_id in shared:
+        scores[other_id] += TAG_WEIGHT
+
+    match = Q()
+    if post.related_service_id:
+        match |= Q(related_service_id=post.related_service_id)
+    if post.related_area_id:
+        match |= Q(related_area_id=post.related_area_id)
+    if match:
+        others = (
+            BlogPost.objects.filter(match)
+            .exclude(pk=post.pk)
+            .values_list('pk', 'related_service_id', 'related_area_id')
+        )
+        for other_id, service_id, area_id in others:
+            if post.related_service_id and service_id == post.related_service_id:
+                scores[other_id] += SERVICE_WEIGHT
+            if post.related_area_id and area_id == post.related_area_id:
+                scores[other_id] += AREA_WEIGHT
+    return scores
+
+
+def top_related(scores, limit=RELATED_POSTS_STORED):
+    """The best [(post_id, score)], ties going to the newer (higher id) post"""
+    return sorted(scores.items(), key=lambda item: (item[1], item[0]), reverse=True)[:limit]
+
+
+def write_links(post_id, scores):
+    RelatedPost.objects.bulk_create([
+        RelatedPost(post_id=post_id, related_id=other_id, score=score) for other_id, score in top_related(scores)
+    ])
+
+
+def refresh_outgoing(post_ids):
+    """Recompute the stored links of these posts from scratch"""
+    for post in BlogPost.objects.filter(pk__in=post_ids):
+        RelatedPost.objects.filter(post_id=post.pk).delete()
+        write_links(post.pk, score_related(post))
+
+
+def trim_links(post_ids, limit=RELATED_POSTS_STORED):
+    """Drop links beyond each post's best `limit`"""
+    kept = {}
+    extra = []
+    links = (
+        RelatedPost.objects.filter(post_id__in=post_ids)
+        .order_by('post_id', '-score', '-related_id')
+        .values_list('id', 'post_id')
+    )
+    for link_id, post_id in links:
+        kept[post_id] = kept.get(post_id, 0) + 1
+        if kept[post_id] > limit:
+            extra.append(link_id)
+    if extra:
+        RelatedPost.objects.filter(id__in=extra).delete()
+
+
+def refresh_related_posts(post):
+    """
+    Rewrite one post's links and fix up the other posts' lists: the ones
+    that linked to it are recomputed (its score may have dropped), the
+    ones it now beats the weakest stored link of get a link to it.
+    """
+    scores = score_related(post)
+    with transaction.atomic():
+        linked_from = set(linking_posts(post.pk))
+        RelatedPost.objects.filter(Q(post_id=post.pk) | Q(related_id=post.pk)).delete()
+        write_links(post.pk, scores)
+        refresh_outgoing(linked_from)
+
+        candidates = {other_id: score for other_id, score in scores.items() if other_id not in linked_from}
+        stats = {
+            row['post_id']: row
+            for row in RelatedPost.objects.filter(post_id__in=list(candidates))
+            .values('post_id').annotate(count=Count('id'), weakest=Min('score')).order_by()
+        }
+        gained = [
+            other_id for other_id, score in candidates.items()
+            if other_id not in stats
+            or stats[other_id]['count'] < RELATED_POSTS_STORED
+            or score >= stats[other_id]['weakest']
+        ]
+        RelatedPost.objects.bulk_create([
+            RelatedPost(post_id=other_id, related_id=post.pk, score=candidates[other_id]) for other_id in gained
+        ])
+        trim_links(gained)
+
+
+def linking_posts(post_id):
+    return list(RelatedPost.objects.filter(related_id=post_id).values_list('post_id', flat=True))
+
+
+def rebuild_all():
+    """Resync every post's tags and relations; returns the number of posts processed"""
+    count = 0
+    with transaction.atomic():
+        RelatedPost.objects.all().delete()
+        posts = list(BlogPost.objects.all())
+        for post in posts:
+            sync_tags(post)
+        links = []
+        for post in posts:
+            links.extend(
+                RelatedPost(post_id=post.pk, related_id=other_id, score=score)
+                for other_id, score in top_related(score_related(post))
+            )
+            count += 1
+        RelatedPost.objects.bulk_create(links, batch_size=1000)
+    return count
+
+
+def get_related_posts(post, limit=RELATED_POSTS_SHOWN):
+    """Best scored published posts for the detail page, falling back to the same category"""
+    links = (
+        RelatedPost.objects.filter(post=post, related__is_published=True)
+        .select_related('related')
+        .order_by('-score', '-related__created_at')[:limit]
+    )
+    related = [link.related for link in links]
+    if related:
+        return related
+    return list(
+        BlogPost.objects.filter(is_published=True, category=post.category).exclude(id=post.id)[:limit]
+    )
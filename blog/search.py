@@ -0,0 +1,165 @@
+"""
+Full-text search for blog posts.
+
+The backend follows the database in use:
+
+* MySQL: FULLTEXT index on (title, excerpt, content, tags), queried with
+  MATCH ... AGAINST in natural language mode.
+* PostgreSQL: GIN index on the weighted to_tsvector() of the same
+  columns, ranked with ts_rank.
+* SQLite: FTS5 table blog_blogpost_fts whose rowid is the post id, kept
+  in sync by blog.signals and ranked with bm25().
+* Anything else (or SQLite without FTS5): icontains over title and content.
+
+The indexes are created by migration 0002_blogpost_search_index.
+search_posts() keeps the ?search= semantics of the listing: it narrows a
+BlogPost queryset and orders it by relevance.
+"""
+import re
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'blog_blogpost_fts'
+MYSQL_FULLTEXT_INDEX = 'blog_post_fulltext_idx'
+POSTGRES_SEARCH_INDEX = 'blog_post_search_idx'
+SEARCH_COLUMNS = ('title', 'excerpt', 'content', 'tags')
+
+# SQLite ranks in Python-side order over a bounded id list, taken after
+# the queryset's own filters so unpublished matches can't crowd it out
+MAX_RANKED_RESULTS = 500
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_vector():
+    """Weighted vector shared by the PostgreSQL index and queries, so the index is usable"""
+    from django.contrib.postgres.search import SearchVector
+    return (
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('excerpt', 'tags', weight='B', config='english')
+        + SearchVector('content', weight='C', config='english')
+    )
+
+
+_fts_checked_aliases = set()
+
+
+def sqlite_fts_available(using=None):
+    """Whether the FTS5 table exists (it is skipped when SQLite lacks FTS5)"""
+    conn = connection if using is None else using
+    if conn.alias in _fts_checked_aliases:
+        return True
+    with conn.cursor() as cursor:
+        available = FTS_TABLE in conn.introspection.table_names(cursor)
+    if available:
+        _fts_checked_aliases.add(conn.alias)
+    return available
+
+
+def fts_query(search):
+    """Quote each word as an FTS5 prefix term so user input can't break the MATCH syntax"""
+    return ' '.join(f'"{word}"*' for word in WORD_RE.findall(search))
+
+
+def order_by_ids(queryset, ids):
+    if not ids:
+        return queryset.none()
+    ordering = Case(
+        *[When(id=post_id, then=Value(position)) for position, post_id in enumerate(ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(id__in=ids).order_by(ordering)
+
+
+def _search_sqlite(queryset, search):
+    match = fts_query(search)
+    if not match:
+        return queryset.none()
+    try:
+        candidates, candidate_params = (
+            queryset.order_by().values('id').query.get_compiler(connection=connection).as_sql()
+        )
+    except EmptyResultSet:
+        return queryset.none()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid IN ({candidates}) '
+            f'ORDER BY bm25({FTS_TABLE}, 10.0, 4.0, 1.0, 4.0) LIMIT %s',
+            [match, *candidate_params, MAX_RANKED_RESULTS],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    return order_by_ids(queryset, ids)
+
+
+def _search_mysql(queryset, search):
+    table = queryset.model._meta.db_table
+    columns = ', '.join(f'{table}.{column}' for column in SEARCH_COLUMNS)
+    rank = RawSQL(f'MATCH ({columns}) AGAINST (%s IN NATURAL LANGUAGE MODE)', (search,))
+    return queryset.annotate(search_rank=rank).filter(search_rank__gt=0).order_by('-search_rank', '-created_at')
+
+
+def _search_postgresql(queryset, search):
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+    query = SearchQuery(search, config='english', search_type='websearch')
+    vector = search_vector()
+    return (
+        queryset.annotate(search_document=vector, search_rank=SearchRank(vector, query))
+        .filter(search_document=query)
+        .order_by('-search_rank', '-created_at')
+    )
+
+
+def _search_fallback(queryset, search):
+    return queryset.filter(Q(title__icontains=search) | Q(content__icontains=search))
+
+
+def search_posts(queryset, search):
+    """Filter a BlogPost queryset to posts matching search, best matches first"""
+    search = (search or '').strip()
+    if not search:
+        return queryset
+    vendor = connection.vendor
+    if vendor == 'mysql':
+        return _search_mysql(queryset, search)
+    if vendor == 'postgresql':
+        return _search_postgresql(queryset, search)
+    if vendor == 'sqlite' and sqlite_fts_available():
+        return _search_sqlite(queryset, search)
+    return _search_fallback(queryset, search)
+
+
+# SQLite FTS5 maintenance; MySQL and PostgreSQL maintain their indexes themselves
+
+def index_post(post):
+    if connection.vendor != 'sqlite' or not sqlite_fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content, tags) VALUES (%s, %s, %s, %s, %s)',
+            [post.pk, post.title, post.excerpt, post.content, post.tags],
+        )
+
+
+def unindex_post(post_id):
+    if connection.vendor != 'sqlite' or not sqlite_fts_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+
+def rebuild_search_index(using=None):
+    """Repopulate the SQLite FTS5 table from blog_blogpost; returns the number of posts indexed"""
+    conn = connection if using is None else using
+    if conn.vendor != 'sqlite' or not sqlite_fts_available(conn):
+        return 0
+    with conn.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content, tags) '
+            f'SELECT id, title, excerpt, content, tags FROM blog_blogpost'
+        )
+        return cursor.rowcount
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .models import BlogPost
+from .related import linking_posts, refresh_outgoing, refresh_related_posts, sync_tags
+from .search import index_post, unindex_post
+
+# Fields that feed the related-post score
+RELATION_FIELDS = {'tags', 'related_service', 'related_area'}
+
+
+@receiver(post_save, sender=BlogPost)
+def blog_post_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    index_post(instance)
+    if update_fields is None or RELATION_FIELDS & set(update_fields):
+        sync_tags(instance)
+        refresh_related_posts(instance)
+
+
+@receiver(pre_delete, sender=BlogPost)
+def blog_post_deleting(sender, instance, **kwargs):
+    instance._linked_from = linking_posts(instance.pk)
+
+
+@receiver(post_delete, sender=BlogPost)
+def blog_post_deleted(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+    # Posts that recommended it get their next best post instead
+    refresh_outgoing(getattr(instance, '_linked_from', []))
@@ -1,3 +1,78 @@
+from unittest import mock
+
 from django.test import TestCase
+from redis.exceptions import ConnectionError, ResponseError
+
+from . import search, view_counter
+from .models import BlogPost
+from .search import search_posts
+from .view_counter import LocalViewCounter, RedisViewCounter
+
+
+class LocalViewCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.post = BlogPost.objects.create(
+            title='Frozen pipes', excerpt='Winter tips', content='Keep the heat on.', category='seasonal',
+            is_published=True,
+        )
+
+    def views(self):
+        return BlogPost.objects.get(pk=self.post.pk).views
+
+    def test_counting_a_view_does_not_query(self):
+        counter = LocalViewCounter(flush_interval=0)
+        with self.assertNumQueries(0):
+            self.assertEqual(counter.incr(self.post.pk), 1)
+            self.assertEqual(counter.incr(self.post.pk), 2)
+        self.assertEqual(self.views(), 0)
+
+    def test_flush_waits_for_the_interval(self):
+        counter = LocalViewCounter(flush_interval=3600)
+        counter.incr(self.post.pk)
+        self.assertEqual(counter.flush_if_due(), 0)
+        self.assertEqual(counter.flush(), 1)
+        self.assertEqual(self.views(), 1)
+
+    def test_detail_page_flushes_after_the_response(self):
+        counter = LocalViewCounter(flush_interval=0)
+        with mock.patch.object(view_counter, '_counter', counter):
+            response = self.client.get(self.post.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.views(), 1)
+        self.assertFalse(counter._counts)
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for title in ('Frozen pipes', 'Frozen pipes again', 'Frozen pipes thaw'):
+            BlogPost.objects.create(title=title, excerpt='Frozen', content='Frozen pipes', category='seasonal')
+        cls.published = BlogPost.objects.create(
+            title='Winter tips', excerpt='Cold weather', content='Frozen pipes burst.', category='seasonal',
+            is_published=True,
+        )
+
+    def test_filters_apply_before_the_ranking_limit(self):
+        published = BlogPost.objects.filter(is_published=True)
+        with mock.patch.object(search, 'MAX_RANKED_RESULTS', 2):
+            self.assertEqual(list(search_posts(published, 'frozen')), [self.published])
+
+
+class RedisViewCounterFlushTests(TestCase):
+    def counter_with_client(self, client):
+        counter = RedisViewCounter.__new__(RedisViewCounter)
+        counter.key = 'blog:views'
+        counter.get_client = lambda: client
+        return counter
+
+    def test_missing_buffer_is_nothing_to_flush(self):
+        client = mock.Mock()
+        client.rename.side_effect = ResponseError('no such key')
+        self.assertEqual(self.counter_with_client(client).flush(), 0)
 
-# Create your tests here.
+    def test_connection_errors_are_not_swallowed(self):
+        client = mock.Mock()
+        client.rename.side_effect = ConnectionError('connection refused')
+        with self.assertLogs('blog.view_counter', 'ERROR'), self.assertRaises(ConnectionError):
+            self.counter_with_client(client).flush()
@@ -0,0 +1,162 @@
+"""
+Write-behind view counter for blog posts.
+
+Reading a post never writes to the database. Views are counted with an
+atomic HINCRBY in Redis when the default cache is a django_redis backend, or in a
+per-process accumulator otherwise, and applied to BlogPost.views in
+batches with F() expressions: by the flush_blog_views command for Redis,
+and by the accumulating process itself every BLOG_VIEW_FLUSH_INTERVAL
+seconds (and at exit) for the in-process buffer. The in-process flush
+runs from request_finished, after the response has been sent, so it
+never adds to a blog page's queries.
+"""
+import atexit
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from core.cache_utils import uses_redis
+
+from .models import BlogPost
+
+logger = logging.getLogger(__name__)
+
+
+def apply_view_counts(counts):
+    """Add {post_id: views} to BlogPost.views, one UPDATE per distinct increment"""
+    ids_by_increment = defaultdict(list)
+    for post_id, increment in counts.items():
+        if increment > 0:
+            ids_by_increment[increment].append(post_id)
+    with transaction.atomic():
+        for increment, post_ids in ids_by_increment.items():
+            BlogPost.objects.filter(id__in=post_ids).update(views=F('views') + increment)
+    return sum(counts.values())
+
+
+class RedisViewCounter:
+    def __init__(self, alias='default'):
+        self.alias = alias
+        prefix = settings.CACHES[alias].get('KEY_PREFIX', '')
+        self.key = f'{prefix}:blog:views' if prefix else 'blog:views'
+
+    def get_client(self):
+        from django_redis import get_redis_connection
+        return get_redis_connection(self.alias)
+
+    def incr(self, post_id):
+        """Count one view; returns the views buffered for the post so far"""
+        return self.get_client().hincrby(self.key, post_id, 1)
+
+    def flush_if_due(self):
+        # flush_blog_views applies the Redis buffer
+        return 0
+
+    def flush(self):
+        from redis.exceptions import ResponseError
+
+        client = self.get_client()
+        # Move the hash aside so views counted during the flush go to a fresh one
+        flushing_key = f'{self.key}:flushing:{uuid.uuid4().hex}'
+        try:
+            client.rename(self.key, flushing_key)
+        except ResponseError:
+            # "no such key": no views buffered since the last flush
+            return 0
+        except Exception as e:
+            logger.error(f"Error moving the blog view buffer aside for flushing: {e}")
+            raise
+        counts = {int(post_id): int(count) for post_id, count in client.hgetall(flushing_key).items()}
+        try:
+            flushed = apply_view_counts(counts)
+        except Exception:
+            # Put the counts back so the next flush retries them
+            pipe = client.pipeline()
+            for post_id, count in counts.items():
+                pipe.hincrby(self.key, post_id, count)
+            pipe.delete(flushing_key)
+            pipe.execute()
+            raise
+        client.delete(flushing_key)
+        return flushed
+
+
+class LocalViewCounter:
+    def __init__(self, flush_interval=None):
+        self.flush_interval = flush_interval if flush_interval is not None else getattr(
+            settings, 'BLOG_VIEW_FLUSH_INTERVAL', 60
+        )
+        self._counts = defaultdict(int)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def incr(self, post_id):
+        with self._lock:
+            self._counts[post_id] += 1
+            return self._counts[post_id]
+
+    def flush_if_due(self):
+        with self._lock:
+            due = self._counts and time.monotonic() - self._last_flush >= self.flush_interval
+        return self.flush() if due else 0
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, defaultdict(int)
+            self._last_flush = time.monotonic()
+        if not counts:
+            return 0
+        try:
+            return apply_view_counts(counts)
+        except Exception as e:
+            logger.error(f"Error flushing blog view counts: {e}")
+            with self._lock:
+                for post_id, count in counts.items():
+                    self._counts[post_id] += count
+            return 0
+
+
+_counter = None
+_counter_lock = threading.Lock()
+
+
+def get_counter():
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                if uses_redis():
+                    _counter = RedisViewCounter()
+                else:
+                    _counter = LocalViewCounter()
+                    atexit.register(_counter.flush)
+    return _counter
+
+
+def record_view(post_id):
+    """Count a view without touching the database; returns the views not yet flushed"""
+    try:
+        return get_counter().incr(post_id)
+    except Exception as e:
+        logger.warning(f"Could not record view for blog post {post_id}: {e}")
+        return 0
+
+
+def flush_views():
+    return get_counter().flush()
+
+
+def flush_views_if_due(**kwargs):
+    """request_finished receiver applying the in-process buffer once per flush interval"""
+    if _counter is None:
+        return
+    try:
+        _counter.flush_if_due()
+    except Exception as e:
+        logger.error(f"Error flushing blog view counts: {e}")
@@ -1,18 +1,23 @@
 from django.shortcuts import render, get_object_or_404
 from django.core.paginator import Paginator
-from django.db.models import Q
-from .models import BlogPost
+from .models import BlogPost, Tag
+from .related import get_related_posts
+from .search import search_posts
+from .view_counter import record_view
 
 
 def blog_list(request):
     posts = BlogPost.objects.filter(is_published=True)
     category = request.GET.get('category')
+    tag = request.GET.get('tag')
     search = request.GET.get('search')
     
     if category:
         posts = posts.filter(category=category)
+    if tag:
+        posts = posts.filter(tag_index__slug=tag)
     if search:
-        posts = posts.filter(Q(title__icontains=search) | Q(content__icontains=search))
+        posts = search_posts(posts, search)
     
     paginator = Paginator(posts, 6)
     page = request.GET.get('page')
@@ -26,19 +31,17 @@ def blog_list(request):
         'categories': categories,
         'featured_posts': featured_posts,
         'current_category': category,
+        'current_tag': Tag.objects.filter(slug=tag).first() if tag else None,
         'search_query': search,
     })
 
 
 def blog_detail(request, slug):
     post = get_object_or_404(BlogPost, slug=slug, is_published=True)
-    post.views += 1
-    post.save(update_fields=['views'])
+    # Counted write-behind; show the views that are still buffered too
+    post.views += record_view(post.id)
     
-    related_posts = BlogPost.objects.filter(
-        is_published=True,
-        category=post.category
-    ).exclude(id=post.id)[:3]
+    related_posts = get_related_posts(post)
     
     return render(request, 'blog/blog_detail.html', {
         'post': post,
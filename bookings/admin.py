@@ -5,6 +5,7 @@ from .models import Booking, ContactMessage
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
     list_display = ['customer_name', 'service', 'service_area', 'urgency', 'preferred_date', 'status', 'is_confirmed', 'created_at']
+    list_select_related = ['service', 'service_area']
     list_filter = ['urgency', 'status', 'is_confirmed', 'created_at', 'service', 'service_area']
     search_fields = ['customer_name', 'email', 'phone']
     readonly_fields = ['created_at']
@@ -61,14 +62,15 @@ class BookingAdmin(admin.ModelAdmin):
     mark_in_progress.short_description = "Mark selected bookings as in progress"
     
     def changelist_view(self, request, extra_context=None):
-        from core.models import AdminNotification
+        from core.notifications import get_unread_count
         extra_context = extra_context or {}
-        extra_context['unread_notifications'] = AdminNotification.objects.filter(is_read=False, type='booking').count()
+        extra_context['unread_notifications'] = get_unread_count('booking')
         return super().changelist_view(request, extra_context=extra_context)
 
 @admin.register(ContactMessage)
 class ContactMessageAdmin(admin.ModelAdmin):
     list_display = ['name', 'subject', 'service_area', 'email', 'created_at']
+    list_select_related = ['service_area']
     list_filter = ['created_at', 'service_area']
     search_fields = ['name', 'email', 'subject']
     readonly_fields = ['created_at']
@@ -91,7 +93,7 @@ class ContactMessageAdmin(admin.ModelAdmin):
 
     
     def changelist_view(self, request, extra_context=None):
-        from core.models import AdminNotification
+        from core.notifications import get_unread_count
         extra_context = extra_context or {}
-        extra_context['unread_notifications'] = AdminNotification.objects.filter(is_read=False, type='contact').count()
+        extra_context['unread_notifications'] = get_unread_count('contact')
         return super().changelist_view(request, extra_context=extra_context)
\ No newline at end of file
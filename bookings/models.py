@@ -6,6 +6,16 @@ from areas.models import ServiceArea
 from core.constants import URGENCY_CHOICES
 
 
+def booking_confirmed_for_status(status):
+    """is_confirmed implied by a booking status, or None when the status leaves it unchanged"""
+    # Auto-confirm when status is confirmed, in_progress, or completed
+    if status in ['confirmed', 'in_progress', 'completed']:
+        return True
+    if status in ['pending', 'cancelled']:
+        return False
+    return None
+
+
 class Booking(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -63,6 +73,11 @@ class Booking(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Booking'
         verbose_name_plural = 'Bookings'
+        indexes = [
+            # Customer portal lookups: filter by email or customer, newest first
+            models.Index(fields=['email', 'created_at'], name='booking_email_created_idx'),
+            models.Index(fields=['customer', 'created_at'], name='booking_customer_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.customer_name} - {self.service.name} ({self.get_urgency_display()})"
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import AdminNotification
+from django.utils import timezone
+from .models import AdminNotification, AdminNotificationArchive, EmailOutbox
+from .notifications import mark_notifications_read, mark_notifications_unread
 
 @admin.register(AdminNotification)
 class AdminNotificationAdmin(admin.ModelAdmin):
@@ -10,14 +12,49 @@ class AdminNotificationAdmin(admin.ModelAdmin):
     actions = ['mark_as_read', 'mark_as_unread']
     
     def mark_as_read(self, request, queryset):
-        updated = queryset.update(is_read=True)
+        updated = mark_notifications_read(queryset)
         self.message_user(request, f'{updated} notification(s) marked as read.')
     mark_as_read.short_description = "Mark selected notifications as read"
     
     def mark_as_unread(self, request, queryset):
-        updated = queryset.update(is_read=False)
+        updated = mark_notifications_unread(queryset)
         self.message_user(request, f'{updated} notification(s) marked as unread.')
     mark_as_unread.short_description = "Mark selected notifications as unread"
     
     def get_queryset(self, request):
-        return super().get_queryset(request).order_by('-created_at')
\ No newline at end of file
+        return super().get_queryset(request).order_by('-created_at')
+
+@admin.register(AdminNotificationArchive)
+class AdminNotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ['type', 'title', 'related_id', 'created_at', 'archived_at']
+    list_filter = ['type', 'created_at']
+    search_fields = ['title', 'message']
+    date_hierarchy = 'created_at'
+    show_full_result_count = False
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'recipients', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['subject', 'to']
+    readonly_fields = ['subject', 'body', 'html_body', 'from_email', 'to', 'attempts', 'locked_at',
+                       'last_error', 'created_at', 'sent_at']
+    actions = ['retry_now']
+    
+    def recipients(self, obj):
+        return ', '.join(obj.to)
+    recipients.short_description = "To"
+    
+    def retry_now(self, request, queryset):
+        # Messages a worker is sending right now would be delivered twice
+        updated = queryset.exclude(status__in=['sent', 'sending']).update(
+            status='pending', attempts=0, next_attempt_at=timezone.now(), locked_at=None
+        )
+        self.message_user(request, f'{updated} email(s) queued for another delivery attempt.')
+    retry_now.short_description = "Retry selected emails now"
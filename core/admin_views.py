@@ -1,11 +1,24 @@
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.decorators import user_passes_test
+from django.db import transaction
+from django.utils import timezone
 import json
-from bookings.models import Booking
+from collections import Counter
+from bookings.models import Booking, booking_confirmed_for_status
+from customers.dashboard import invalidate_dashboard
 from quotes.models import QuoteRequest
+from quotes.pricing import REPRICE_STATUSES, reprice_quotes
+from .notification_stream import event_stream
+
+# Most items accepted by one bulk status request
+MAX_BULK_ITEMS = 500
+# Ids beyond the positive bigint range can't be primary keys (and overflow the query)
+MAX_ID = 2 ** 63 - 1
 
 def staff_required(view_func):
     """Decorator to ensure user is staff"""
@@ -15,7 +28,71 @@ def staff_required(view_func):
         return view_func(request, *args, **kwargs)
     return wrapper
 
+def apply_bulk_status(model, items, derived_fields=None):
+    """
+    Apply [{id, status}, ...] with one UPDATE per distinct status inside a
+    single transaction that locks the rows first. derived_fields(status)
+    returns extra columns to set alongside the status. An id may appear only
+    once. Returns one result per item, in order.
+    """
+    valid_statuses = {value for value, label in model.STATUS_CHOICES}
+    results = []
+    for item in items:
+        item_id = item.get('id') if isinstance(item, dict) else None
+        status = item.get('status') if isinstance(item, dict) else None
+        if isinstance(item_id, bool) or not isinstance(item_id, int) or not 0 < item_id <= MAX_ID:
+            results.append({'id': item_id, 'success': False, 'error': 'Invalid id'})
+        elif not isinstance(status, str) or status not in valid_statuses:
+            results.append({'id': item_id, 'success': False, 'error': f'Invalid status: {status}'})
+        else:
+            results.append({'id': item_id, 'success': True, 'status': status})
+
+    seen = Counter(result['id'] for result in results if result['success'])
+    for result in results:
+        if result['success'] and seen[result['id']] > 1:
+            result.update(success=False, error='Duplicate id')
+            del result['status']
+    requested = {result['id']: result['status'] for result in results if result['success']}
+
+    now = timezone.now()
+    with transaction.atomic():
+        owners = dict(
+            model.objects.select_for_update().filter(id__in=requested).values_list('id', 'customer_id')
+        )
+        ids_by_status = {}
+        for item_id, status in requested.items():
+            if item_id in owners:
+                ids_by_status.setdefault(status, []).append(item_id)
+        for status, ids in ids_by_status.items():
+            fields = {'status': status, 'updated_at': now}
+            fields.update(derived_fields(status) if derived_fields else {})
+            model.objects.filter(id__in=ids).update(**fields)
+
+    for result in results:
+        if result['success'] and result['id'] not in owners:
+            result.update(success=False, error='Not found')
+            del result['status']
+
+    # update() skips the save signals that refresh customer dashboards
+    invalidate_dashboard(owners.values())
+    return results
+
+def bulk_status_response(request, model, derived_fields=None):
+    try:
+        items = json.loads(request.body).get('items')
+    except (ValueError, AttributeError):
+        return JsonResponse({'success': False, 'error': 'Invalid JSON body'}, status=400)
+    if not isinstance(items, list) or not items:
+        return JsonResponse({'success': False, 'error': 'Expected a non-empty "items" list'}, status=400)
+    if len(items) > MAX_BULK_ITEMS:
+        return JsonResponse({'success': False, 'error': f'At most {MAX_BULK_ITEMS} items per request'}, status=400)
+
+    results = apply_bulk_status(model, items, derived_fields)
+    updated = sum(1 for result in results if result['success'])
+    return JsonResponse({'success': updated == len(results), 'updated': updated, 'results': results})
+
 @require_http_methods(["PUT"])
+@staff_required
 def booking_status_api(request, booking_id):
     booking = get_object_or_404(Booking, id=booking_id)
     
@@ -23,11 +100,9 @@ def booking_status_api(request, booking_id):
         data = json.loads(request.body)
         booking.status = data.get('status')
         
-        # Auto-confirm when status is confirmed, in_progress, or completed
-        if booking.status in ['confirmed', 'in_progress', 'completed']:
-            booking.is_confirmed = True
-        elif booking.status in ['pending', 'cancelled']:
-            booking.is_confirmed = False
+        is_confirmed = booking_confirmed_for_status(booking.status)
+        if is_confirmed is not None:
+            booking.is_confirmed = is_confirmed
             
         booking.save()
         
@@ -36,6 +111,7 @@ def booking_status_api(request, booking_id):
         return JsonResponse({'success': False, 'error': str(e)}, status=400)
 
 @require_http_methods(["PUT"])
+@staff_required
 def quote_status_api(request, quote_id):
     quote = get_object_or_404(QuoteRequest, id=quote_id)
     
@@ -46,4 +122,64 @@ def quote_status_api(request, quote_id):
         
         return JsonResponse({'success': True, 'message': 'Quote updated successfully'})
     except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)}, status=400)
\ No newline at end of file
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+@require_http_methods(["POST"])
+@staff_required
+def quote_reprice_api(request):
+    """Recompute stored quote estimates from current calculator rates"""
+    try:
+        data = json.loads(request.body or '{}')
+        quotes = QuoteRequest.objects.all()
+        if data.get('service_ids'):
+            quotes = quotes.filter(service_id__in=data['service_ids'])
+        statuses = data.get('statuses', REPRICE_STATUSES)
+        valid_statuses = {value for value, label in QuoteRequest.STATUS_CHOICES}
+        if not isinstance(statuses, (list, tuple)) or not statuses:
+            return JsonResponse({'success': False, 'error': 'statuses must be a non-empty list'}, status=400)
+        invalid = [status for status in statuses if status not in valid_statuses]
+        if invalid:
+            return JsonResponse({'success': False, 'error': f'Invalid status: {invalid[0]}'}, status=400)
+        result = reprice_quotes(quotes, statuses=statuses)
+        return JsonResponse({'success': True, **result})
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+@require_http_methods(["POST"])
+@staff_required
+def booking_bulk_status_api(request):
+    """Update many bookings' status at once: {"items": [{"id": 1, "status": "confirmed"}, ...]}"""
+    def derived_fields(status):
+        is_confirmed = booking_confirmed_for_status(status)
+        return {} if is_confirmed is None else {'is_confirmed': is_confirmed}
+    return bulk_status_response(request, Booking, derived_fields)
+
+@require_http_methods(["POST"])
+@staff_required
+def quote_bulk_status_api(request):
+    """Update many quotes' status at once: {"items": [{"id": 1, "status": "quoted"}, ...]}"""
+    return bulk_status_response(request, QuoteRequest)
+
+async def admin_notification_stream(request):
+    """Server-Sent Events stream of new admin notifications; needs an ASGI server"""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    is_staff = await sync_to_async(lambda: request.user.is_authenticated and request.user.is_staff)()
+    if not is_staff:
+        return JsonResponse({'error': 'Unauthorized'}, status=401)
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would hold a thread for the life of the stream;
+        # 204 tells EventSource not to reconnect
+        return HttpResponse(status=204)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    response = StreamingHttpResponse(event_stream(last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Tell nginx not to buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
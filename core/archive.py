@@ -0,0 +1,73 @@
+"""
+Archival of old admin notifications.
+
+Read notifications older than the retention period are copied into
+AdminNotificationArchive and deleted from AdminNotification in small
+id-ordered batches, each in its own short transaction, so the live
+table is never locked for long and an interrupted run can simply be
+started again. Unread notifications are never archived.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AdminNotification, AdminNotificationArchive
+
+ARCHIVE_BATCH_SIZE = 500
+
+
+def archive_candidates(older_than_days=None):
+    days = settings.ADMIN_NOTIFICATION_RETENTION_DAYS if older_than_days is None else older_than_days
+    cutoff = timezone.now() - timedelta(days=days)
+    return AdminNotification.objects.filter(is_read=True, created_at__lt=cutoff)
+
+
+def archive_batch(ids):
+    """Archive the given notifications if they are still read; returns the number moved"""
+    with transaction.atomic():
+        # Lock the batch so a notification marked unread meanwhile is left alone
+        notifications = list(
+            AdminNotification.objects.select_for_update().filter(id__in=ids, is_read=True).order_by('id')
+        )
+        if not notifications:
+            return 0
+        AdminNotificationArchive.objects.bulk_create([
+            AdminNotificationArchive(
+                original_id=notification.id,
+                type=notification.type,
+                title=notification.title,
+                message=notification.message,
+                related_id=notification.related_id,
+                created_at=notification.created_at,
+            )
+            for notification in notifications
+        ], ignore_conflicts=True)
+        AdminNotification.objects.filter(id__in=[n.id for n in notifications]).delete()
+    return len(notifications)
+
+
+def archive_notifications(older_than_days=None, batch_size=ARCHIVE_BATCH_SIZE, pause=0, dry_run=False):
+    """
+    Move read notifications older than older_than_days (default
+    ADMIN_NOTIFICATION_RETENTION_DAYS) to the archive. pause sleeps
+    between batches to leave room for other writers. Returns the number
+    archived, or the number that would be with dry_run=True.
+    """
+    candidates = archive_candidates(older_than_days)
+    if dry_run:
+        return candidates.count()
+
+    archived = 0
+    last_id = 0
+    while True:
+        ids = list(candidates.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        last_id = ids[-1]
+        archived += archive_batch(ids)
+        if pause:
+            time.sleep(pause)
+    return archived
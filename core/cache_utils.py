@@ -0,0 +1,10 @@
+from django.core.cache import caches
+
+
+def uses_redis(alias='default'):
+    """True when the cache is backed by Redis, so it can be shared by every worker"""
+    try:
+        from django_redis.cache import RedisCache
+    except ImportError:
+        return False
+    return isinstance(caches[alias], RedisCache)
@@ -0,0 +1,52 @@
+"""
+Version counters for cache invalidation.
+
+Cached fragments embed the current version of every model they were built
+from in their cache key. Bumping a version (from a post_save/post_delete
+signal) makes all keys built on the old version unreachable, so nothing
+has to be deleted explicitly and every worker sees the change at once.
+"""
+import time
+
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = 'cache_version'
+
+
+def _version_key(name):
+    return f'{VERSION_KEY_PREFIX}:{name}'
+
+
+def _fresh_version():
+    # Time based so a counter evicted from the cache never restarts at a
+    # value that old fragments were stored under
+    return int(time.time() * 1000)
+
+
+def get_versions(*names):
+    """Return the current version of each name, initialising missing counters"""
+    keys = [_version_key(name) for name in names]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            cache.add(key, _fresh_version(), timeout=None)
+            version = cache.get(key)
+        versions.append(version)
+    return versions
+
+
+def bump_version(name):
+    """Invalidate every fragment built from the named source"""
+    key = _version_key(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_version(), timeout=None)
+
+
+def versioned_key(prefix, *names):
+    """Build a cache key that changes whenever one of the named sources changes"""
+    versions = '.'.join(str(version) for version in get_versions(*names))
+    return f'{prefix}:{versions}'
@@ -2,8 +2,8 @@ def admin_notifications(request):
     """Add unread notification count to admin context"""
     if request.path.startswith('/admin/'):
         try:
-            from core.models import AdminNotification
-            unread_count = AdminNotification.objects.filter(is_read=False).count()
+            from core.notifications import get_unread_count
+            unread_count = get_unread_count()
             return {'unread_notifications_count': unread_count}
         except:
             return {'unread_notifications_count': 0}
@@ -0,0 +1,138 @@
+"""
+Database-backed email outbox.
+
+The web tier calls enqueue_email() and returns immediately; the
+process_email_outbox management command claims due messages, delivers
+them over a shared connection and reschedules failures with exponential
+backoff until they are moved to the dead-letter state.
+"""
+from datetime import timedelta
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.utils import timezone
+
+from .email_sender import BatchEmailSender
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+# Messages stuck in "sending" this long belong to a worker that died
+STALE_LOCK_TIMEOUT = timedelta(minutes=10)
+
+
+def enqueue_email(subject, body, to, html_body='', from_email=None):
+    """Queue an email for delivery by the outbox worker"""
+    return EmailOutbox.objects.create(
+        subject=subject[:255],
+        body=body,
+        html_body=html_body or '',
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+    )
+
+
+def build_message(entry, connection=None):
+    """Turn an outbox row into an EmailMultiAlternatives message"""
+    message = EmailMultiAlternatives(
+        subject=entry.subject,
+        body=entry.body,
+        from_email=entry.from_email,
+        to=entry.to,
+        connection=connection,
+    )
+    if entry.html_body:
+        message.attach_alternative(entry.html_body, "text/html")
+    return message
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt: base * 2^(attempts - 1)"""
+    base = getattr(settings, 'EMAIL_OUTBOX_RETRY_BACKOFF', 60)
+    return timedelta(seconds=base * (2 ** max(attempts - 1, 0)))
+
+
+def release_stale_locks():
+    """
+    Return messages claimed by a crashed worker to the queue. The lost send
+    counts as a failed attempt, so a message that keeps killing the worker
+    is dead-lettered like any other failure instead of being retried forever.
+    """
+    cutoff = timezone.now() - STALE_LOCK_TIMEOUT
+    with transaction.atomic():
+        stale = list(
+            EmailOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='sending', locked_at__lt=cutoff)
+        )
+        for entry in stale:
+            mark_failed(entry, f'Worker stopped while sending (locked since {entry.locked_at:%Y-%m-%d %H:%M:%S})')
+    return len(stale)
+
+
+def claim_batch(batch_size):
+    """Atomically mark up to batch_size due messages as being sent by this worker"""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            EmailOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if ids:
+            EmailOutbox.objects.filter(id__in=ids).update(status='sending', locked_at=now)
+    return list(EmailOutbox.objects.filter(id__in=ids).order_by('next_attempt_at'))
+
+
+def mark_sent(entry):
+    entry.status = 'sent'
+    entry.attempts += 1
+    entry.sent_at = timezone.now()
+    entry.locked_at = None
+    entry.last_error = ''
+    entry.save(update_fields=['status', 'attempts', 'sent_at', 'locked_at', 'last_error'])
+
+
+def mark_failed(entry, error):
+    """Reschedule a failed message, or dead-letter it once it runs out of attempts"""
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    entry.attempts += 1
+    entry.last_error = str(error)
+    entry.locked_at = None
+    if entry.attempts >= max_attempts:
+        entry.status = 'dead'
+        logger.error(f"Email #{entry.id} moved to dead letter after {entry.attempts} attempts: {error}")
+    else:
+        entry.status = 'pending'
+        entry.next_attempt_at = timezone.now() + retry_delay(entry.attempts)
+        logger.warning(f"Email #{entry.id} failed (attempt {entry.attempts}), retrying at {entry.next_attempt_at}: {error}")
+    entry.save(update_fields=['status', 'attempts', 'last_error', 'locked_at', 'next_attempt_at'])
+
+
+def deliver(entries, sender):
+    """Send claimed messages over the sender's shared connection, recording each outcome"""
+    sent = 0
+    for entry in entries:
+        try:
+            sender.send(build_message(entry))
+        except Exception as e:
+            mark_failed(entry, e)
+        else:
+            mark_sent(entry)
+            sent += 1
+    return sent
+
+
+def process_outbox(batch_size=50, sender=None):
+    """Claim and deliver one batch; returns (claimed, sent)"""
+    entries = claim_batch(batch_size)
+    if not entries:
+        return 0, 0
+    if sender is not None:
+        return len(entries), deliver(entries, sender)
+    with BatchEmailSender() as batch_sender:
+        return len(entries), deliver(entries, batch_sender)
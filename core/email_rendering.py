@@ -0,0 +1,71 @@
+"""
+Email rendering service.
+
+Each email type maps to an HTML template and a plain-text template in
+templates/emails/. Templates are looked up and compiled once per process
+and both parts are rendered from the same context, so bulk sends only pay
+for Template.render().
+"""
+import threading
+
+from django.dispatch import receiver
+from django.template.loader import get_template
+from django.utils.autoreload import file_changed
+
+# email type -> (html template, text template); None when the type has no HTML part
+EMAIL_TEMPLATES = {
+    'booking_confirmation': ('emails/booking_confirmation.html', 'emails/booking_confirmation.txt'),
+    'admin_booking_notification': ('emails/admin_booking_notification.html', 'emails/admin_booking_notification.txt'),
+    'contact_confirmation': ('emails/contact_confirmation.html', 'emails/contact_confirmation.txt'),
+    'admin_contact_notification': (None, 'emails/admin_contact_notification.txt'),
+    'quote_confirmation': ('emails/quote_confirmation.html', 'emails/quote_confirmation.txt'),
+    'admin_quote_notification': (None, 'emails/admin_quote_notification.txt'),
+}
+
+
+class EmailRenderer:
+    def __init__(self, templates=None):
+        self.templates = templates or EMAIL_TEMPLATES
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def _get_templates(self, email_type):
+        compiled = self._compiled.get(email_type)
+        if compiled is None:
+            html_name, text_name = self.templates[email_type]
+            compiled = (
+                get_template(html_name) if html_name else None,
+                get_template(text_name),
+            )
+            with self._lock:
+                self._compiled[email_type] = compiled
+        return compiled
+
+    def preload(self):
+        """Compile every known template up front (e.g. when a worker starts)"""
+        for email_type in self.templates:
+            self._get_templates(email_type)
+
+    def clear(self):
+        with self._lock:
+            self._compiled.clear()
+
+    def render(self, email_type, context):
+        """Return (text_content, html_content) for an email type; html is None for text-only types"""
+        html_template, text_template = self._get_templates(email_type)
+        text_content = text_template.render(context).strip() + '\n'
+        html_content = html_template.render(context) if html_template else None
+        return text_content, html_content
+
+
+renderer = EmailRenderer()
+
+
+def render_email(email_type, context):
+    return renderer.render(email_type, context)
+
+
+@receiver(file_changed)
+def clear_compiled_templates(sender, file_path, **kwargs):
+    # Let edited templates show up under runserver without a restart
+    renderer.clear()
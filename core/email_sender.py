@@ -0,0 +1,100 @@
+"""
+Connection-reusing email sender.
+
+Opening an SMTP connection costs a TCP connect, a TLS handshake and a
+login. BatchEmailSender keeps one backend connection open across many
+messages, reconnecting after EMAIL_BATCH_MAX_SIZE messages or once the
+connection has been idle for EMAIL_CONNECTION_IDLE_TIMEOUT seconds.
+Connections opened and messages sent are also counted in the process's
+monitoring.metrics registry, so connection reuse can be graphed.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+from monitoring.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+
+class BatchEmailSender:
+    def __init__(self, max_batch_size=None, idle_timeout=None):
+        self.max_batch_size = max_batch_size or getattr(settings, 'EMAIL_BATCH_MAX_SIZE', 100)
+        self.idle_timeout = idle_timeout if idle_timeout is not None else getattr(
+            settings, 'EMAIL_CONNECTION_IDLE_TIMEOUT', 30
+        )
+        self.connection = None
+        self._sent_on_connection = 0
+        self._last_used = 0.0
+        self.connections_opened = 0
+        self.messages_sent = 0
+        self.messages_failed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def messages_per_connection(self):
+        if not self.connections_opened:
+            return 0.0
+        return self.messages_sent / self.connections_opened
+
+    def stats(self):
+        return {
+            'connections_opened': self.connections_opened,
+            'messages_sent': self.messages_sent,
+            'messages_failed': self.messages_failed,
+            'messages_per_connection': round(self.messages_per_connection, 2),
+        }
+
+    def _get_connection(self):
+        if self.connection is not None and (
+            self._sent_on_connection >= self.max_batch_size or self.is_idle()
+        ):
+            self.close()
+        if self.connection is None:
+            self.connection = get_connection(fail_silently=False)
+            self.connection.open()
+            self.connections_opened += 1
+            registry.observe_email_connection()
+            self._sent_on_connection = 0
+        return self.connection
+
+    def is_idle(self):
+        return self.connection is not None and time.monotonic() - self._last_used > self.idle_timeout
+
+    def close_if_idle(self):
+        if self.is_idle():
+            self.close()
+
+    def close(self):
+        if self.connection is None:
+            return
+        try:
+            self.connection.close()
+        except Exception as e:
+            logger.warning(f"Error closing email connection: {e}")
+        self.connection = None
+
+    def send(self, message):
+        """
+        Send one message over the shared connection. Errors propagate so the
+        caller can record them; the broken connection is dropped first.
+        """
+        connection = self._get_connection()
+        try:
+            connection.send_messages([message])
+        except Exception:
+            self.messages_failed += 1
+            registry.observe_email('failed')
+            self.close()
+            raise
+        self._sent_on_connection += 1
+        self._last_used = time.monotonic()
+        self.messages_sent += 1
+        registry.observe_email('sent')
@@ -1,15 +1,36 @@
 """
 Email utility functions for SPRO Plumbing website
 """
-from django.core.mail import send_mail, EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives
 from django.conf import settings
 from django.utils import timezone
 from datetime import datetime
 import logging
 
+from .email_outbox import enqueue_email
+from .email_rendering import render_email
+
 logger = logging.getLogger(__name__)
 
+def send_email(subject, text_content, recipients, html_content=None):
+    """
+    Queue an email in the outbox, or send it right away when
+    EMAIL_USE_OUTBOX is off (e.g. local development)
+    """
+    if getattr(settings, 'EMAIL_USE_OUTBOX', False):
+        enqueue_email(subject, text_content, recipients, html_body=html_content)
+        return
+    
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=recipients
+    )
+    if html_content:
+        email.attach_alternative(html_content, "text/html")
+    email.send()
+
 def create_admin_notification(notification_type, title, message, related_id):
     """Create admin notification"""
     try:
@@ -28,6 +49,23 @@ def create_admin_notification(notification_type, title, message, related_id):
         # Don't raise the exception to avoid breaking the main flow
         pass
 
+def format_preferred_date(booking):
+    """Format a booking's preferred date for emails, in local time"""
+    if not booking.preferred_date:
+        return "Not specified"
+    try:
+        # Convert to local timezone if timezone-aware
+        if hasattr(booking.preferred_date, 'astimezone'):
+            local_date = timezone.localtime(booking.preferred_date)
+        else:
+            local_date = booking.preferred_date
+        
+        # Format as user-friendly string with date and time
+        return local_date.strftime('%B %d, %Y at %I:%M %p')
+    except Exception as e:
+        logger.warning(f"Error formatting preferred_date: {e}")
+        return str(booking.preferred_date)
+
 def send_booking_confirmation_email(booking):
     """
     Send booking confirmation email to customer
@@ -35,58 +73,12 @@ def send_booking_confirmation_email(booking):
     try:
         subject = f"Booking Confirmation - {booking.service.name} in {booking.service_area.name}"
         
-        # Handle preferred_date formatting
-        preferred_date_str = "Not specified"
-        if booking.preferred_date:
-            try:
-                # Convert to local timezone if timezone-aware
-                if hasattr(booking.preferred_date, 'astimezone'):
-                    local_date = timezone.localtime(booking.preferred_date)
-                else:
-                    local_date = booking.preferred_date
-                
-                # Format as user-friendly string with date and time
-                preferred_date_str = local_date.strftime('%B %d, %Y at %I:%M %p')
-            except Exception as e:
-                logger.warning(f"Error formatting preferred_date: {e}")
-                preferred_date_str = str(booking.preferred_date)
-        
-        # Render HTML email
-        html_content = render_to_string('emails/booking_confirmation.html', {
+        text_content, html_content = render_email('booking_confirmation', {
             'booking': booking,
-            'preferred_date_formatted': preferred_date_str
+            'preferred_date_formatted': format_preferred_date(booking)
         })
         
-        # Create text version (fallback)
-        text_content = f"""
-        Dear {booking.customer_name},
-        
-        Thank you for choosing SPRO Plumbing! We've received your service request for {booking.service.name} in {booking.service_area.name}.
-        
-        Booking Details:
-        - Service: {booking.service.name}
-        - Location: {booking.service_area.name}
-        - Preferred Date: {preferred_date_str}
-        - Urgency: {booking.get_urgency_display()}
-        - Address: {booking.address}
-        
-        Our team will contact you at {booking.phone} within 2 hours to confirm the appointment.
-        
-        For emergencies, call: (647) 551-8342
-        
-        Best regards,
-        SPRO Plumbing Team
-        """
-        
-        # Send email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[booking.email]
-        )
-        email.attach_alternative(html_content, "text/html")
-        email.send()
+        send_email(subject, text_content, [booking.email], html_content)
         
         logger.info(f"Booking confirmation email sent to {booking.email} for booking #{booking.id}")
         return True
@@ -102,35 +94,11 @@ def send_contact_confirmation_email(contact):
     try:
         subject = f"Message Received - {contact.subject}"
         
-        # Render HTML email
-        html_content = render_to_string('emails/contact_confirmation.html', {
+        text_content, html_content = render_email('contact_confirmation', {
             'contact': contact
         })
         
-        # Create text version (fallback)
-        text_content = f"""
-        Dear {contact.name},
-        
-        Thank you for contacting SPRO Plumbing! We've received your message about "{contact.subject}" and will get back to you within 24 hours.
-        
-        Your Message:
-        {contact.message}
-        
-        For urgent emergencies, call: (647) 551-8342
-        
-        Best regards,
-        SPRO Plumbing Team
-        """
-        
-        # Send email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[contact.email]
-        )
-        email.attach_alternative(html_content, "text/html")
-        email.send()
+        send_email(subject, text_content, [contact.email], html_content)
         
         logger.info(f"Contact confirmation email sent to {contact.email}")
         return True
@@ -150,58 +118,14 @@ def send_admin_booking_notification(booking):
         else:
             subject = f"New Booking - {booking.service.name} in {booking.service_area.name}"
         
-        # Handle preferred_date formatting
-        preferred_date_str = "Not specified"
-        if booking.preferred_date:
-            try:
-                # Convert to local timezone if timezone-aware
-                if hasattr(booking.preferred_date, 'astimezone'):
-                    local_date = timezone.localtime(booking.preferred_date)
-                else:
-                    local_date = booking.preferred_date
-                
-                # Format as user-friendly string with date and time
-                preferred_date_str = local_date.strftime('%B %d, %Y at %I:%M %p')
-            except Exception as e:
-                logger.warning(f"Error formatting preferred_date: {e}")
-                preferred_date_str = str(booking.preferred_date)
-        
-        # Render HTML email
-        html_content = render_to_string('emails/admin_booking_notification.html', {
+        text_content, html_content = render_email('admin_booking_notification', {
             'booking': booking,
-            'preferred_date_formatted': preferred_date_str
+            'preferred_date_formatted': format_preferred_date(booking)
         })
         
-        # Create text version for admin
-        urgency_text = "🚨 EMERGENCY" if booking.service.is_emergency else booking.get_urgency_display()
-        text_content = f"""
-        NEW BOOKING ALERT - SPRO Plumbing
-        
-        Customer: {booking.customer_name}
-        Phone: {booking.phone}
-        Email: {booking.email}
-        Service: {booking.service.name}
-        Location: {booking.service_area.name}
-        Urgency: {urgency_text}
-        Preferred Date: {preferred_date_str}
-        Address: {booking.address}
-        
-        Description: {booking.description or 'No description provided'}
-        
-        ACTION REQUIRED: Call customer at {booking.phone}
-        """
-        
         # Send to admin email
         admin_email = getattr(settings, 'ADMIN_EMAIL', 'admin@sproplumbing.com')
-        
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[admin_email]
-        )
-        email.attach_alternative(html_content, "text/html")
-        email.send()
+        send_email(subject, text_content, [admin_email], html_content)
         
         logger.info(f"Admin notification email sent for booking #{booking.id}")
         
@@ -227,31 +151,14 @@ def send_admin_contact_notification(contact):
         service_area_name = contact.service_area.name if contact.service_area else 'Unknown Location'
         subject = f"New Contact Message - {contact.subject} from {service_area_name}"
         
-        text_content = f"""
-        NEW CONTACT MESSAGE - SPRO Plumbing
-        
-        Name: {contact.name}
-        Email: {contact.email}
-        Phone: {contact.phone or 'Not provided'}
-        Location: {service_area_name}
-        Subject: {contact.subject}
-        
-        Message:
-        {contact.message}
-        
-        Submitted: {contact.created_at.strftime('%B %d, %Y at %I:%M %p')}
-        """
+        text_content, _ = render_email('admin_contact_notification', {
+            'contact': contact,
+            'service_area_name': service_area_name
+        })
         
         # Send to admin email
         admin_email = getattr(settings, 'ADMIN_EMAIL', 'admin@sproplumbing.com')
-        
-        send_mail(
-            subject=subject,
-            message=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[admin_email],
-            fail_silently=False
-        )
+        send_email(subject, text_content, [admin_email])
         
         logger.info(f"Admin contact notification email sent for message from {contact.email}")
         
@@ -276,39 +183,11 @@ def send_quote_confirmation_email(quote_request):
     try:
         subject = f"Quote Request Confirmation - {quote_request.service.name}"
         
-        # Render HTML email
-        html_content = render_to_string('emails/quote_confirmation.html', {
+        text_content, html_content = render_email('quote_confirmation', {
             'quote_request': quote_request
         })
         
-        # Create text version (fallback)
-        text_content = f"""
-        Dear {quote_request.customer_name},
-        
-        Thank you for choosing SPRO Plumbing! We've received your quote request for {quote_request.service.name}.
-        
-        Quote Details:
-        - Service: {quote_request.service.name}
-        - Estimated Total: ${quote_request.estimated_total:.2f}
-        - Address: {quote_request.address}
-        
-        Our team will contact you at {quote_request.phone} within 24 hours with a detailed quote.
-        
-        For emergencies, call: (647) 551-8342
-        
-        Best regards,
-        SPRO Plumbing Team
-        """
-        
-        # Send email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[quote_request.email]
-        )
-        email.attach_alternative(html_content, "text/html")
-        email.send()
+        send_email(subject, text_content, [quote_request.email], html_content)
         
         logger.info(f"Quote confirmation email sent to {quote_request.email} for quote #{quote_request.id}")
         return True
@@ -324,34 +203,13 @@ def send_admin_quote_notification(quote_request):
     try:
         subject = f"New Quote Request - {quote_request.service.name}"
         
-        # Create text version for admin
-        text_content = f"""
-        NEW QUOTE REQUEST - SPRO Plumbing
-        
-        Customer: {quote_request.customer_name}
-        Phone: {quote_request.phone}
-        Email: {quote_request.email}
-        Service: {quote_request.service.name}
-        Estimated Total: ${quote_request.estimated_total:.2f}
-        Address: {quote_request.address}
-        
-        Selected Options: {', '.join([str(opt) for opt in quote_request.selected_options]) if quote_request.selected_options else 'None'}
-        
-        Notes: {quote_request.notes or 'No notes provided'}
-        
-        ACTION REQUIRED: Call customer at {quote_request.phone} within 24 hours
-        """
+        text_content, _ = render_email('admin_quote_notification', {
+            'quote_request': quote_request
+        })
         
         # Send to admin email
         admin_email = getattr(settings, 'ADMIN_EMAIL', 'admin@sproplumbing.com')
-        
-        send_mail(
-            subject=subject,
-            message=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[admin_email],
-            fail_silently=False
-        )
+        send_email(subject, text_content, [admin_email])
         
         logger.info(f"Admin quote notification email sent for quote #{quote_request.id}")
         
@@ -0,0 +1,73 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from areas.models import ServiceArea
+from bookings.models import Booking, ContactMessage
+from core.email_rendering import EMAIL_TEMPLATES, EmailRenderer
+from quotes.models import QuoteRequest
+from services.models import Service
+
+
+def sample_contexts():
+    """Unsaved sample objects so the benchmark needs no database rows"""
+    now = timezone.now()
+    service = Service(name='Burst Pipe Repair', price_range='$200 - $500', is_emergency=True)
+    area = ServiceArea(name='Toronto', phone='+16475518342', email='toronto@sproplumbing.com',
+                       address='123 King Street West\nToronto, ON')
+    booking = Booking(id=1, customer_name='Jane Doe', email='jane@example.com', phone='+16475550199',
+                      address='456 Emergency Lane, Toronto', service=service, service_area=area,
+                      urgency='emergency', preferred_date=now + timedelta(days=1),
+                      description='Basement flooding from a burst pipe.', created_at=now)
+    contact = ContactMessage(id=1, name='Mike Johnson', email='mike@example.com', phone='+16475550177',
+                             subject='Water heater quote', message='Can you quote a tankless unit?',
+                             service_area=area, created_at=now)
+    quote = QuoteRequest(id=1, service=service, customer_name='Sam Lee', email='sam@example.com',
+                         phone='+16475550111', address='1 Main Street', selected_options=[1, 2],
+                         estimated_total=Decimal('349.50'), notes='Evenings preferred')
+    booking_context = {'booking': booking, 'preferred_date_formatted': 'tomorrow'}
+    return {
+        'booking_confirmation': booking_context,
+        'admin_booking_notification': booking_context,
+        'contact_confirmation': {'contact': contact},
+        'admin_contact_notification': {'contact': contact, 'service_area_name': area.name},
+        'quote_confirmation': {'quote_request': quote},
+        'admin_quote_notification': {'quote_request': quote},
+    }
+
+
+class Command(BaseCommand):
+    help = 'Measure per-message email render cost with and without the precompiled renderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=1000, help='Renders per email type')
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        contexts = sample_contexts()
+        renderer = EmailRenderer()
+        renderer.preload()
+
+        self.stdout.write(f"{'email type':<30} {'render_to_string':>18} {'EmailRenderer':>15}")
+        for email_type, (html_name, text_name) in EMAIL_TEMPLATES.items():
+            context = contexts[email_type]
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                if html_name:
+                    render_to_string(html_name, context)
+                render_to_string(text_name, context)
+            legacy = (time.perf_counter() - start) / iterations
+
+            start = time.perf_counter()
+            for _ in range(iterations):
+                renderer.render(email_type, context)
+            compiled = (time.perf_counter() - start) / iterations
+
+            self.stdout.write(
+                f"{email_type:<30} {legacy * 1e6:>15.1f} us {compiled * 1e6:>12.1f} us"
+            )
@@ -0,0 +1,87 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from areas.models import ServiceArea
+from blog import view_counter
+from blog.models import BlogPost
+from core.query_budget import (
+    budget_problems, budgeted_views, create_sample_data, get_budget, needs_login, record_queries,
+    sample_url_kwargs,
+)
+from services.models import Service
+
+# The checks clear the cache before each view (and log in through cached
+# sessions), so they never touch the configured one, which is Redis in production
+ISOLATED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'check-query-budgets',
+    }
+}
+
+
+class Command(BaseCommand):
+    help = 'Request every view with a query budget and fail if it runs more queries or repeats one (N+1)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--warm', action='store_true', help='Measure the second request, with caches filled')
+        parser.add_argument('views', nargs='*', help='URL names to check (default: every budgeted view)')
+
+    def handle(self, *args, **options):
+        names = budgeted_views(options['views'])
+        unknown = [name for name in names if get_budget(name) is None]
+        if unknown:
+            raise CommandError(f"No query budget for: {', '.join(unknown)}")
+
+        failures = []
+        setup_test_environment()
+        try:
+            # A throwaway view counter, so the blog views counted here are never flushed
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], CACHES=ISOLATED_CACHES), \
+                    mock.patch.object(view_counter, '_counter', view_counter.LocalViewCounter()):
+                # Everything created here is rolled back
+                with transaction.atomic():
+                    sample = create_sample_data(*self.existing_rows())
+                    anonymous, customer = Client(), Client()
+                    customer.post(reverse('customers:login'), {
+                        'username': sample['username'], 'password': sample['password'],
+                    })
+                    for name in names:
+                        client = customer if needs_login(name) else anonymous
+                        failures += self.check_view(client, name, sample, options['warm'])
+                    transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+
+        if failures:
+            for problem in failures:
+                self.stderr.write(problem)
+            raise CommandError(f'{len(failures)} query budget problem(s)')
+        self.stdout.write(self.style.SUCCESS(f'{len(names)} view(s) within their query budgets'))
+
+    def existing_rows(self):
+        area = ServiceArea.objects.filter(is_active=True).first()
+        service = Service.objects.filter(is_active=True).first()
+        post = BlogPost.objects.filter(is_published=True).first()
+        if area is None or service is None or post is None:
+            raise CommandError('Needs at least one active service area, active service and published blog post')
+        return area, service, post
+
+    def check_view(self, client, name, sample, warm):
+        url = reverse(name, kwargs=sample_url_kwargs(name, sample))
+        if not warm:
+            cache.clear()
+        else:
+            client.get(url)
+        with record_queries() as recorder:
+            response = client.get(url)
+        budget = get_budget(name)
+        self.stdout.write(f'{name:<40} {response.status_code} {recorder.count:>3} / {budget:<3} {url}')
+        return budget_problems(name, recorder)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.view_counter import flush_views
+from core.cache_utils import uses_redis
+
+
+class Command(BaseCommand):
+    help = 'Apply buffered blog post views to BlogPost.views'
+
+    def handle(self, *args, **options):
+        if not uses_redis():
+            self.stdout.write('Views are buffered per web process without Redis and flushed by those processes')
+            return
+        flushed = flush_views()
+        self.stdout.write(self.style.SUCCESS(f'Flushed {flushed} view(s)'))
@@ -0,0 +1,61 @@
+from datetime import timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.synthetic_data import (
+    BASE_COUNTS, DEFAULT_CHUNK_SIZE, DEFAULT_DAYS, DEFAULT_NOW, SyntheticDataGenerator,
+)
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with deterministic synthetic data at production volume (use a scratch database)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help=f"Multiplier for the base row counts (scale 1 = {BASE_COUNTS['bookings']:,} bookings)")
+        parser.add_argument('--seed', type=int, default=1, help='Same seed and scale give the same rows')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows inserted per transaction')
+        parser.add_argument('--days', type=int, default=DEFAULT_DAYS, help='Spread timestamps over this many days')
+        parser.add_argument('--now', default=DEFAULT_NOW.isoformat(),
+                            help='ISO datetime the generated history ends at ("now" for the current time)')
+        parser.add_argument('--no-notifications', action='store_true',
+                            help='Skip the admin notification for each booking, quote and contact message')
+        for name in BASE_COUNTS:
+            parser.add_argument(f'--{name}', type=int, help=f'Exact number of {name}, overriding --scale')
+
+    def handle(self, *args, **options):
+        if options['scale'] <= 0 or options['chunk_size'] <= 0 or options['days'] <= 0:
+            raise CommandError('--scale, --chunk-size and --days must be positive')
+        counts = SyntheticDataGenerator.scaled_counts(
+            options['scale'], **{name: options[name] for name in BASE_COUNTS}
+        )
+        if counts['areas'] < 1 or counts['services'] < 1:
+            raise CommandError('At least one area and one service are needed')
+        if options['now'] == 'now':
+            now = timezone.now()
+        else:
+            now = parse_datetime(options['now'])
+            if now is None:
+                raise CommandError(f"--now must be an ISO datetime, got {options['now']!r}")
+            if timezone.is_naive(now):
+                now = timezone.make_aware(now, dt_timezone.utc)
+
+        generator = SyntheticDataGenerator(
+            counts,
+            seed=options['seed'],
+            chunk_size=options['chunk_size'],
+            days=options['days'],
+            notifications=not options['no_notifications'],
+            now=now,
+            log=self.stdout.write,
+        )
+        if generator.already_generated():
+            raise CommandError(
+                f"Seed {options['seed']} has already been generated in this database; "
+                'use another --seed or a fresh database (DATABASE_URL)'
+            )
+        self.stdout.write(', '.join(f'{name}={count:,}' for name, count in counts.items()))
+        generator.generate()
+        self.stdout.write(self.style.SUCCESS(f"Generated synthetic data for seed {options['seed']}"))
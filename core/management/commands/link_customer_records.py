@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from customers.linking import LINKED_MODELS, link_unlinked_records
+
+
+class Command(BaseCommand):
+    help = 'Link bookings and quote requests without a customer to the account with the same email'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows scanned per batch')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be linked without saving')
+
+    def handle(self, *args, **options):
+        for model in LINKED_MODELS:
+            scanned, linked = link_unlinked_records(
+                model, batch_size=options['batch_size'], dry_run=options['dry_run']
+            )
+            verb = 'Would link' if options['dry_run'] else 'Linked'
+            self.stdout.write(f'{model._meta.verbose_name_plural}: {verb} {linked} of {scanned} unlinked record(s)')
+        self.stdout.write(self.style.SUCCESS('Done'))
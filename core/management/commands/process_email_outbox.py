@@ -0,0 +1,56 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.email_outbox import process_outbox, release_stale_locks
+from core.email_sender import BatchEmailSender
+from monitoring.metrics import serve_metrics
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails from the outbox, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Messages claimed per batch')
+        parser.add_argument('--sleep', type=float, default=5.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Drain the queue once and exit')
+        parser.add_argument('--metrics-port', type=int,
+                            help='Serve Prometheus metrics (connections opened, messages sent) on 127.0.0.1:PORT')
+
+    def handle(self, *args, **options):
+        self._running = True
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        if options['metrics_port']:
+            serve_metrics(options['metrics_port'])
+            self.stdout.write(f"Serving metrics on http://127.0.0.1:{options['metrics_port']}/")
+
+        released = release_stale_locks()
+        if released:
+            self.stdout.write(f'Released {released} message(s) left by a stopped worker')
+
+        # One sender for the life of the worker so consecutive batches reuse
+        # the SMTP connection until it goes idle
+        with BatchEmailSender() as sender:
+            while self._running:
+                claimed, sent = process_outbox(options['batch_size'], sender=sender)
+                if claimed:
+                    self.stdout.write(f'Sent {sent}/{claimed} message(s)')
+                    continue
+                if options['once']:
+                    break
+                sender.close_if_idle()
+                release_stale_locks()
+                time.sleep(options['sleep'])
+
+        stats = sender.stats()
+        self.stdout.write(
+            f"Delivered {stats['messages_sent']} message(s) over {stats['connections_opened']} "
+            f"connection(s) ({stats['messages_per_connection']} per connection), "
+            f"{stats['messages_failed']} failed"
+        )
+
+    def _stop(self, signum, frame):
+        self._running = False
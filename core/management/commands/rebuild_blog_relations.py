@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.related import rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Resync blog tags and recompute every related-post score'
+
+    def handle(self, *args, **options):
+        count = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt tags and related posts for {count} post(s)'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from blog.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the SQLite blog search index (MySQL and PostgreSQL keep theirs up to date)'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stdout.write(f'Nothing to do: the {connection.vendor} full-text index is maintained by the database')
+            return
+        indexed = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} post(s)'))
@@ -1,53 +1,159 @@
 """
-Custom middleware for handling separate admin and customer sessions
+Custom middleware for handling separate admin and customer sessions, and
+for checking query budgets during development
 """
+import logging
+import time
+from importlib import import_module
+
 from django.conf import settings
+from django.contrib.sessions.backends.base import UpdateError
+from django.contrib.sessions.exceptions import SessionInterrupted
 from django.contrib.sessions.middleware import SessionMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+
+from .query_budget import QueryBudgetExceeded, budget_problems, get_budget, record_queries
+
+logger = logging.getLogger(__name__)
+
+
+def default_session_routes():
+    """(path prefix, cookie name, session engine) for the admin and customer areas"""
+    return [
+        ('/admin/', getattr(settings, 'ADMIN_SESSION_COOKIE_NAME', 'admin_sessionid'), None),
+        ('/core/admin/', getattr(settings, 'ADMIN_SESSION_COOKIE_NAME', 'admin_sessionid'), None),
+        ('/portal/', getattr(settings, 'CUSTOMER_SESSION_COOKIE_NAME', 'customer_sessionid'), None),
+    ]
 
 
-class SeparateSessionMiddleware(SessionMiddleware):
+class SessionRouterMiddleware(SessionMiddleware):
     """
-    Custom session middleware that uses different session cookies
-    for admin and customer areas to prevent session conflicts.
+    Session middleware that uses different session cookies (and optionally
+    different session engines) for admin, customer and public areas to
+    prevent session conflicts.
+
+    The cookie is chosen per request from a prefix table built once at
+    startup, so global settings are never modified and the middleware is
+    safe under threaded and async workers. Routes come from
+    settings.SESSION_ROUTES as (path prefix, cookie name, engine or None)
+    tuples; unmatched paths use SESSION_COOKIE_NAME and SESSION_ENGINE.
     """
-    
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        routes = getattr(settings, 'SESSION_ROUTES', None)
+        if routes is None:
+            routes = default_session_routes()
+        # Longest prefix first so nested prefixes win
+        self.routes = sorted(
+            (
+                (prefix, cookie_name, import_module(engine).SessionStore if engine else self.SessionStore)
+                for prefix, cookie_name, engine in routes
+            ),
+            key=lambda route: len(route[0]),
+            reverse=True,
+        )
+
+    def route(self, path):
+        """Return (cookie name, session store class) for a request path"""
+        for prefix, cookie_name, session_store in self.routes:
+            if path.startswith(prefix):
+                return cookie_name, session_store
+        return settings.SESSION_COOKIE_NAME, self.SessionStore
+
     def process_request(self, request):
-        # Store original session cookie name
-        original_cookie_name = getattr(settings, 'SESSION_COOKIE_NAME', 'sessionid')
-        
-        # Determine which session cookie to use based on the URL path
-        if request.path.startswith('/admin/'):
-            # Use admin session cookie for admin area
-            settings.SESSION_COOKIE_NAME = getattr(settings, 'ADMIN_SESSION_COOKIE_NAME', 'admin_sessionid')
-        elif request.path.startswith('/portal/'):
-            # Use customer session cookie for customer portal
-            settings.SESSION_COOKIE_NAME = getattr(settings, 'CUSTOMER_SESSION_COOKIE_NAME', 'customer_sessionid')
-        else:
-            # Use default session cookie for main website
-            settings.SESSION_COOKIE_NAME = 'sessionid'
-        
-        # Call the parent process_request method
-        super().process_request(request)
-        
-        # Restore original cookie name
-        settings.SESSION_COOKIE_NAME = original_cookie_name
-    
+        cookie_name, session_store = self.route(request.path)
+        request.session_cookie_name = cookie_name
+        request.session = session_store(request.COOKIES.get(cookie_name))
+
     def process_response(self, request, response):
-        # Store original session cookie name
-        original_cookie_name = getattr(settings, 'SESSION_COOKIE_NAME', 'sessionid')
-        
-        # Ensure the correct session cookie name is used in the response
-        if request.path.startswith('/admin/'):
-            settings.SESSION_COOKIE_NAME = getattr(settings, 'ADMIN_SESSION_COOKIE_NAME', 'admin_sessionid')
-        elif request.path.startswith('/portal/'):
-            settings.SESSION_COOKIE_NAME = getattr(settings, 'CUSTOMER_SESSION_COOKIE_NAME', 'customer_sessionid')
+        """
+        Same as SessionMiddleware.process_response, but with the cookie name
+        chosen for this request instead of settings.SESSION_COOKIE_NAME.
+        """
+        try:
+            accessed = request.session.accessed
+            modified = request.session.modified
+            empty = request.session.is_empty()
+        except AttributeError:
+            return response
+        cookie_name = getattr(request, 'session_cookie_name', settings.SESSION_COOKIE_NAME)
+        # First check if we need to delete this cookie.
+        # The session should be deleted only if the session is entirely empty.
+        if cookie_name in request.COOKIES and empty:
+            response.delete_cookie(
+                cookie_name,
+                path=settings.SESSION_COOKIE_PATH,
+                domain=settings.SESSION_COOKIE_DOMAIN,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+            patch_vary_headers(response, ("Cookie",))
         else:
-            settings.SESSION_COOKIE_NAME = 'sessionid'
-        
-        # Call the parent process_response method
-        response = super().process_response(request, response)
-        
-        # Restore original cookie name
-        settings.SESSION_COOKIE_NAME = original_cookie_name
-        
-        return response
\ No newline at end of file
+            if accessed:
+                patch_vary_headers(response, ("Cookie",))
+            if (modified or settings.SESSION_SAVE_EVERY_REQUEST) and not empty:
+                if request.session.get_expire_at_browser_close():
+                    max_age = None
+                    expires = None
+                else:
+                    max_age = request.session.get_expiry_age()
+                    expires = http_date(time.time() + max_age)
+                # Save the session data and refresh the client cookie.
+                # Skip session save for 5xx responses.
+                if response.status_code < 500:
+                    try:
+                        request.session.save()
+                    except UpdateError:
+                        raise SessionInterrupted(
+                            "The request's session was deleted before the "
+                            "request completed. The user may have logged "
+                            "out in a concurrent request, for example."
+                        )
+                    response.set_cookie(
+                        cookie_name,
+                        request.session.session_key,
+                        max_age=max_age,
+                        expires=expires,
+                        domain=settings.SESSION_COOKIE_DOMAIN,
+                        path=settings.SESSION_COOKIE_PATH,
+                        secure=settings.SESSION_COOKIE_SECURE or None,
+                        httponly=settings.SESSION_COOKIE_HTTPONLY or None,
+                        samesite=settings.SESSION_COOKIE_SAMESITE,
+                    )
+        return response
+
+
+class QueryBudgetMiddleware:
+    """
+    Development check of per-view query budgets (core.query_budget).
+
+    Adds X-Query-Count (and X-Query-Budget when one is declared) to every
+    response and logs budget overruns and repeated queries. With
+    QUERY_BUDGET_STRICT the request fails with QueryBudgetExceeded instead.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        if match is None:
+            return response
+        response['X-Query-Count'] = str(recorder.count)
+        # Budgets cover page loads; form posts are only checked for repeated queries
+        check_budget = request.method in ('GET', 'HEAD')
+        budget = get_budget(match.view_name) if check_budget else None
+        if budget is not None:
+            response['X-Query-Budget'] = str(budget)
+
+        problems = budget_problems(match.view_name, recorder, check_budget=check_budget)
+        if problems:
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded('\n'.join(problems))
+            for problem in problems:
+                logger.warning(problem)
+        return response
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='adminnotification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['type'], name='core_notif_unread_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_adminnotification_unread_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdminNotificationArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.PositiveIntegerField(unique=True)),
+                ('type', models.CharField(choices=[('booking', 'New Booking'), ('contact', 'New Contact Message'), ('quote', 'New Quote Request')], max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('related_id', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archived Notification',
+                'verbose_name_plural': 'Archived Notifications',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='adminnotification',
+            index=models.Index(fields=['created_at'], name='core_notif_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adminnotificationarchive',
+            index=models.Index(fields=['type', 'created_at'], name='core_notif_archive_idx'),
+        ),
+    ]
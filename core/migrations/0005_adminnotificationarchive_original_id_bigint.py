@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_adminnotification_archive'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='adminnotificationarchive',
+            name='original_id',
+            field=models.PositiveBigIntegerField(unique=True),
+        ),
+    ]
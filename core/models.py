@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 class AdminNotification(models.Model):
     NOTIFICATION_TYPES = [
@@ -17,6 +18,66 @@ class AdminNotification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Unread rows only, for the unread counters (core.notifications)
+            models.Index(fields=['type'], condition=models.Q(is_read=False), name='core_notif_unread_idx'),
+            # Admin list ordering and the archive cutoff (core.archive)
+            models.Index(fields=['created_at'], name='core_notif_created_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.get_type_display()} - {self.title}"
\ No newline at end of file
+        return f"{self.get_type_display()} - {self.title}"
+
+class AdminNotificationArchive(models.Model):
+    """Read notifications moved out of AdminNotification by archive_admin_notifications"""
+    original_id = models.PositiveBigIntegerField(unique=True)
+    type = models.CharField(max_length=20, choices=AdminNotification.NOTIFICATION_TYPES)
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    related_id = models.PositiveIntegerField()
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Archived Notification'
+        verbose_name_plural = 'Archived Notifications'
+        indexes = [
+            models.Index(fields=['type', 'created_at'], name='core_notif_archive_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_type_display()} - {self.title}"
+
+class EmailOutbox(models.Model):
+    """Outgoing email queued by the web tier and delivered by process_email_outbox"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead Letter'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        verbose_name = 'Outgoing Email'
+        verbose_name_plural = 'Email Outbox'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='core_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.get_status_display()})"
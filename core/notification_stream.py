@@ -0,0 +1,216 @@
+"""
+Server-Sent Events stream of new admin notifications.
+
+When an AdminNotification is created, core.signals publishes it (after
+the transaction commits) to a broker, and every open
+/core/admin/notifications/stream/ connection receives it as an SSE
+event whose id is the notification id. A reconnecting browser sends
+Last-Event-ID and gets the notifications it missed replayed from the
+database.
+
+Django's ASGI handler does not watch for http.disconnect while it
+iterates a streaming response, so a closed tab would keep its generator
+(and its pub/sub connection) until a write happened to fail. Streams are
+therefore closed after MAX_STREAM_SECONDS, first sending an id-only
+block so EventSource reconnects with a Last-Event-ID even when no
+notification arrived, and the replay covers the gap.
+
+Brokers:
+
+* RedisBroker (default when the cache is django_redis): PUBLISH on a
+  channel, so notifications created by the WSGI workers reach the ASGI
+  workers holding the streams.
+* LocalBroker: in-process fan-out to asyncio queues; only sees
+  notifications created in the same process (development, tests).
+
+The stream is an async iterator and must be served by an ASGI server
+(plumber_site/asgi.py); see docs/PRODUCTION_SETUP.md.
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .cache_utils import uses_redis
+from .models import AdminNotification
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'admin_notifications'
+KEEPALIVE_INTERVAL = 15  # seconds between comment lines that keep proxies from closing the stream
+RETRY_MS = 3000  # browser reconnect delay
+REPLAY_LIMIT = 50  # most missed notifications replayed on reconnect
+QUEUE_SIZE = 100  # events buffered per slow client before it starts dropping
+MAX_STREAM_SECONDS = 300  # a stream is closed after this long and the browser reconnects
+
+
+def serialize_notification(notification):
+    return {
+        'id': notification.id,
+        'type': notification.type,
+        'type_display': notification.get_type_display(),
+        'title': notification.title,
+        'message': notification.message,
+        'related_id': notification.related_id,
+        'created_at': notification.created_at.isoformat() if notification.created_at else None,
+    }
+
+
+def format_event(event):
+    data = json.dumps(event, separators=(',', ':'))
+    return f"id: {event['id']}\nevent: notification\ndata: {data}\n\n"
+
+
+class LocalBroker:
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(self._deliver, queue, event)
+
+    @staticmethod
+    def _deliver(queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning('Dropping admin notification event for a slow stream client')
+
+    def subscribe(self):
+        return LocalSubscription(self)
+
+
+class LocalSubscription:
+    def __init__(self, broker):
+        self.broker = broker
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._entry = (asyncio.get_running_loop(), self.queue)
+        with broker._lock:
+            broker._subscribers.add(self._entry)
+
+    async def start(self):
+        pass
+
+    async def get(self):
+        return await self.queue.get()
+
+    async def close(self):
+        with self.broker._lock:
+            self.broker._subscribers.discard(self._entry)
+
+
+class RedisBroker:
+    def __init__(self, alias='default'):
+        self.alias = alias
+        prefix = settings.CACHES[alias].get('KEY_PREFIX', '')
+        self.channel = f'{prefix}:{CHANNEL}' if prefix else CHANNEL
+
+    def publish(self, event):
+        from django_redis import get_redis_connection
+        get_redis_connection(self.alias).publish(self.channel, json.dumps(event))
+
+    def subscribe(self):
+        return RedisSubscription(self)
+
+
+class RedisSubscription:
+    def __init__(self, broker):
+        import redis.asyncio as aioredis
+        self.client = aioredis.from_url(settings.CACHES[broker.alias]['LOCATION'])
+        self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self.channel = broker.channel
+
+    async def start(self):
+        await self.pubsub.subscribe(self.channel)
+
+    async def get(self):
+        while True:
+            message = await self.pubsub.get_message(timeout=None)
+            if message and message.get('type') == 'message':
+                return json.loads(message['data'])
+
+    async def close(self):
+        try:
+            await self.pubsub.aclose()
+            await self.client.aclose()
+        except Exception as e:
+            logger.warning(f'Error closing notification stream subscription: {e}')
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                if uses_redis():
+                    _broker = RedisBroker()
+                else:
+                    _broker = LocalBroker()
+    return _broker
+
+
+def publish_notification(notification):
+    """Fan a new notification out to open streams; never breaks the request that created it"""
+    try:
+        get_broker().publish(serialize_notification(notification))
+    except Exception as e:
+        logger.error(f'Failed to publish admin notification {notification.id}: {e}')
+
+
+@sync_to_async
+def missed_notifications(last_event_id):
+    notifications = AdminNotification.objects.filter(id__gt=last_event_id).order_by('id')[:REPLAY_LIMIT]
+    return [serialize_notification(notification) for notification in notifications]
+
+
+@sync_to_async
+def latest_notification_id():
+    return AdminNotification.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+async def event_stream(last_event_id=None, max_seconds=MAX_STREAM_SECONDS):
+    # Subscribe before replaying so nothing created in between is lost
+    subscription = get_broker().subscribe()
+    next_event = None
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    try:
+        await subscription.start()
+        yield f'retry: {RETRY_MS}\n\n'
+        last_sent = last_event_id or await latest_notification_id()
+        if last_event_id:
+            for event in await missed_notifications(last_event_id):
+                last_sent = event['id']
+                yield format_event(event)
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                # Sets the browser's Last-Event-ID without dispatching an event
+                yield f'id: {last_sent}\n\n'
+                return
+            if next_event is None:
+                next_event = asyncio.ensure_future(subscription.get())
+            done, _ = await asyncio.wait({next_event}, timeout=min(KEEPALIVE_INTERVAL, remaining))
+            if not done:
+                if loop.time() < deadline:
+                    yield ': keepalive\n\n'
+                continue
+            event, next_event = next_event.result(), None
+            if event['id'] <= last_sent:
+                continue  # already replayed
+            last_sent = event['id']
+            yield format_event(event)
+    finally:
+        if next_event is not None:
+            next_event.cancel()
+        await subscription.close()
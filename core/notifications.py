@@ -0,0 +1,86 @@
+"""
+Cached unread counters for admin notifications.
+
+Admin pages show unread counts on every render, so they are kept per
+notification type in the cache instead of being counted each time. The
+counters are adjusted with atomic incr/decr when notifications are
+created, deleted or change read state (core.signals for single saves,
+mark_notifications_read/unread for bulk updates). A missing counter, or
+one that would go negative, is rebuilt from the unread rows with one
+grouped query served by the partial unread index.
+"""
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import AdminNotification
+
+UNREAD_KEY_PREFIX = 'admin_notifications:unread'
+# Rebuilt from the database at least this often, so any drift heals itself
+UNREAD_COUNT_TIMEOUT = 3600  # seconds
+
+NOTIFICATION_TYPES = [value for value, label in AdminNotification.NOTIFICATION_TYPES]
+
+
+def _unread_key(notification_type):
+    return f'{UNREAD_KEY_PREFIX}:{notification_type}'
+
+
+def refresh_unread_counts():
+    """Recount unread notifications per type and store the counters"""
+    counts = dict.fromkeys(NOTIFICATION_TYPES, 0)
+    rows = (
+        AdminNotification.objects.filter(is_read=False)
+        .values_list('type')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    counts.update(rows)
+    cache.set_many({_unread_key(t): count for t, count in counts.items()}, UNREAD_COUNT_TIMEOUT)
+    return counts
+
+
+def get_unread_counts():
+    """Unread notifications per type, e.g. {'booking': 2, 'contact': 0, 'quote': 1}"""
+    keys = {_unread_key(t): t for t in NOTIFICATION_TYPES}
+    found = cache.get_many(keys)
+    if len(found) < len(keys):
+        return refresh_unread_counts()
+    return {keys[key]: count for key, count in found.items()}
+
+
+def get_unread_count(notification_type=None):
+    counts = get_unread_counts()
+    if notification_type is None:
+        return sum(counts.values())
+    return counts.get(notification_type, 0)
+
+
+def adjust_unread_count(notification_type, delta):
+    if not delta:
+        return
+    key = _unread_key(notification_type)
+    try:
+        value = cache.incr(key, delta)
+    except ValueError:
+        # Counter not cached; the next read rebuilds it
+        return
+    if value < 0:
+        refresh_unread_counts()
+
+
+def _set_read_state(queryset, is_read):
+    changed = 0
+    for notification_type in NOTIFICATION_TYPES:
+        updated = queryset.filter(type=notification_type, is_read=not is_read).update(is_read=is_read)
+        adjust_unread_count(notification_type, -updated if is_read else updated)
+        changed += updated
+    return changed
+
+
+def mark_notifications_read(queryset=None):
+    """Mark notifications read (all unread ones by default); returns the number changed"""
+    return _set_read_state(AdminNotification.objects.all() if queryset is None else queryset, True)
+
+
+def mark_notifications_unread(queryset):
+    return _set_read_state(queryset, False)
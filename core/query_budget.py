@@ -0,0 +1,192 @@
+"""
+Query budgets and N+1 detection for views.
+
+QueryRecorder is a connection.execute_wrapper hook that records every
+query a block of code runs, so it works without DEBUG. Queries are
+reduced to their shape (literals, parameters and IN lists replaced by
+?), and a shape repeated N_PLUS_ONE_THRESHOLD times or more in one
+request is reported as a likely N+1.
+
+Budgets are the most queries a GET of each view may run on a cold
+cache, keyed by URL name in QUERY_BUDGETS (core.query_budgets). In DEBUG,
+core.middleware.QueryBudgetMiddleware checks every request against them;
+the check_query_budgets command and core.tests request every budgeted
+view with the sample rows from create_sample_data() under
+assert_query_budget.
+"""
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver
+from django.utils import timezone
+
+N_PLUS_ONE_THRESHOLD = 3
+
+# Customer portal views that are served to anonymous visitors
+ANONYMOUS_PORTAL_VIEWS = {
+    'customers:register', 'customers:login', 'customers:password_reset', 'customers:password_reset_done',
+    'customers:password_reset_confirm', 'customers:password_reset_complete',
+}
+# Requested last because they end the customer's session
+LAST_VIEWS = ('customers:logout',)
+
+SAMPLE_PASSWORD = 'budget-check-Pa55!'
+SAMPLE_ROWS = 3
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*\?\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+_COLUMNS = re.compile(r'^SELECT .+? FROM ', re.IGNORECASE)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_shape(sql):
+    """SQL with its literal values removed, for grouping repeated queries"""
+    shape = _STRING.sub('?', sql)
+    shape = _NUMBER.sub('?', shape)
+    shape = _PLACEHOLDER.sub('?', shape)
+    shape = _IN_LIST.sub('IN (...)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []  # (sql, seconds)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(seconds for _, seconds in self.queries)
+
+    def repeated(self, threshold=N_PLUS_ONE_THRESHOLD):
+        """[(shape, times)] for query shapes run at least threshold times"""
+        shapes = Counter(query_shape(sql) for sql, _ in self.queries)
+        return [(shape, times) for shape, times in shapes.most_common() if times >= threshold]
+
+
+@contextmanager
+def record_queries():
+    """Record the queries run inside the block on every database connection"""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
+
+
+def get_budgets():
+    """{url name: query budget}; settings.QUERY_BUDGETS overrides core.query_budgets"""
+    from .query_budgets import QUERY_BUDGETS
+    return getattr(settings, 'QUERY_BUDGETS', QUERY_BUDGETS)
+
+
+def get_budget(view_name):
+    return get_budgets().get(view_name)
+
+
+def budget_problems(view_name, recorder, check_budget=True):
+    """Human readable budget and N+1 violations for one request"""
+    problems = []
+    budget = get_budget(view_name) if check_budget else None
+    if budget is not None and recorder.count > budget:
+        problems.append(f'{view_name} ran {recorder.count} queries, budget is {budget}')
+    for shape, times in recorder.repeated():
+        shape = _COLUMNS.sub('SELECT ... FROM ', shape)
+        problems.append(f'{view_name} repeated a query {times} times (possible N+1): {shape[:300]}')
+    return problems
+
+
+@contextmanager
+def assert_query_budget(view_name):
+    """Fail with QueryBudgetExceeded if the block breaks the view's budget or repeats queries"""
+    with record_queries() as recorder:
+        yield recorder
+    problems = budget_problems(view_name, recorder)
+    if problems:
+        raise QueryBudgetExceeded('\n'.join(problems))
+
+
+def budgeted_views(names=None):
+    """URL names to check, in a safe request order"""
+    names = list(names or get_budgets())
+    return sorted(names, key=lambda name: name in LAST_VIEWS)
+
+
+def needs_login(view_name):
+    return view_name.startswith('customers:') and view_name not in ANONYMOUS_PORTAL_VIEWS
+
+
+def create_sample_data(area, service, post):
+    """
+    A customer with SAMPLE_ROWS bookings, accepted quotes and featured
+    gallery images, so per-row queries show up as repeats. Returns the
+    login and the values for every budgeted URL's parameters.
+    """
+    from django.contrib.auth.models import User
+
+    from bookings.models import Booking
+    from customers.models import CustomerProfile
+    from main.models import GalleryImage
+    from quotes.models import QuoteRequest
+
+    user = User.objects.create_user(
+        'query-budget-check', 'query-budget-check@example.com', SAMPLE_PASSWORD,
+        first_name='Query', last_name='Budget',
+    )
+    profile, _ = CustomerProfile.objects.get_or_create(user=user, defaults={'service_area': area})
+    for index in range(SAMPLE_ROWS):
+        booking = Booking.objects.create(
+            customer=profile, customer_name='Query Budget', email=user.email, phone='+16475550100',
+            address='1 Main Street', service=service, service_area=area, urgency='medium',
+            preferred_date=timezone.now() + timedelta(days=2), description='Query budget check',
+        )
+        quote = QuoteRequest.objects.create(
+            customer=profile, service=service, customer_name='Query Budget', email=user.email,
+            phone='+16475550100', address='1 Main Street', estimated_total=Decimal('100.00'),
+            status='accepted',
+        )
+        GalleryImage.objects.create(
+            title=f'Query budget check {index}', image='gallery/query-budget-check.jpg',
+            service=service, location=area, is_featured=True,
+        )
+    return {
+        'username': user.username,
+        'password': SAMPLE_PASSWORD,
+        'location_slug': area.slug,
+        'slug': post.slug,
+        'booking_id': booking.id,
+        'quote_id': quote.id,
+        'uidb64': 'MQ',
+        'token': 'set-password',
+    }
+
+
+def sample_url_kwargs(view_name, sample):
+    """Sample values for a URL's parameters"""
+    resolver = get_resolver()
+    for prefix in view_name.split(':')[:-1]:
+        resolver = resolver.namespace_dict[prefix][1]
+    possibilities = resolver.reverse_dict.getlist(view_name.split(':')[-1])
+    params = possibilities[0][0][0][1] if possibilities else []
+    return {param: sample[param] for param in params}
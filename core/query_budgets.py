@@ -0,0 +1,50 @@
+"""
+Most queries each view may run, keyed by URL name (see core.query_budget).
+
+Budgets are measured on a cold cache with the check_query_budgets
+command, plus one query of headroom; cached pages run far fewer. Raise a
+budget only together with the change that needs the extra query.
+"""
+
+QUERY_BUDGETS = {
+    # main/urls.py
+    'main:home': 6,
+    'main:services': 3,
+    'main:booking': 3,
+    'main:contact': 1,
+    'main:gallery': 5,
+    'main:feedback': 3,
+    'main:preview_booking_email': 3,
+    'main:preview_admin_email': 3,
+    'main:preview_contact_email': 2,
+
+    # areas/urls.py
+    'location_home': 6,
+    'location_services': 4,
+    'location_booking': 3,
+    'location_contact': 2,
+
+    # customers/urls.py; portal pages include the session, user and profile lookups
+    'customers:register': 2,
+    'customers:login': 1,
+    'customers:logout': 5,
+    'customers:password_reset': 1,
+    'customers:password_reset_done': 1,
+    'customers:password_reset_confirm': 2,
+    'customers:password_reset_complete': 1,
+    'customers:dashboard': 8,
+    'customers:profile': 4,
+    'customers:bookings': 6,
+    'customers:booking_detail': 7,
+    'customers:cancel_booking': 5,
+    'customers:quick_booking': 5,
+    'customers:quotes': 6,
+    'customers:quote_detail': 6,
+    'customers:accept_quote': 5,
+    'customers:book_from_quote': 7,
+    'customers:service_history': 7,
+
+    # blog/urls.py; buffered view counts are flushed after the response (blog.view_counter)
+    'blog:blog_list': 4,
+    'blog:blog_detail': 4,
+}
@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import AdminNotification
+from .notification_stream import publish_notification
+from .notifications import adjust_unread_count
+
+
+@receiver(pre_save, sender=AdminNotification)
+def remember_notification_state(sender, instance, **kwargs):
+    """Keep the stored type/read state so an edit adjusts the right counters"""
+    instance._previous_state = None
+    if instance.pk:
+        instance._previous_state = (
+            AdminNotification.objects.filter(pk=instance.pk).values_list('type', 'is_read').first()
+        )
+
+
+@receiver(post_save, sender=AdminNotification)
+def notification_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        # Stream it to open admin pages once the row is visible to them
+        transaction.on_commit(lambda: publish_notification(instance))
+    previous = getattr(instance, '_previous_state', None)
+    if previous and not previous[1]:
+        adjust_unread_count(previous[0], -1)
+    if not instance.is_read:
+        adjust_unread_count(instance.type, 1)
+
+
+@receiver(post_delete, sender=AdminNotification)
+def notification_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread_count(instance.type, -1)
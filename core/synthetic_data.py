@@ -0,0 +1,516 @@
+"""
+Deterministic synthetic data at production volume.
+
+Generates service areas, services with quote calculators, customers,
+bookings, quote requests, contact messages, reviews, testimonials, blog
+posts and their admin notifications with bulk_create, one transaction
+per chunk. The same seed and scale produce the same rows, so query
+plans can be measured against reproducible production-sized tables:
+
+    python manage.py generate_synthetic_data --scale 10 --seed 1
+
+bulk_create skips save() and signals, so the derived data they normally
+maintain is rebuilt once at the end: area slugs and rating summaries,
+blog tags, related posts and the search index, cache versions and the
+unread notification counters. Customer bookings and quotes are created
+already linked to their CustomerProfile.
+
+Timestamps are spread over the DEFAULT_DAYS days before a fixed anchor
+(DEFAULT_NOW, or --now), never the wall clock, and every account shares
+one password hash made with a fixed salt, so runs are reproducible down
+to the last column. Setting the timestamps needs the auto_now/
+auto_now_add fields switched off while rows are inserted
+(explicit_timestamps); run it in a management command, not in a web
+process.
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Avg, Count, Max
+from django.utils.text import slugify
+
+from areas.models import Review, ServiceArea
+from areas.resolvers import invalidate_slug_index
+from blog.models import BlogPost
+from blog.related import rebuild_all
+from blog.search import rebuild_search_index
+from bookings.models import Booking, ContactMessage, booking_confirmed_for_status
+from core.constants import PLATFORM_CHOICES, SERVICE_ICONS, URGENCY_CHOICES
+from customers.models import CustomerProfile
+from quotes.models import QuoteCalculator, QuoteOption, QuoteRequest
+from quotes.pricing import PricingError, build_price_table, price_quote
+from services.models import Service, Testimonial
+
+from .cache_versions import bump_version
+from .models import AdminNotification
+from .notifications import refresh_unread_counts
+
+# Rows per model at --scale 1; --scale 10 gives a million bookings
+BASE_COUNTS = {
+    'areas': 200,
+    'services': 20,
+    'customers': 20_000,
+    'bookings': 100_000,
+    'quotes': 50_000,
+    'contacts': 20_000,
+    'reviews': 50_000,
+    'testimonials': 20_000,
+    'posts': 2_000,
+}
+DEFAULT_CHUNK_SIZE = 2_000
+DEFAULT_DAYS = 730
+DEFAULT_NOW = datetime(2026, 10, 1, tzinfo=dt_timezone.utc)  # "now" of the generated history
+CUSTOMER_SHARE = 0.4  # bookings and quotes made from a customer account
+UNREAD_DAYS = 7  # notifications newer than this stay unread
+PASSWORD = 'synthetic-password'
+EMAIL_DOMAIN = 'synthetic.example'
+# Visitors never share an address with an account, so their bookings stay unlinked
+VISITOR_EMAIL_DOMAIN = 'visitors.synthetic.example'
+
+FIRST_NAMES = [
+    'Olivia', 'Liam', 'Emma', 'Noah', 'Ava', 'William', 'Sophia', 'James', 'Isabella', 'Benjamin',
+    'Mia', 'Lucas', 'Charlotte', 'Henry', 'Amelia', 'Alexander', 'Harper', 'Ethan', 'Evelyn', 'Daniel',
+    'Priya', 'Arjun', 'Mei', 'Wei', 'Fatima', 'Omar', 'Sofia', 'Mateo', 'Chloe', 'Jacob',
+]
+LAST_NAMES = [
+    'Smith', 'Brown', 'Tremblay', 'Martin', 'Roy', 'Wilson', 'MacDonald', 'Gagnon', 'Johnson', 'Taylor',
+    'Campbell', 'Anderson', 'Lee', 'Patel', 'Singh', 'Chen', 'Wong', 'Nguyen', 'Khan', 'Ali',
+    'Garcia', 'Rossi', 'Murphy', "O'Brien", 'Clarke', 'Young', 'King', 'Scott', 'Stewart', 'Walker',
+]
+PLACE_PREFIXES = ['North', 'South', 'East', 'West', 'Upper', 'Lower', 'Port', 'Lake', 'Mount', 'Fort', 'New', 'Old']
+PLACE_ROOTS = [
+    'Ridge', 'Hill', 'Brook', 'Vale', 'Haven', 'Field', 'Wood', 'Falls', 'Bay', 'Park',
+    'Grove', 'Creek', 'Meadow', 'Harbour', 'Glen', 'Crest', 'Point', 'Springs', 'Heights', 'Landing',
+]
+CITIES = ['Toronto', 'Mississauga', 'Brampton', 'Hamilton', 'Ottawa', 'London', 'Markham', 'Vaughan', 'Oshawa', 'Barrie']
+STREETS = ['King', 'Queen', 'Yonge', 'Bloor', 'Dundas', 'Main', 'Church', 'Elm', 'Maple', 'Oak', 'Lakeshore', 'College']
+SERVICE_NAMES = [
+    'Drain Cleaning', 'Burst Pipe Repair', 'Water Heater Installation', 'Tankless Water Heater Repair',
+    'Toilet Repair', 'Faucet Replacement', 'Sump Pump Installation', 'Sewer Line Inspection',
+    'Backflow Prevention', 'Leak Detection', 'Gas Line Repair', 'Bathroom Renovation Plumbing',
+    'Kitchen Sink Installation', 'Water Softener Installation', 'Frozen Pipe Thawing', 'Garbage Disposal Repair',
+    'Main Shut-off Valve Replacement', 'Basement Flood Cleanup', 'Hydro Jetting', 'Shower Valve Repair',
+]
+OPTION_NAMES = ['After-hours visit', 'Premium parts', 'Camera inspection', 'Permit handling', 'Old fixture disposal']
+TOPICS = [
+    'frozen pipes', 'water heaters', 'clogged drains', 'sump pumps', 'leaky faucets', 'sewer backups',
+    'water pressure', 'toilet repairs', 'basement flooding', 'hard water', 'pipe insulation', 'renovations',
+]
+TITLE_PATTERNS = [
+    'A Homeowner\'s Guide to {topic} in {area}',
+    '{n} Things to Know About {topic}',
+    'How {area} Homeowners Can Prevent {topic}',
+    'What Causes {topic}? A Plumber Explains',
+    'Seasonal Checklist: {topic} Before Winter',
+]
+SENTENCES = [
+    'Most plumbing emergencies start as small problems that were easy to miss.',
+    'A licensed plumber can usually find the cause within the first hour on site.',
+    'Older homes often still have galvanized pipes that corrode from the inside.',
+    'Shutting off the main valve quickly limits water damage while help is on the way.',
+    'Regular maintenance costs far less than an emergency call on a holiday weekend.',
+    'Hard water leaves mineral deposits that shorten the life of fixtures and heaters.',
+    'Insulating exposed pipes is the cheapest protection against a deep freeze.',
+    'A slow drain is often the first sign of a blockage further down the line.',
+    'Water heaters should be flushed once a year to remove sediment.',
+    'Sump pumps need testing before the spring thaw, not during it.',
+    'Low water pressure can come from a failing regulator or a hidden leak.',
+    'Our technicians carry common parts so most repairs are finished in one visit.',
+]
+REVIEW_PHRASES = [
+    'Arrived on time and fixed the problem quickly.', 'Fair price and very professional.',
+    'Explained everything before starting the work.', 'Cleaned up after themselves, would hire again.',
+    'Came out late at night for an emergency.', 'Took longer than expected but the result is great.',
+    'Friendly technician who knew exactly what to do.', 'Quote was accurate, no surprises on the bill.',
+]
+SUBJECTS = ['Quote request', 'Water heater question', 'Booking change', 'Emergency follow-up', 'Invoice question']
+TAG_WORDS = [
+    'winter', 'maintenance', 'emergency', 'drains', 'water heater', 'diy', 'renovation', 'leaks',
+    'sump pump', 'pipes', 'bathroom', 'kitchen', 'energy saving', 'inspection', 'flooding', 'toilets',
+]
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let generated created_at/updated_at values through instead of auto_now(_add)"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def insert_chunk(model, objs):
+    """bulk_create one chunk in its own transaction, making sure every object has its pk"""
+    with transaction.atomic():
+        last_id = model.objects.aggregate(last=Max('id'))['last'] or 0
+        model.objects.bulk_create(objs)
+        if objs and objs[0].pk is None:
+            # Backends that don't return ids from bulk inserts (MySQL)
+            ids = model.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)
+            for obj, pk in zip(objs, ids):
+                obj.pk = pk
+    return objs
+
+
+class SyntheticDataGenerator:
+    def __init__(self, counts, seed=1, chunk_size=DEFAULT_CHUNK_SIZE, days=DEFAULT_DAYS,
+                 notifications=True, now=DEFAULT_NOW, log=print):
+        self.counts = counts
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.days = days
+        self.notifications = notifications
+        self.log = log
+        self.now = now
+        # Catalogue rows (areas, services, calculators) exist from the start of the history
+        self.opened = now - timedelta(days=days)
+        self.prefix = f'synthetic-{seed}'
+
+    @classmethod
+    def scaled_counts(cls, scale, **overrides):
+        counts = {name: max(int(count * scale), 1) for name, count in BASE_COUNTS.items()}
+        counts.update({name: value for name, value in overrides.items() if value is not None})
+        return counts
+
+    def rng(self, name):
+        # One stream per model, so changing one count leaves the other tables identical
+        return random.Random(f'{self.seed}:{name}')
+
+    def already_generated(self):
+        return User.objects.filter(username__startswith=f'{self.prefix}-').exists()
+
+    def generate(self):
+        started = time.perf_counter()
+        with explicit_timestamps(
+            ServiceArea, Service, QuoteCalculator, QuoteOption, Review, Testimonial, Booking, ContactMessage,
+            QuoteRequest, BlogPost, CustomerProfile, AdminNotification,
+        ):
+            area_ids = self.step('areas', self.create_areas)
+            service_ids = self.step('services', self.create_services)
+            customers = self.step('customers', self.create_customers, area_ids)
+            self.step('bookings', self.create_bookings, area_ids, service_ids, customers)
+            self.step('quotes', self.create_quotes, service_ids, customers)
+            self.step('contacts', self.create_contacts, area_ids)
+            self.step('reviews', self.create_reviews, area_ids)
+            self.step('testimonials', self.create_testimonials, area_ids, service_ids)
+            self.step('posts', self.create_posts, area_ids, service_ids)
+        self.rebuild_derived_data(area_ids)
+        self.log(f'Done in {time.perf_counter() - started:.1f}s')
+
+    def step(self, name, create, *args):
+        started = time.perf_counter()
+        result = create(*args)
+        elapsed = time.perf_counter() - started
+        # Creators returning their rows may have made fewer than asked (areas skip taken slugs)
+        count = self.counts[name] if result is None else len(result)
+        self.log(f'{name}: {count:,} row(s) in {elapsed:.1f}s ({count / elapsed if elapsed else 0:,.0f}/s)')
+        return result
+
+    def chunks(self, total):
+        for start in range(0, total, self.chunk_size):
+            yield range(start, min(start + self.chunk_size, total))
+
+    def past(self, rng, max_days=None):
+        """A timestamp in the last max_days days, biased towards recent ones like real traffic"""
+        days = (max_days or self.days) * (1 - rng.random() ** 0.5)
+        return self.now - timedelta(days=days, seconds=rng.randrange(86400))
+
+    def person(self, rng, index, domain=VISITOR_EMAIL_DOMAIN):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        email = f"{slugify(first)}.{slugify(last)}.{self.seed}.{index}@{domain}"
+        return first, last, email
+
+    def phone(self, rng):
+        return f'+1{rng.choice(["416", "647", "905", "289", "613"])}555{rng.randrange(10000):04d}'
+
+    def address(self, rng):
+        return f'{rng.randrange(1, 9999)} {rng.choice(STREETS)} Street, {rng.choice(CITIES)}, ON'
+
+    def create_areas(self):
+        rng = self.rng('areas')
+        taken = set(ServiceArea.objects.values_list('slug', flat=True))
+        ids = []
+        for chunk in self.chunks(self.counts['areas']):
+            areas = []
+            for index in chunk:
+                name = f'{rng.choice(PLACE_PREFIXES)} {rng.choice(PLACE_ROOTS)} {self.seed}-{index}'
+                slug = slugify(name)
+                if slug in taken:
+                    continue
+                taken.add(slug)
+                areas.append(ServiceArea(
+                    name=name, slug=slug, phone=self.phone(rng), email=f'{slug}@{EMAIL_DOMAIN}',
+                    address=self.address(rng), city=rng.choice(CITIES),
+                    postal_code=f'M{rng.randrange(10)}{chr(65 + rng.randrange(26))} {rng.randrange(10)}A{rng.randrange(10)}',
+                    created_at=self.opened, updated_at=self.opened,
+                ))
+            ids += [area.pk for area in insert_chunk(ServiceArea, areas)]
+        return ids
+
+    def create_services(self):
+        rng = self.rng('services')
+        services = [
+            Service(
+                name=f'{SERVICE_NAMES[index % len(SERVICE_NAMES)]} {self.seed}-{index}',
+                description=' '.join(rng.sample(SENTENCES, 3)),
+                price_range=f'${rng.randrange(1, 5) * 50} - ${rng.randrange(6, 20) * 50}',
+                icon=rng.choice(SERVICE_ICONS)[0],
+                is_emergency=rng.random() < 0.25,
+                created_at=self.opened, updated_at=self.opened,
+            )
+            for index in range(self.counts['services'])
+        ]
+        insert_chunk(Service, services)
+        calculators = insert_chunk(QuoteCalculator, [
+            QuoteCalculator(
+                service=service,
+                base_price=Decimal(rng.randrange(50, 400)),
+                labor_rate_per_hour=Decimal(rng.randrange(80, 160)),
+                estimated_hours=Decimal(rng.randrange(5, 60)) / 10,
+                updated_at=self.opened,
+            )
+            for service in services
+        ])
+        insert_chunk(QuoteOption, [
+            QuoteOption(
+                calculator=calculator, name=name, description=f'{name} for this job',
+                price_modifier=Decimal(rng.randrange(20, 300)), is_required=order == 0 and rng.random() < 0.2,
+                order=order, updated_at=self.opened,
+            )
+            for calculator in calculators
+            for order, name in enumerate(rng.sample(OPTION_NAMES, rng.randrange(2, len(OPTION_NAMES) + 1)))
+        ])
+        return [service.pk for service in services]
+
+    def create_customers(self, area_ids):
+        """Returns [(profile id, name, email)] for the bookings and quotes made from accounts"""
+        rng = self.rng('customers')
+        # Fixed salt: the same seed gives byte-identical user rows
+        password = make_password(PASSWORD, salt=f'synthetic{self.seed}')
+        customers = []
+        for chunk in self.chunks(self.counts['customers']):
+            users, details = [], []
+            for index in chunk:
+                first, last, email = self.person(rng, index, domain=EMAIL_DOMAIN)
+                joined = self.past(rng)
+                users.append(User(
+                    username=f'{self.prefix}-{index}', email=email, first_name=first, last_name=last,
+                    password=password, date_joined=joined, last_login=joined if rng.random() < 0.6 else None,
+                ))
+                details.append((joined, rng.choice(area_ids), rng.choice(['email', 'phone', 'text'])))
+            users = insert_chunk(User, users)
+            profiles = insert_chunk(CustomerProfile, [
+                CustomerProfile(
+                    user=user, phone=self.phone(rng), address=self.address(rng), city=rng.choice(CITIES),
+                    service_area_id=area_id, preferred_contact_method=contact, created_at=joined, updated_at=joined,
+                )
+                for user, (joined, area_id, contact) in zip(users, details)
+            ])
+            customers += [
+                (profile.pk, f'{user.first_name} {user.last_name}', user.email)
+                for user, profile in zip(users, profiles)
+            ]
+        return customers
+
+    def customer_for(self, rng, customers, index):
+        """(profile id, name, email) of an account holder, or a one-off visitor"""
+        if customers and rng.random() < CUSTOMER_SHARE:
+            return rng.choice(customers)
+        first, last, email = self.person(rng, index)
+        return None, f'{first} {last}', email
+
+    def booking_status(self, rng, created):
+        age = (self.now - created).days
+        if age > 14:
+            return rng.choices(['completed', 'cancelled', 'confirmed'], weights=[85, 12, 3])[0]
+        return rng.choices(['pending', 'confirmed', 'in_progress', 'completed', 'cancelled'], weights=[35, 30, 10, 20, 5])[0]
+
+    def notification(self, notification_type, obj, title, message):
+        return AdminNotification(
+            type=notification_type, title=title, message=message, related_id=obj.pk,
+            is_read=(self.now - obj.created_at).days >= UNREAD_DAYS, created_at=obj.created_at,
+        )
+
+    def create_bookings(self, area_ids, service_ids, customers):
+        rng = self.rng('bookings')
+        for chunk in self.chunks(self.counts['bookings']):
+            bookings = []
+            for index in chunk:
+                customer_id, name, email = self.customer_for(rng, customers, index)
+                created = self.past(rng)
+                status = self.booking_status(rng, created)
+                bookings.append(Booking(
+                    customer_id=customer_id, customer_name=name, email=email, phone=self.phone(rng),
+                    address=self.address(rng), service_id=rng.choice(service_ids),
+                    service_area_id=rng.choice(area_ids) if rng.random() < 0.9 else None,
+                    urgency=rng.choices([value for value, _ in URGENCY_CHOICES], weights=[30, 40, 20, 10])[0],
+                    preferred_date=created + timedelta(days=rng.randrange(0, 14), hours=rng.randrange(8, 18)),
+                    description=rng.choice(SENTENCES), status=status,
+                    is_confirmed=bool(booking_confirmed_for_status(status)),
+                    created_at=created, updated_at=created + timedelta(hours=rng.randrange(0, 72)),
+                ))
+            insert_chunk(Booking, bookings)
+            if self.notifications:
+                insert_chunk(AdminNotification, [
+                    self.notification('booking', booking, f'New Booking from {booking.customer_name}',
+                                      f'{booking.get_urgency_display()} booking request')
+                    for booking in bookings
+                ])
+
+    def create_quotes(self, service_ids, customers):
+        rng = self.rng('quotes')
+        table = build_price_table()
+        for chunk in self.chunks(self.counts['quotes']):
+            quotes = []
+            for index in chunk:
+                customer_id, name, email = self.customer_for(rng, customers, index)
+                service_id = rng.choice(service_ids)
+                calculator = table.get(service_id)
+                options = []
+                if calculator and calculator.options:
+                    options = rng.sample(sorted(calculator.options), rng.randrange(0, len(calculator.options) + 1))
+                try:
+                    estimate = price_quote(service_id, options, table=table, strict=False).total
+                except PricingError:
+                    estimate = Decimal(rng.randrange(100, 2000))
+                created = self.past(rng)
+                status = rng.choices(
+                    ['pending', 'in_review', 'quoted', 'accepted', 'declined'], weights=[15, 10, 30, 30, 15]
+                )[0]
+                final = None
+                if status in ('quoted', 'accepted', 'declined'):
+                    final = (estimate * Decimal(rng.randrange(90, 125)) / 100).quantize(Decimal('0.01'))
+                quotes.append(QuoteRequest(
+                    customer_id=customer_id, service_id=service_id, customer_name=name, email=email,
+                    phone=self.phone(rng), address=self.address(rng), selected_options=options,
+                    estimated_total=estimate, final_quote=final, status=status,
+                    notes=rng.choice(SENTENCES) if rng.random() < 0.3 else '',
+                    created_at=created, updated_at=created + timedelta(hours=rng.randrange(0, 96)),
+                ))
+            insert_chunk(QuoteRequest, quotes)
+            if self.notifications:
+                insert_chunk(AdminNotification, [
+                    self.notification('quote', quote, f'New Quote Request from {quote.customer_name}',
+                                      f'Estimated total ${quote.estimated_total}')
+                    for quote in quotes
+                ])
+
+    def create_contacts(self, area_ids):
+        rng = self.rng('contacts')
+        for chunk in self.chunks(self.counts['contacts']):
+            messages = []
+            for index in chunk:
+                first, last, email = self.person(rng, index)
+                created = self.past(rng)
+                old = (self.now - created).days >= UNREAD_DAYS
+                messages.append(ContactMessage(
+                    name=f'{first} {last}', email=email, phone=self.phone(rng), subject=rng.choice(SUBJECTS),
+                    message=' '.join(rng.sample(SENTENCES, 2)), service_area_id=rng.choice(area_ids),
+                    priority=rng.choices(['low', 'medium', 'high', 'urgent'], weights=[30, 45, 20, 5])[0],
+                    is_read=old or rng.random() < 0.5, is_resolved=old and rng.random() < 0.9,
+                    created_at=created, updated_at=created,
+                ))
+            insert_chunk(ContactMessage, messages)
+            if self.notifications:
+                insert_chunk(AdminNotification, [
+                    self.notification('contact', message, f'New Contact Message from {message.name}', message.subject)
+                    for message in messages
+                ])
+
+    def create_reviews(self, area_ids):
+        rng = self.rng('reviews')
+        for chunk in self.chunks(self.counts['reviews']):
+            reviews = []
+            for index in chunk:
+                first, last, _ = self.person(rng, index)
+                reviews.append(Review(
+                    customer_name=f'{first} {last[0]}.', platform=rng.choice(PLATFORM_CHOICES)[0],
+                    rating=rng.choices([1, 2, 3, 4, 5], weights=[3, 4, 8, 30, 55])[0],
+                    review_text=' '.join(rng.sample(REVIEW_PHRASES, 2)), service_area_id=rng.choice(area_ids),
+                    date=self.past(rng), is_featured=rng.random() < 0.02, is_verified=rng.random() < 0.7,
+                ))
+            insert_chunk(Review, reviews)
+
+    def create_testimonials(self, area_ids, service_ids):
+        rng = self.rng('testimonials')
+        for chunk in self.chunks(self.counts['testimonials']):
+            testimonials = []
+            for index in chunk:
+                first, last, email = self.person(rng, index)
+                testimonials.append(Testimonial(
+                    customer_name=f'{first} {last}', email=email, title=rng.choice(REVIEW_PHRASES)[:60],
+                    location_id=rng.choice(area_ids), service_id=rng.choice(service_ids),
+                    rating=rng.choices([3, 4, 5], weights=[10, 30, 60])[0],
+                    comment=' '.join(rng.sample(REVIEW_PHRASES, 3)), is_featured=rng.random() < 0.02,
+                    is_approved=rng.random() < 0.9, is_verified=rng.random() < 0.5, created_at=self.past(rng),
+                ))
+            insert_chunk(Testimonial, testimonials)
+
+    def create_posts(self, area_ids, service_ids):
+        rng = self.rng('posts')
+        area_names = dict(ServiceArea.objects.filter(id__in=area_ids).values_list('id', 'name'))
+        for chunk in self.chunks(self.counts['posts']):
+            posts = []
+            for index in chunk:
+                area_id = rng.choice(area_ids)
+                suffix = f' ({self.seed}-{index})'
+                title = rng.choice(TITLE_PATTERNS).format(
+                    topic=rng.choice(TOPICS), area=area_names[area_id], n=rng.randrange(3, 12)
+                )
+                title = title[:200 - len(suffix)] + suffix
+                excerpt = rng.choice(SENTENCES)
+                created = self.past(rng)
+                paragraphs = ['\n'.join(rng.sample(SENTENCES, 4)) for _ in range(rng.randrange(3, 8))]
+                posts.append(BlogPost(
+                    title=title, slug=slugify(title), excerpt=excerpt, content='\n\n'.join(paragraphs),
+                    category=rng.choice(BlogPost.CATEGORY_CHOICES)[0],
+                    related_service_id=rng.choice(service_ids) if rng.random() < 0.6 else None,
+                    related_area_id=area_id if rng.random() < 0.5 else None,
+                    meta_title=title[:60], meta_description=excerpt[:160],
+                    tags=', '.join(rng.sample(TAG_WORDS, rng.randrange(1, 5))),
+                    is_published=rng.random() < 0.9, is_featured=rng.random() < 0.03,
+                    views=int(rng.paretovariate(1.5) * 20), created_at=created, updated_at=created,
+                ))
+            insert_chunk(BlogPost, posts)
+
+    def rebuild_derived_data(self, area_ids):
+        """What the save() overrides and signals would have maintained row by row"""
+        started = time.perf_counter()
+        invalidate_slug_index()
+
+        summaries = (
+            Review.objects.filter(service_area_id__in=area_ids)
+            .values('service_area_id').annotate(avg=Avg('rating'), count=Count('id')).order_by()
+        )
+        with transaction.atomic():
+            for row in summaries:
+                ServiceArea.objects.filter(pk=row['service_area_id']).update(
+                    review_count=row['count'], avg_rating=round(row['avg'] or 0, 2)
+                )
+        self.log(f'area rating summaries: {len(area_ids)} area(s)')
+
+        self.log(f'blog tags and related posts: {rebuild_all()} post(s)')
+        indexed = rebuild_search_index()
+        if indexed:
+            self.log(f'blog search index: {indexed} post(s)')
+
+        for label in ('areas.servicearea', 'services.service', 'services.testimonial',
+                      'quotes.quotecalculator', 'quotes.quoteoption'):
+            bump_version(label)
+        counts = refresh_unread_counts()
+        self.log(f'unread notifications: {sum(counts.values())}')
+        self.log(f'derived data rebuilt in {time.perf_counter() - started:.1f}s')
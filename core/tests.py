@@ -0,0 +1,228 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from areas.models import ServiceArea
+from blog.models import BlogPost
+from bookings.models import Booking
+from quotes.models import QuoteCalculator, QuoteRequest
+from services.models import Service
+
+from .email_outbox import STALE_LOCK_TIMEOUT, enqueue_email, process_outbox, release_stale_locks
+from .models import EmailOutbox
+from .query_budget import (
+    assert_query_budget, budgeted_views, create_sample_data, needs_login, sample_url_kwargs,
+)
+
+
+class StaffAPITestCase(TestCase):
+    """Logged-in staff client for the /core/admin/ JSON APIs"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', 'staff@example.com', 'password', is_staff=True)
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+        # SessionRouterMiddleware reads the admin APIs' session from the admin cookie
+        session_key = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+        self.client.cookies[settings.ADMIN_SESSION_COOKIE_NAME] = session_key
+
+    def post_json(self, url, data):
+        return self.client.post(url, json.dumps(data), content_type='application/json')
+
+
+class QuoteRepriceAPITests(StaffAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        service = Service.objects.create(name='Drain Cleaning', description='Drains', price_range='$100 - $300')
+        QuoteCalculator.objects.create(
+            service=service, base_price=Decimal('100'), labor_rate_per_hour=Decimal('50'), estimated_hours=Decimal('2')
+        )
+        cls.quotes = {
+            status: QuoteRequest.objects.create(
+                service=service, customer_name='Pat', email='pat@example.com', phone='4165550100',
+                address='1 Main St', estimated_total=Decimal('1.00'), status=status,
+            )
+            for status in ('pending', 'accepted')
+        }
+
+    def totals(self):
+        return {status: QuoteRequest.objects.get(pk=quote.pk).estimated_total for status, quote in self.quotes.items()}
+
+    def test_default_statuses_leave_priced_quotes_alone(self):
+        response = self.post_json(reverse('core:quote_reprice_api'), {})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.totals(), {'pending': Decimal('200.00'), 'accepted': Decimal('1.00')})
+
+    def test_empty_status_list_is_rejected(self):
+        response = self.post_json(reverse('core:quote_reprice_api'), {'statuses': []})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.totals(), {'pending': Decimal('1.00'), 'accepted': Decimal('1.00')})
+
+    def test_unknown_status_is_rejected(self):
+        response = self.post_json(reverse('core:quote_reprice_api'), {'statuses': ['pending', 'archived']})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('archived', response.json()['error'])
+
+
+class BulkStatusAPITests(StaffAPITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        service = Service.objects.create(name='Drain Cleaning', description='Drains', price_range='$100 - $300')
+        cls.bookings = [
+            Booking.objects.create(
+                customer_name='Pat', email='pat@example.com', phone='+16475550100', address='1 Main St',
+                service=service, urgency='medium', preferred_date=timezone.now() + timedelta(days=1),
+                description='Leak',
+            )
+            for _ in range(2)
+        ]
+
+    def post_items(self, items):
+        return self.post_json(reverse('core:booking_bulk_status_api'), {'items': items})
+
+    def test_updates_status_and_confirmation(self):
+        first, second = self.bookings
+        response = self.post_items([{'id': first.pk, 'status': 'confirmed'}, {'id': second.pk, 'status': 'cancelled'}])
+        self.assertEqual(response.json()['updated'], 2)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.status, first.is_confirmed), ('confirmed', True))
+        self.assertEqual((second.status, second.is_confirmed), ('cancelled', False))
+
+    def test_duplicate_ids_are_rejected(self):
+        booking = self.bookings[0]
+        response = self.post_items([{'id': booking.pk, 'status': 'confirmed'}, {'id': booking.pk, 'status': 'cancelled'}])
+        self.assertEqual(response.json()['updated'], 0)
+        self.assertEqual([result['error'] for result in response.json()['results']], ['Duplicate id', 'Duplicate id'])
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, 'pending')
+
+    def test_booleans_and_missing_rows_are_not_ok(self):
+        response = self.post_items([{'id': True, 'status': 'confirmed'}, {'id': 999999, 'status': 'confirmed'}])
+        self.assertEqual([result['error'] for result in response.json()['results']], ['Invalid id', 'Not found'])
+        self.assertFalse(Booking.objects.filter(pk=1, status='confirmed').exists())
+
+    def test_out_of_range_ids_are_invalid(self):
+        response = self.post_items([{'id': 10 ** 30, 'status': 'confirmed'}, {'id': 0, 'status': 'confirmed'}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['error'] for result in response.json()['results']], ['Invalid id', 'Invalid id'])
+
+    def test_unhashable_statuses_are_invalid(self):
+        first, second = self.bookings
+        response = self.post_items([{'id': first.pk, 'status': []}, {'id': second.pk, 'status': {}}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result['error'] for result in response.json()['results']], ['Invalid status: []', 'Invalid status: {}']
+        )
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    EMAIL_OUTBOX_MAX_ATTEMPTS=2,
+    EMAIL_OUTBOX_RETRY_BACKOFF=60,
+)
+class EmailOutboxTests(TestCase):
+    def test_delivers_queued_email(self):
+        entry = enqueue_email('Booking received', 'Thanks', ['pat@example.com'])
+        self.assertEqual(process_outbox(), (1, 1))
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.attempts), ('sent', 1))
+        self.assertEqual(mail.outbox[0].to, ['pat@example.com'])
+
+    def test_failures_back_off_then_dead_letter(self):
+        entry = enqueue_email('Booking received', 'Thanks', ['pat@example.com'])
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=OSError('down')):
+            self.assertEqual(process_outbox(), (1, 0))
+            entry.refresh_from_db()
+            self.assertEqual((entry.status, entry.attempts), ('pending', 1))
+            self.assertGreater(entry.next_attempt_at, timezone.now() + timedelta(seconds=50))
+            # Not due yet
+            self.assertEqual(process_outbox(), (0, 0))
+            EmailOutbox.objects.filter(pk=entry.pk).update(next_attempt_at=timezone.now())
+            process_outbox()
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.attempts, entry.last_error), ('dead', 2, 'down'))
+
+    def test_stale_locks_count_as_failed_attempts(self):
+        locked_at = timezone.now() - STALE_LOCK_TIMEOUT - timedelta(minutes=1)
+        entries = [
+            EmailOutbox.objects.create(
+                subject='Hi', body='Hi', from_email='site@example.com', to=['pat@example.com'],
+                status='sending', attempts=attempts, locked_at=locked_at,
+            )
+            for attempts in (0, 1)
+        ]
+        self.assertEqual(release_stale_locks(), 2)
+        retried, dead = [EmailOutbox.objects.get(pk=entry.pk) for entry in entries]
+        self.assertEqual((retried.status, retried.attempts, retried.locked_at), ('pending', 1, None))
+        self.assertGreater(retried.next_attempt_at, timezone.now() + timedelta(seconds=50))
+        self.assertEqual((dead.status, dead.attempts), ('dead', 2))
+
+    def test_retry_now_skips_messages_being_sent(self):
+        entries = {
+            status: EmailOutbox.objects.create(
+                subject='Hi', body='Hi', from_email='site@example.com', to=['pat@example.com'], status=status,
+                attempts=3, locked_at=timezone.now() if status == 'sending' else None,
+            )
+            for status in ('dead', 'sending', 'sent')
+        }
+        model_admin = admin.site._registry[EmailOutbox]
+        with mock.patch.object(model_admin, 'message_user'):
+            model_admin.retry_now(RequestFactory().post('/'), EmailOutbox.objects.all())
+        statuses = {status: EmailOutbox.objects.get(pk=entry.pk).status for status, entry in entries.items()}
+        self.assertEqual(statuses, {'dead': 'pending', 'sending': 'sending', 'sent': 'sent'})
+
+
+class QueryBudgetTests(TestCase):
+    """Every view in core.query_budgets stays within its budget on a cold cache, without N+1 queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        area = ServiceArea.objects.create(
+            name='Toronto', phone='+14165550100', email='toronto@example.com', address='1 King Street'
+        )
+        service = Service.objects.create(name='Drain Cleaning', description='Drains', price_range='$100 - $300')
+        post = BlogPost.objects.create(
+            title='Frozen pipes', excerpt='Winter tips', content='Keep the heat on.', category='seasonal',
+            tags='winter, pipes', related_service=service, related_area=area, is_published=True,
+        )
+        cls.sample = create_sample_data(area, service, post)
+
+    def setUp(self):
+        self.customer = self.client_class()
+        self.customer.login(username=self.sample['username'], password=self.sample['password'])
+        # SessionRouterMiddleware reads portal sessions from the customer cookie
+        session_key = self.customer.cookies[settings.SESSION_COOKIE_NAME].value
+        self.customer.cookies[settings.CUSTOMER_SESSION_COOKIE_NAME] = session_key
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_views_within_query_budgets(self):
+        for name in budgeted_views():
+            with self.subTest(view=name):
+                client = self.customer if needs_login(name) else self.client
+                url = reverse(name, kwargs=sample_url_kwargs(name, self.sample))
+                cache.clear()
+                with assert_query_budget(name):
+                    response = client.get(url)
+                self.assertLess(response.status_code, 500, url)
+                if needs_login(name):
+                    self.assertFalse(
+                        response.status_code == 302 and 'login' in response.get('Location', ''),
+                        f'{url} redirected to the login page',
+                    )
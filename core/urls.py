@@ -7,4 +7,8 @@ urlpatterns = [
     # API Endpoints for status updates
     path('admin/api/bookings/<int:booking_id>/', admin_views.booking_status_api, name='booking_status_api'),
     path('admin/api/quotes/<int:quote_id>/', admin_views.quote_status_api, name='quote_status_api'),
+    path('admin/api/quotes/reprice/', admin_views.quote_reprice_api, name='quote_reprice_api'),
+    path('admin/api/bookings/status/', admin_views.booking_bulk_status_api, name='booking_bulk_status_api'),
+    path('admin/api/quotes/status/', admin_views.quote_bulk_status_api, name='quote_bulk_status_api'),
+    path('admin/notifications/stream/', admin_views.admin_notification_stream, name='admin_notification_stream'),
 ]
\ No newline at end of file
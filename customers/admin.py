@@ -33,6 +33,7 @@ class CustomerDocumentInline(admin.TabularInline):
 @admin.register(CustomerProfile)
 class CustomerProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'phone', 'service_area', 'city', 'preferred_contact_method', 'created_at')
+    list_select_related = ('user', 'service_area')
     list_filter = ('service_area', 'preferred_contact_method', 'email_notifications', 'sms_notifications', 'created_at')
     search_fields = ('user__username', 'user__email', 'user__first_name', 'user__last_name', 'phone', 'service_area__name')
     readonly_fields = ('created_at', 'updated_at')
@@ -64,6 +65,7 @@ class CustomerProfileAdmin(admin.ModelAdmin):
 @admin.register(CustomerNote)
 class CustomerNoteAdmin(admin.ModelAdmin):
     list_display = ('customer', 'note_preview', 'created_by', 'is_internal', 'created_at')
+    list_select_related = ('customer__user', 'created_by')
     list_filter = ('is_internal', 'created_at')
     search_fields = ('customer__user__username', 'customer__user__email', 'note')
     readonly_fields = ('created_at',)
@@ -76,6 +78,7 @@ class CustomerNoteAdmin(admin.ModelAdmin):
 @admin.register(CustomerDocument)
 class CustomerDocumentAdmin(admin.ModelAdmin):
     list_display = ('title', 'customer', 'document_type', 'is_public', 'created_at')
+    list_select_related = ('customer__user',)
     list_filter = ('document_type', 'is_public', 'created_at')
     search_fields = ('title', 'customer__user__username', 'customer__user__email')
     readonly_fields = ('created_at',)
@@ -0,0 +1,66 @@
+"""
+Customer dashboard data.
+
+The dashboard shows recent bookings and quotes plus a few counts. Counts
+come from one conditional aggregate per model and the whole payload is
+cached per customer; customers.signals drops the entry whenever one of
+the customer's bookings or quotes is saved or deleted. Records are
+matched on the customer FK only; see customers.linking.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from bookings.models import Booking
+from quotes.models import QuoteRequest
+
+DASHBOARD_CACHE_TIMEOUT = 600  # seconds
+RECENT_ITEMS = 5
+
+
+def dashboard_cache_key(profile_id):
+    return f'customers:dashboard:{profile_id}'
+
+
+def build_dashboard_data(profile):
+    records = Q(customer=profile)
+
+    booking_counts = Booking.objects.filter(records).aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(is_confirmed=False)),
+    )
+    quote_counts = QuoteRequest.objects.filter(records).aggregate(total=Count('id'))
+
+    recent_bookings = list(
+        Booking.objects.filter(records)
+        .select_related('service', 'service_area')
+        .order_by('-created_at')[:RECENT_ITEMS]
+    )
+    recent_quotes = list(
+        QuoteRequest.objects.filter(records)
+        .select_related('service')
+        .order_by('-created_at')[:RECENT_ITEMS]
+    )
+
+    return {
+        'recent_bookings': recent_bookings,
+        'recent_quotes': recent_quotes,
+        'total_bookings': booking_counts['total'],
+        'pending_bookings': booking_counts['pending'],
+        'total_quotes': quote_counts['total'],
+    }
+
+
+def get_dashboard_data(profile):
+    key = dashboard_cache_key(profile.pk)
+    data = cache.get(key)
+    if data is None:
+        data = build_dashboard_data(profile)
+        cache.set(key, data, DASHBOARD_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_dashboard(customer_ids):
+    """Drop cached dashboards for the given profiles"""
+    keys = [dashboard_cache_key(customer_id) for customer_id in set(customer_ids) if customer_id]
+    if keys:
+        cache.delete_many(keys)
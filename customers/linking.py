@@ -0,0 +1,92 @@
+"""
+Linking bookings and quotes to customer accounts.
+
+Bookings and quote requests made without logging in only carry an email
+address. They are attached to the CustomerProfile whose user has that
+email (case-insensitive, oldest profile wins) when they are saved, when
+the profile is created or its user's email changes, and in bulk by the
+link_customer_records command, so the portal can filter on the indexed
+customer FK alone.
+"""
+from django.db import transaction
+
+from bookings.models import Booking
+from quotes.models import QuoteRequest
+
+from .dashboard import invalidate_dashboard
+from .models import CustomerProfile
+
+LINKED_MODELS = (Booking, QuoteRequest)
+
+
+def find_customer_id(email):
+    """Id of the oldest profile whose account uses this email, or None"""
+    if not email:
+        return None
+    return (
+        CustomerProfile.objects.filter(user__email__iexact=email)
+        .order_by('created_at', 'id')
+        .values_list('id', flat=True)
+        .first()
+    )
+
+
+def customer_ids_by_email():
+    """Map lower-cased account email -> oldest profile id, for bulk linking"""
+    mapping = {}
+    profiles = (
+        CustomerProfile.objects.exclude(user__email='')
+        .order_by('created_at', 'id')
+        .values_list('id', 'user__email')
+    )
+    for profile_id, email in profiles.iterator():
+        mapping.setdefault(email.lower(), profile_id)
+    return mapping
+
+
+def link_records_to_profile(profile):
+    """Attach this account's unlinked bookings and quotes to it; returns the number linked"""
+    email = profile.user.email
+    if not email or find_customer_id(email) != profile.pk:
+        return 0
+    linked = 0
+    for model in LINKED_MODELS:
+        linked += model.objects.filter(customer__isnull=True, email__iexact=email).update(customer=profile)
+    return linked
+
+
+def link_unlinked_records(model, batch_size=1000, dry_run=False):
+    """
+    Link every unlinked row of model in primary key batches, one transaction
+    and one UPDATE per customer per batch, then drop the dashboards of the
+    customers that gained rows. Returns (scanned, linked).
+    """
+    mapping = customer_ids_by_email()
+    scanned = linked = 0
+    last_id = 0
+    while True:
+        rows = list(
+            model.objects.filter(customer__isnull=True, pk__gt=last_id)
+            .order_by('pk')
+            .values_list('pk', 'email')[:batch_size]
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        scanned += len(rows)
+
+        ids_by_customer = {}
+        for pk, email in rows:
+            customer_id = mapping.get((email or '').lower())
+            if customer_id:
+                ids_by_customer.setdefault(customer_id, []).append(pk)
+
+        if dry_run:
+            linked += sum(len(ids) for ids in ids_by_customer.values())
+            continue
+        with transaction.atomic():
+            for customer_id, ids in ids_by_customer.items():
+                linked += model.objects.filter(pk__in=ids, customer__isnull=True).update(customer_id=customer_id)
+        # update() skips the save signals that refresh customer dashboards
+        invalidate_dashboard(ids_by_customer)
+    return scanned, linked
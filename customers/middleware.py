@@ -0,0 +1,54 @@
+"""
+Lazy request.customer_profile for the customer portal.
+
+The profile is loaded on first access only, with its user and service
+area, and cached per user for the session lifetime. Portal views are
+login_required, so the attribute is a profile there; for anonymous
+users it evaluates falsy (use ``if request.customer_profile:``, not an
+``is None`` check, since the attribute is a lazy proxy).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+from core.cache_versions import versioned_key
+
+from .models import CustomerProfile
+
+
+def profile_cache_key(user_id):
+    # Versioned on service areas so a renamed area is never served from a cached profile
+    return versioned_key(f'customers:profile:{user_id}', 'areas.servicearea')
+
+
+def invalidate_customer_profile(user_id):
+    cache.delete(profile_cache_key(user_id))
+
+
+def get_customer_profile(request):
+    user = request.user
+    if not user.is_authenticated:
+        return None
+
+    key = profile_cache_key(user.pk)
+    profile = cache.get(key)
+    if profile is None:
+        profile = CustomerProfile.objects.select_related('user', 'service_area').filter(user=user).first()
+        if profile is None:
+            # Accounts created before profiles were made at registration/login
+            profile, _ = CustomerProfile.objects.get_or_create(user=user)
+        cache.set(key, profile, settings.SESSION_COOKIE_AGE)
+
+    # Never keep the cached copy of the user: saving the profile form writes
+    # through profile.user, which must be the one loaded for this request
+    profile.user = user
+    return profile
+
+
+class CustomerProfileMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.customer_profile = SimpleLazyObject(lambda: get_customer_profile(request))
+        return self.get_response(request)
@@ -0,0 +1,75 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from bookings.models import Booking
+from quotes.models import QuoteRequest
+
+from .dashboard import invalidate_dashboard
+from .linking import find_customer_id, link_records_to_profile
+from .middleware import invalidate_customer_profile
+from .models import CustomerProfile
+
+
+@receiver(pre_save, sender=Booking)
+@receiver(pre_save, sender=QuoteRequest)
+def link_and_remember_owner(sender, instance, **kwargs):
+    """
+    Attach records placed without logging in to the account with the same
+    email, and keep the previous owner so a record moved between customers
+    refreshes both dashboards.
+    """
+    if instance.customer_id is None:
+        instance.customer_id = find_customer_id(instance.email)
+    instance._previous_customer_id = None
+    if instance.pk:
+        instance._previous_customer_id = (
+            sender.objects.filter(pk=instance.pk).values_list('customer_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+@receiver(post_save, sender=QuoteRequest)
+@receiver(post_delete, sender=QuoteRequest)
+def customer_record_changed(sender, instance, **kwargs):
+    invalidate_dashboard([instance.customer_id, getattr(instance, '_previous_customer_id', None)])
+
+
+@receiver(post_save, sender=CustomerProfile)
+def link_new_profile(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and link_records_to_profile(instance):
+        invalidate_dashboard([instance.pk])
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_email(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._previous_email = None
+    if instance.pk and not raw and (update_fields is None or 'email' in update_fields):
+        instance._previous_email = sender.objects.filter(pk=instance.pk).values_list('email', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def link_records_for_new_email(sender, instance, created, raw=False, **kwargs):
+    """Records placed under the account's new email before it was changed belong to it now"""
+    previous = getattr(instance, '_previous_email', None)
+    if created or raw or previous is None or previous.lower() == (instance.email or '').lower():
+        return
+    profile = CustomerProfile.objects.select_related('user').filter(user=instance).first()
+    if profile is not None and link_records_to_profile(profile):
+        invalidate_dashboard([profile.pk])
+
+
+@receiver(post_save, sender=CustomerProfile)
+@receiver(post_delete, sender=CustomerProfile)
+def customer_profile_changed(sender, instance, **kwargs):
+    invalidate_customer_profile(instance.user_id)
+
+
+@receiver(user_logged_in)
+def ensure_customer_profile(sender, request, user, **kwargs):
+    """Create the profile at login so portal requests never have to"""
+    if user.is_staff:
+        return
+    CustomerProfile.objects.get_or_create(user=user)
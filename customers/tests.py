@@ -1,3 +1,47 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+
+from bookings.models import Booking
+from services.models import Service
+
+from .dashboard import dashboard_cache_key
+from .linking import link_unlinked_records
+from .models import CustomerProfile
+
+
+class RecordLinkingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('pat', 'pat@example.com', 'password')
+        cls.profile = CustomerProfile.objects.create(user=cls.user)
+        cls.service = Service.objects.create(name='Drain Cleaning', description='Drains', price_range='$100 - $300')
+
+    def tearDown(self):
+        cache.clear()
+
+    def create_booking(self, email):
+        return Booking.objects.create(
+            customer_name='Pat', email=email, phone='+16475550100', address='1 Main St', service=self.service,
+            urgency='medium', preferred_date=timezone.now() + timedelta(days=1), description='Leak',
+        )
+
+    def test_changing_email_links_records_placed_under_it(self):
+        booking = self.create_booking('pat@work.example.com')
+        self.assertIsNone(booking.customer_id)
+        cache.set(dashboard_cache_key(self.profile.pk), {'stale': True})
+        self.user.email = 'Pat@Work.example.com'
+        self.user.save()
+        booking.refresh_from_db()
+        self.assertEqual(booking.customer_id, self.profile.pk)
+        self.assertIsNone(cache.get(dashboard_cache_key(self.profile.pk)))
 
-# Create your tests here.
+    def test_bulk_linking_drops_affected_dashboards(self):
+        booking = self.create_booking('pat@example.com')
+        Booking.objects.filter(pk=booking.pk).update(customer=None)
+        cache.set(dashboard_cache_key(self.profile.pk), {'stale': True})
+        self.assertEqual(link_unlinked_records(Booking), (1, 1))
+        self.assertIsNone(cache.get(dashboard_cache_key(self.profile.pk)))
@@ -3,10 +3,10 @@ from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
-from django.db.models import Q
 from django.core.paginator import Paginator
 from .forms import CustomerRegistrationForm, CustomerProfileForm, QuickBookingForm
-from .models import CustomerProfile, CustomerDocument
+from .models import CustomerDocument
+from .dashboard import get_dashboard_data
 from bookings.models import Booking
 from quotes.models import QuoteRequest
 from bookings.models import ContactMessage
@@ -27,17 +27,7 @@ def register(request):
 
 @login_required
 def dashboard(request):
-    customer_profile, created = CustomerProfile.objects.get_or_create(user=request.user)
-    
-    # Get recent bookings
-    recent_bookings = Booking.objects.filter(
-        Q(email=request.user.email) | Q(customer=customer_profile)
-    ).order_by('-created_at')[:5]
-    
-    # Get recent quotes
-    recent_quotes = QuoteRequest.objects.filter(
-        Q(email=request.user.email) | Q(customer=customer_profile)
-    ).order_by('-created_at')[:5]
+    customer_profile = request.customer_profile
     
     # Get recent documents
     recent_documents = CustomerDocument.objects.filter(
@@ -45,36 +35,19 @@ def dashboard(request):
         is_public=True
     ).order_by('-created_at')[:5]
     
-    # Statistics
-    total_bookings = Booking.objects.filter(
-        Q(email=request.user.email) | Q(customer=customer_profile)
-    ).count()
-    
-    total_quotes = QuoteRequest.objects.filter(
-        Q(email=request.user.email) | Q(customer=customer_profile)
-    ).count()
-    
-    pending_bookings = Booking.objects.filter(
-        Q(email=request.user.email) | Q(customer=customer_profile),
-        is_confirmed=False
-    ).count()
-    
     context = {
         'customer_profile': customer_profile,
-        'recent_bookings': recent_bookings,
-        'recent_quotes': recent_quotes,
         'recent_documents': recent_documents,
-        'total_bookings': total_bookings,
-        'total_quotes': total_quotes,
-        'pending_bookings': pending_bookings,
     }
+    # Recent bookings/quotes and statistics, cached per customer
+    context.update(get_dashboard_data(customer_profile))
     
     return render(request, 'customers/dashboard.html', context)
 
 
 @login_required
 def profile(request):
-    customer_profile, created = CustomerProfile.objects.get_or_create(user=request.user)
+    customer_profile = request.customer_profile
     
     if request.method == 'POST':
         form = CustomerProfileForm(request.POST, instance=customer_profile)
@@ -93,12 +66,12 @@ def profile(request):
 
 @login_required
 def bookings(request):
-    customer_profile, created = CustomerProfile.objects.get_or_create(user=request.user)
+    customer_profile = request.customer_profile
     
     # Get all bookings for this customer
     bookings_list = Booking.objects.filter(
-        Q(email=request.user.email) | Q(customer=customer_profile)
-    ).order_by('-created_at')
+        customer=customer_profile
+    ).select_related('service').order_by('-created_at')
     
     # Pagination
     paginator = Paginator(bookings_list, 10)
@@ -113,12 +86,12 @@ def bookings(request):
 
 @login_required
 def booking_detail(request, booking_id):
-    customer_profile, created = CustomerProfile.objects.get_or_create(user=request.user)
+    customer_profile = request.customer_profile
     
     booking = get_object_or_404(
         Booking,
         id=booking_id,
-        email=request.user.email
+        customer=customer_profile
     )
     
     return render(request, 'customers/booking_detail.html', {
@@ -129,12 +102,12 @@ def booking_detail(request, booking_id):
 
 @login_required
 def quotes(request):
-    customer_profile, created = CustomerProfile.objects.get_or_create(user=request.user)
+    customer_profile = request.customer_profile
     
     # Get all quotes for this customer
     quotes_list = QuoteRequest.objects.filter(
-        Q(email=request.user.email) | Q(customer=customer_profile)
-    ).order_by('-created_at')
+        customer=customer_profile
+    ).select_related('service').order_by('-created_at')
     
     # Pagination
     paginator = Paginator(quotes_list, 10)
@@ -149,12 +122,12 @@ def quotes(request):
 
 @login_required
 def quote_detail(request, quote_id):
-    customer_profile, created = CustomerProfile.objects.get_or_create(user=request.user)
+    customer_profile = request.customer_profile
     
     quote = get_object_or_404(
         QuoteRequest,
         id=quote_id,
-        email=request.user.email
+        customer=customer_profile
     )
     
     return render(request, 'customers/quote_detail.html', {
@@ -165,12 +138,12 @@ def quote_detail(request, quote_id):
 
 @login_required
 def accept_quote(request, quote_id):
-    customer_profile, created = CustomerProfile.objects.get_or_create(user=request.user)
+    customer_profile = request.customer_profile
     
     quote = get_object_or_404(
         QuoteRequest,
         id=quote_id,
-        email=request.user.email,
+        customer=customer_profile,
         status='quoted'
     )
     
@@ -188,12 +161,12 @@ def accept_quote(request, quote_id):
 
 @login_required
 def book_from_quote(request, quote_id):
-    customer_profile, created = CustomerProfile.objects.get_or_create(user=request.user)
+    customer_profile = request.customer_profile
     
     quote = get_object_or_404(
         QuoteRequest,
         id=quote_id,
-        email=request.user.email,
+        customer=customer_profile,
         status='accepted'
     )
     
@@ -249,7 +222,7 @@ def book_from_quote(request, quote_id):
 
 @login_required
 def quick_booking(request):
-    customer_profile, created = CustomerProfile.objects.get_or_create(user=request.user)
+    customer_profile = request.customer_profile
     
     if request.method == 'POST':
         form = QuickBookingForm(request.POST)
@@ -308,12 +281,12 @@ def quick_booking(request):
 
 @login_required
 def cancel_booking(request, booking_id):
-    customer_profile, created = CustomerProfile.objects.get_or_create(user=request.user)
+    customer_profile = request.customer_profile
     
     booking = get_object_or_404(
         Booking,
         id=booking_id,
-        email=request.user.email,
+        customer=customer_profile,
         status__in=['pending', 'confirmed']  # Only allow cancelling pending/confirmed bookings
     )
     
@@ -331,13 +304,13 @@ def service_history(request):
     from django.db.models import Count
     from datetime import datetime
     
-    customer_profile, created = CustomerProfile.objects.get_or_create(user=request.user)
+    customer_profile = request.customer_profile
     
     # Get completed bookings (service history)
     completed_bookings = Booking.objects.filter(
-        Q(email=request.user.email) | Q(customer=customer_profile),
+        customer=customer_profile,
         status='completed'
-    ).order_by('-updated_at')
+    ).select_related('service').order_by('-updated_at')
     
     # Statistics
     total_services = completed_bookings.count()
@@ -30,6 +30,8 @@ python manage.py collectstatic --noinput
 
 # Restart services
 sudo systemctl restart gunicorn
+sudo systemctl restart email-outbox
+sudo systemctl restart notification-stream
 sudo systemctl restart nginx
 sudo systemctl restart redis
 
@@ -1,7 +1,10 @@
 # Gunicorn configuration file
 bind = "127.0.0.1:8000"
 workers = 3
-worker_class = "sync"
+# Sessions are routed per request (core.middleware.SessionRouterMiddleware),
+# so threaded workers no longer share mutable session settings
+worker_class = "gthread"
+threads = 4
 worker_connections = 1000
 max_requests = 1000
 max_requests_jitter = 100
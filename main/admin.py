@@ -6,6 +6,7 @@ from .models import GalleryImage
 @admin.register(GalleryImage)
 class GalleryImageAdmin(admin.ModelAdmin):
     list_display = ['title', 'category', 'service', 'location', 'is_featured', 'is_active', 'order', 'image_preview', 'has_before_after']
+    list_select_related = ['service', 'location']
     list_filter = ['category', 'service', 'location', 'is_featured', 'is_active', 'created_at']
     search_fields = ['title', 'description']
     list_editable = ['is_featured', 'is_active', 'order']
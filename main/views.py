@@ -1,7 +1,7 @@
 from django.shortcuts import render, redirect
 from django.contrib import messages
+from django.core.cache import cache
 from django.db.models import Prefetch, Avg, Count
-from django.utils.text import slugify
 from django.utils.html import escape
 from django.core.exceptions import ValidationError
 from django_ratelimit.decorators import ratelimit
@@ -13,6 +13,7 @@ from areas.models import ServiceArea
 from bookings.models import Booking, ContactMessage
 from .models import GalleryImage
 from .forms import BookingForm, ContactForm, CustomerFeedbackForm
+from core.cache_versions import versioned_key
 from core.email_utils import (
     send_booking_confirmation_email, 
     send_contact_confirmation_email,
@@ -21,17 +22,22 @@ from core.email_utils import (
 )
 
 
-def home(request):
+# Models whose changes invalidate the cached homepage context (see main.signals)
+HOME_CACHE_SOURCES = ('services.service', 'services.testimonial', 'services.faq', 'areas.servicearea')
+HOME_CACHE_TIMEOUT = 60 * 60
+
+
+def _build_home_context():
     # Optimized queries with select_related and ordering
-    services = (Service.objects
-                .select_related()
-                .order_by('-created_at')[:4])
+    services = list(Service.objects
+                    .select_related()
+                    .order_by('-created_at')[:4])
     
     # Get featured testimonials with rating statistics
-    testimonials = (Testimonial.objects
-                   .filter(is_approved=True, is_featured=True)
-                   .select_related('service', 'location')
-                   .order_by('-created_at')[:6])
+    testimonials = list(Testimonial.objects
+                        .filter(is_approved=True, is_featured=True)
+                        .select_related('service', 'location')
+                        .order_by('-created_at')[:6])
     
     # Calculate overall rating and review count
     rating_stats = Testimonial.objects.filter(is_approved=True).aggregate(
@@ -43,26 +49,22 @@ def home(request):
     if overall_rating:
         overall_rating = round(overall_rating, 1)
     
-    faqs = (FAQ.objects
-            .filter(is_active=True)
-            .order_by('order', 'created_at')[:6])
-    
-    service_areas = ServiceArea.objects.filter(is_active=True).order_by('name')
+    faqs = list(FAQ.objects
+                .filter(is_active=True)
+                .order_by('order', 'created_at')[:6])
     
-    # Add slug property to each service area for template URLs
-    for area in service_areas:
-        area.slug = slugify(area.name)
+    service_areas = list(ServiceArea.objects.filter(is_active=True).order_by('name'))
     
     # Get review platform URLs (from first active service area)
     google_business_url = yelp_url = trustpilot_url = reddit_url = None
-    if service_areas.exists():
-        first_area = service_areas.first()
+    if service_areas:
+        first_area = service_areas[0]
         google_business_url = first_area.google_business_url if first_area.google_business_url else None
         yelp_url = first_area.yelp_url if first_area.yelp_url else None
         trustpilot_url = first_area.trustpilot_url if first_area.trustpilot_url else None
         reddit_url = first_area.reddit_url if first_area.reddit_url else None
     
-    context = {
+    return {
         'services': services,
         'testimonials': testimonials,
         'overall_rating': overall_rating,
@@ -74,6 +76,15 @@ def home(request):
         'trustpilot_url': trustpilot_url,
         'reddit_url': reddit_url,
     }
+
+
+def home(request):
+    # Served from cache until an admin edits one of the source models
+    cache_key = versioned_key('home:context', *HOME_CACHE_SOURCES)
+    context = cache.get(cache_key)
+    if context is None:
+        context = _build_home_context()
+        cache.set(cache_key, context, HOME_CACHE_TIMEOUT)
     return render(request, 'home.html', context)
 
 
@@ -195,7 +206,9 @@ def gallery_view(request):
     locations = ServiceArea.objects.filter(is_active=True).order_by('name')
     
     # Get featured images for hero section
-    featured_images = GalleryImage.objects.filter(is_active=True, is_featured=True)[:6]
+    featured_images = GalleryImage.objects.filter(
+        is_active=True, is_featured=True
+    ).select_related('service', 'location')[:6]
     
     context = {
         'images': images,
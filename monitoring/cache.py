@@ -0,0 +1,34 @@
+"""
+Cache backends that count hits and misses for monitoring.metrics.
+
+Drop-in subclass of the production Redis backend; lookups made while a
+request is being measured are added to that request's stats.
+"""
+from .metrics import record_cache_lookup
+
+_missing = object()
+
+
+class InstrumentedCacheMixin:
+    def get(self, key, default=None, version=None, **kwargs):
+        value = super().get(key, _missing, version=version, **kwargs)
+        if value is _missing:
+            record_cache_lookup(0, 1)
+            return default
+        record_cache_lookup(1, 0)
+        return value
+
+    def get_many(self, keys, version=None, **kwargs):
+        keys = list(keys)
+        found = super().get_many(keys, version=version, **kwargs)
+        record_cache_lookup(len(found), len(keys) - len(found))
+        return found
+
+
+try:
+    from django_redis.cache import RedisCache as BaseRedisCache
+except ImportError:  # django-redis is only installed for production
+    pass
+else:
+    class RedisCache(InstrumentedCacheMixin, BaseRedisCache):
+        pass
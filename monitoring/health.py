@@ -0,0 +1,207 @@
+"""
+Pluggable dependency health checks.
+
+Checks are registered with @register and run in parallel on a small
+thread pool, each with its own timeout. A check passes by returning
+(optionally a dict of details) and fails by raising. The combined result
+is cached in process for HEALTH_CHECK_CACHE_SECONDS, so frequent
+load-balancer probes are served from memory, and only one thread per
+process runs the checks at a time.
+
+Overall status:
+
+* healthy: every check passed.
+* degraded: a non-critical check failed, or any check timed out; the
+  process can still serve requests, so the probe answers 200.
+* unhealthy: a critical check failed; the probe answers 503.
+
+Checks that talk to external services or are slow (SMTP, media
+storage, the migration graph) keep their own result for longer with
+register(cache_seconds=...), so probes every few seconds don't log in to
+the mail server or write files at that rate.
+
+A check that timed out keeps running in the background and is not
+started again until it finishes, so a hung dependency cannot exhaust
+the pool.
+"""
+import logging
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+from django.db.migrations.executor import MigrationExecutor
+
+logger = logging.getLogger(__name__)
+
+HEALTHY = 'healthy'
+DEGRADED = 'degraded'
+UNHEALTHY = 'unhealthy'
+
+
+class HealthCheck:
+    def __init__(self, name, func, timeout, critical, cache_seconds):
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+        self.critical = critical
+        self.cache_seconds = cache_seconds
+        self.pending = None  # future of a run that outlived its timeout
+        self.last = (0, None)  # (monotonic expiry, result) kept for cache_seconds
+
+    def cached_result(self):
+        expires, result = self.last
+        if result is not None and time.monotonic() < expires:
+            return dict(result, cached=True)
+        return None
+
+    def remember(self, result):
+        if self.cache_seconds:
+            self.last = (time.monotonic() + self.cache_seconds, result)
+
+    def run(self):
+        close_old_connections()
+        try:
+            return self.func()
+        finally:
+            close_old_connections()
+
+
+_checks = {}
+
+
+def register(name=None, timeout=2.0, critical=True, cache_seconds=0):
+    """Decorator adding a check function to the registry"""
+    def decorator(func):
+        check_name = name or func.__name__
+        _checks[check_name] = HealthCheck(check_name, func, timeout, critical, cache_seconds)
+        return func
+    return decorator
+
+
+@register('database', timeout=2.0)
+def check_database():
+    for alias in connections:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+
+@register('cache', timeout=1.0)
+def check_cache():
+    cache = caches['default']
+    key = f'health_check:{uuid.uuid4().hex}'
+    cache.set(key, 'ok', 10)
+    if cache.get(key) != 'ok':
+        raise RuntimeError('value written to the cache could not be read back')
+    cache.delete(key)
+
+
+@register('email', timeout=3.0, critical=False, cache_seconds=300)
+def check_email():
+    """The SMTP server accepts TCP connections; no handshake or login"""
+    backend = settings.EMAIL_BACKEND.rsplit('.', 2)[-2]
+    if backend != 'smtp':
+        return {'backend': backend}
+    socket.create_connection((settings.EMAIL_HOST, int(settings.EMAIL_PORT)), timeout=2.0).close()
+    return {'backend': backend, 'host': settings.EMAIL_HOST}
+
+
+@register('storage', timeout=2.0, critical=False, cache_seconds=300)
+def check_storage():
+    name = default_storage.save(f'health_check/{uuid.uuid4().hex}.txt', ContentFile(b'ok'))
+    default_storage.delete(name)
+
+
+@register('migrations', timeout=3.0, critical=False, cache_seconds=60)
+def check_migrations():
+    executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if plan:
+        pending = ', '.join(f'{migration.app_label}.{migration.name}' for migration, _ in plan[:5])
+        raise RuntimeError(f'{len(plan)} unapplied migration(s): {pending}')
+
+
+_executor = None
+_run_lock = threading.Lock()
+_cached = (0, None)  # (monotonic expiry, report)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=max(len(_checks), 1), thread_name_prefix='health-check')
+    return _executor
+
+
+def _timed(check):
+    start = time.perf_counter()
+    detail = check.run()
+    return detail, time.perf_counter() - start
+
+
+def run_checks():
+    """Run every registered check in parallel and combine the results"""
+    executor = _get_executor()
+    started = time.monotonic()
+    futures = {}
+    results = {}
+    for check in _checks.values():
+        cached = check.cached_result()
+        if cached is not None:
+            results[check.name] = cached
+            continue
+        if check.pending is not None and not check.pending.done():
+            results[check.name] = {'status': 'timeout', 'error': 'previous run still in progress'}
+            continue
+        futures[check.name] = executor.submit(_timed, check)
+
+    for name, future in futures.items():
+        check = _checks[name]
+        remaining = max(check.timeout - (time.monotonic() - started), 0)
+        try:
+            detail, latency = future.result(timeout=remaining)
+        except FutureTimeout:
+            check.pending = future
+            results[name] = {'status': 'timeout', 'error': f'no answer within {check.timeout}s'}
+        except Exception as e:
+            logger.warning(f'Health check {name} failed: {e}')
+            results[name] = {'status': 'error', 'error': str(e)}
+            check.remember(results[name])
+        else:
+            check.pending = None
+            results[name] = {'status': 'ok', 'latency_ms': round(latency * 1000, 2)}
+            if detail:
+                results[name]['detail'] = detail
+            check.remember(results[name])
+
+    status = HEALTHY
+    for name, result in results.items():
+        if result['status'] == 'ok':
+            continue
+        if result['status'] == 'error' and _checks[name].critical:
+            status = UNHEALTHY
+            break
+        status = DEGRADED
+    return {'status': status, 'checks': results, 'timestamp': time.time()}
+
+
+def get_health():
+    """Cached report of run_checks(); returns (report, served_from_cache)"""
+    global _cached
+    expires, report = _cached
+    if report is not None and time.monotonic() < expires:
+        return report, True
+    with _run_lock:
+        # Another thread may have refreshed it while we waited
+        expires, report = _cached
+        if report is not None and time.monotonic() < expires:
+            return report, True
+        report = run_checks()
+        _cached = (time.monotonic() + settings.HEALTH_CHECK_CACHE_SECONDS, report)
+    return report, False
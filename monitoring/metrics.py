@@ -0,0 +1,199 @@
+"""
+In-process request metrics in the Prometheus text exposition format.
+
+MonitoringMiddleware records one observation per request, labelled with
+the resolved view name: latency, database queries and time (counted
+through connection.execute_wrapper, so DEBUG is not needed), cache hits
+and misses (counted by the monitoring.cache backends) and response size.
+Everything is aggregated in memory per worker process; each gunicorn
+worker serves its own numbers at /monitoring/metrics, labelled with its
+pid so scrapes from different workers can be told apart.
+
+core.email_sender.BatchEmailSender counts the SMTP connections it opens
+and the messages it sends over them (connection reuse is the ratio of
+the two). The outbox worker is not a web process, so
+process_email_outbox --metrics-port serves its registry with
+serve_metrics().
+"""
+import bisect
+import contextvars
+import os
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+
+PROCESS_START = time.time()
+
+
+class RequestStats:
+    """What one request did, filled in while it runs"""
+    __slots__ = ('queries', 'db_time', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - start
+
+
+current_request = contextvars.ContextVar('monitoring_current_request', default=None)
+
+
+def record_cache_lookup(hits, misses):
+    stats = current_request.get()
+    if stats is not None:
+        stats.cache_hits += hits
+        stats.cache_misses += misses
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last one is +Inf
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = defaultdict(int)  # (view, method, status) -> count
+        self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))  # (view, method)
+        self.queries = defaultdict(lambda: Histogram(QUERY_BUCKETS))  # view
+        self.response_size = defaultdict(lambda: Histogram(SIZE_BUCKETS))  # view
+        self.db_time = defaultdict(float)  # view
+        self.cache_hits = defaultdict(int)  # view
+        self.cache_misses = defaultdict(int)  # view
+        self.email_connections = 0
+        self.email_messages = defaultdict(int)  # result ('sent' or 'failed')
+
+    def observe_request(self, view, method, status, duration, stats, size=None):
+        with self._lock:
+            self.requests[(view, method, str(status))] += 1
+            self.latency[(view, method)].observe(duration)
+            self.queries[view].observe(stats.queries)
+            self.db_time[view] += stats.db_time
+            self.cache_hits[view] += stats.cache_hits
+            self.cache_misses[view] += stats.cache_misses
+            if size is not None:
+                self.response_size[view].observe(size)
+
+    def observe_email_connection(self):
+        with self._lock:
+            self.email_connections += 1
+
+    def observe_email(self, result):
+        with self._lock:
+            self.email_messages[result] += 1
+
+    def render(self):
+        """The registry in Prometheus text format"""
+        pid = str(os.getpid())
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        def sample(name, labels, value):
+            labels = {'pid': pid, **labels}
+            label_text = ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+            lines.append(f'{name}{{{label_text}}} {_number(value)}')
+
+        def histogram(name, help_text, series, label_names):
+            metric(name, 'histogram', help_text)
+            for key, hist in sorted(series.items()):
+                labels = dict(zip(label_names, key if isinstance(key, tuple) else (key,)))
+                cumulative = 0
+                for bound, count in zip(hist.buckets + ('+Inf',), hist.counts):
+                    cumulative += count
+                    sample(f'{name}_bucket', {**labels, 'le': _number(bound)}, cumulative)
+                sample(f'{name}_sum', labels, hist.sum)
+                sample(f'{name}_count', labels, hist.count)
+
+        def counter(name, help_text, series, label_names):
+            metric(name, 'counter', help_text)
+            for key, value in sorted(series.items()):
+                sample(name, dict(zip(label_names, key if isinstance(key, tuple) else (key,))), value)
+
+        with self._lock:
+            counter('plumber_http_requests_total', 'Requests handled, by view, method and status',
+                    self.requests, ('view', 'method', 'status'))
+            histogram('plumber_http_request_duration_seconds', 'Request latency by view',
+                      self.latency, ('view', 'method'))
+            histogram('plumber_http_request_db_queries', 'Database queries per request by view',
+                      self.queries, ('view',))
+            counter('plumber_http_request_db_seconds_total', 'Time spent in database queries by view',
+                    self.db_time, ('view',))
+            counter('plumber_http_request_cache_hits_total', 'Cache hits by view',
+                    self.cache_hits, ('view',))
+            counter('plumber_http_request_cache_misses_total', 'Cache misses by view',
+                    self.cache_misses, ('view',))
+            histogram('plumber_http_response_size_bytes', 'Response body size by view',
+                      self.response_size, ('view',))
+            if self.email_connections or self.email_messages:
+                metric('plumber_email_connections_opened_total', 'counter', 'Email backend connections opened')
+                sample('plumber_email_connections_opened_total', {}, self.email_connections)
+                counter('plumber_email_messages_total', 'Emails sent over shared connections, by result',
+                        self.email_messages, ('result',))
+
+        metric('plumber_process_start_time_seconds', 'gauge', 'Start time of this worker process')
+        sample('plumber_process_start_time_seconds', {}, PROCESS_START)
+        return '\n'.join(lines) + '\n'
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port, address='127.0.0.1'):
+    """Serve this process's registry over HTTP from a daemon thread (for non-web processes)"""
+    server = ThreadingHTTPServer((address, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+registry = MetricsRegistry()
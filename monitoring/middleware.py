@@ -1,8 +1,10 @@
 import time
 import logging
-from django.http import JsonResponse
-from django.db import connection
-from django.core.cache import cache
+from contextlib import ExitStack
+
+from django.db import connections
+
+from .metrics import RequestStats, current_request, registry
 
 logger = logging.getLogger(__name__)
 
@@ -11,16 +13,28 @@ class MonitoringMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        start_time = time.time()
-        
-        response = self.get_response(request)
+        start_time = time.perf_counter()
+        stats = RequestStats()
+        token = current_request.set(stats)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            current_request.reset(token)
         
         # Log slow requests
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         if duration > 2.0:  # Log requests taking more than 2 seconds
             logger.warning(f'Slow request: {request.path} took {duration:.2f}s')
         
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        size = None if response.streaming else len(response.content)
+        registry.observe_request(view, request.method, response.status_code, duration, stats, size)
+        
         # Add performance headers
         response['X-Response-Time'] = f'{duration:.3f}s'
         
-        return response
\ No newline at end of file
+        return response
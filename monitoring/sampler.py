@@ -0,0 +1,116 @@
+"""
+Background system sampler for the status endpoint.
+
+psutil.cpu_percent(interval=1) blocks the calling thread for a second, so
+system_status no longer samples in the request. Each worker process runs
+a daemon thread that takes a sample every MONITORING_SAMPLE_INTERVAL
+seconds into a ring buffer, and the view only copies what is there.
+The thread is started lazily on first use and restarted after a fork
+(gunicorn preloads the app, and threads do not survive fork). Until its
+first sample, sample_now() measures CPU over a short blocking window.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import psutil
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# CPU window of a sample taken in the request before the thread has one
+SAMPLE_NOW_CPU_INTERVAL = 0.1
+
+
+def take_sample(process, cpu_interval=None):
+    """
+    One sample. CPU is measured since the previous call in this thread (and
+    on this process object), or over cpu_interval seconds when given.
+    """
+    if cpu_interval:
+        process.cpu_percent(interval=None)
+        cpu_percent = psutil.cpu_percent(interval=cpu_interval)
+    else:
+        cpu_percent = psutil.cpu_percent(interval=None)
+    memory = psutil.virtual_memory()
+    load = os.getloadavg() if hasattr(os, 'getloadavg') else (None, None, None)
+    return {
+        'timestamp': time.time(),
+        'cpu_percent': cpu_percent,
+        'memory_percent': memory.percent,
+        'memory_available': memory.available,
+        'disk_percent': psutil.disk_usage('/').percent,
+        'load_1m': load[0],
+        'load_5m': load[1],
+        'load_15m': load[2],
+        'process_rss': process.memory_info().rss,
+        'process_cpu_percent': process.cpu_percent(interval=None),
+        'process_threads': process.num_threads(),
+    }
+
+
+class SystemSampler:
+    def __init__(self, interval, history_size):
+        self.interval = interval
+        self.history = deque(maxlen=history_size)
+        self.pid = os.getpid()
+        self._process = psutil.Process(self.pid)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='monitoring-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        # Prime the CPU counters so the first real sample covers one interval;
+        # psutil keeps the system-wide ones per thread
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+        while not self._stop.wait(self.interval):
+            try:
+                self.history.append(take_sample(self._process))
+            except Exception as e:
+                logger.warning(f'System sample failed: {e}')
+
+    def sample_now(self):
+        """
+        Sample in the calling thread, for when the thread has none yet. Uses
+        its own counters so the next background sample still covers a full
+        interval, and blocks for SAMPLE_NOW_CPU_INTERVAL to measure CPU.
+        """
+        return take_sample(psutil.Process(self.pid), cpu_interval=SAMPLE_NOW_CPU_INTERVAL)
+
+    def latest(self):
+        try:
+            return self.history[-1]
+        except IndexError:
+            return None
+
+    def recent(self, limit=None):
+        samples = list(self.history)
+        return samples[-limit:] if limit else samples
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler():
+    """The sampler of the current process, started on first use"""
+    global _sampler
+    if _sampler is None or _sampler.pid != os.getpid():
+        with _sampler_lock:
+            if _sampler is None or _sampler.pid != os.getpid():
+                sampler = SystemSampler(
+                    interval=settings.MONITORING_SAMPLE_INTERVAL,
+                    history_size=settings.MONITORING_SAMPLE_HISTORY,
+                )
+                sampler.start()
+                _sampler = sampler
+    return _sampler
@@ -4,4 +4,5 @@ from . import views
 urlpatterns = [
     path('health/', views.health_check, name='health_check'),
     path('status/', views.system_status, name='system_status'),
+    path('metrics', views.metrics, name='metrics'),
 ]
\ No newline at end of file
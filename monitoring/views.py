@@ -1,53 +1,39 @@
-from django.http import JsonResponse
-from django.db import connection
-from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
 from django.conf import settings
-import psutil
+from django.utils.crypto import constant_time_compare
 import time
 
+from .health import UNHEALTHY, get_health
+from .metrics import registry
+from .sampler import get_sampler
+
 def health_check(request):
-    """Basic health check endpoint"""
-    try:
-        # Test database connection
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-        
-        # Test cache connection
-        cache.set('health_check', 'ok', 10)
-        cache_status = cache.get('health_check') == 'ok'
-        
-        return JsonResponse({
-            'status': 'healthy',
-            'database': 'ok',
-            'cache': 'ok' if cache_status else 'error',
-            'timestamp': time.time()
-        })
-    except Exception as e:
-        return JsonResponse({
-            'status': 'unhealthy',
-            'error': str(e),
-            'timestamp': time.time()
-        }, status=503)
+    """Dependency health, refreshed at most every HEALTH_CHECK_CACHE_SECONDS"""
+    report, cached = get_health()
+    return JsonResponse(
+        {**report, 'cached': cached},
+        status=503 if report['status'] == UNHEALTHY else 200,
+    )
 
 def system_status(request):
-    """Detailed system status for monitoring"""
+    """Latest background system sample and a short history; never blocks on psutil"""
     try:
-        # System metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        
-        # Database queries count
-        db_queries = len(connection.queries) if settings.DEBUG else 0
+        sampler = get_sampler()
+        latest = sampler.latest()
+        if latest is None:
+            # Sampler just started; measure once here, briefly blocking
+            latest = sampler.sample_now()
+        try:
+            history = min(int(request.GET.get('history', 12)), settings.MONITORING_SAMPLE_HISTORY)
+        except ValueError:
+            history = 12
         
         return JsonResponse({
             'status': 'ok',
-            'system': {
-                'cpu_percent': cpu_percent,
-                'memory_percent': memory.percent,
-                'disk_percent': disk.percent,
-                'db_queries': db_queries
-            },
+            'pid': sampler.pid,
+            'sample_interval': sampler.interval,
+            'system': latest,
+            'history': sampler.recent(history) if history > 0 else [],
             'timestamp': time.time()
         })
     except Exception as e:
@@ -55,4 +41,17 @@ def system_status(request):
             'status': 'error',
             'error': str(e),
             'timestamp': time.time()
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+def metrics_allowed(request):
+    """Scrapes need the bearer token, or must come straight from an allowed IP rather than through the proxy"""
+    token = settings.METRICS_TOKEN
+    if token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    return 'X-Forwarded-For' not in request.headers and request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+
+def metrics(request):
+    """Request metrics of this worker in Prometheus text format"""
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -3,6 +3,9 @@ ASGI config for plumber_site project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Production serves the site over WSGI; this entry point backs the
+long-lived admin notification stream (core.notification_stream).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
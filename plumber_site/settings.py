@@ -52,17 +52,30 @@ if not DEBUG:
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
-    'core.middleware.SeparateSessionMiddleware',
+    'core.middleware.SessionRouterMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'customers.middleware.CustomerProfileMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 # Add production middleware
 if not DEBUG:
-    MIDDLEWARE.append('monitoring.middleware.MonitoringMiddleware')
+    # Right after WhiteNoise, so every view request is measured but static files are not
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('whitenoise.middleware.WhiteNoiseMiddleware') + 1,
+        'monitoring.middleware.MonitoringMiddleware',
+    )
+
+# Query budgets per view (core.query_budgets), checked on every request in development
+if DEBUG:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('whitenoise.middleware.WhiteNoiseMiddleware') + 1,
+        'core.middleware.QueryBudgetMiddleware',
+    )
+QUERY_BUDGET_STRICT = env.bool('QUERY_BUDGET_STRICT', default=False)
 
 ROOT_URLCONF = 'plumber_site.urls'
 
@@ -144,6 +157,10 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# MySQL skips partial (conditional) indexes; the ones we declare only help
+# on PostgreSQL/SQLite and the queries they serve are cached anyway
+SILENCED_SYSTEM_CHECKS = ['models.W037']
+
 # Crispy Forms Configuration
 CRISPY_ALLOWED_TEMPLATE_PACKS = "tailwind"
 CRISPY_TEMPLATE_PACK = "tailwind"
@@ -164,6 +181,33 @@ EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='SPRO Plumbing <noreply@sproplumbing.com>')
 ADMIN_EMAIL = env('ADMIN_EMAIL', default='admin@sproplumbing.com')
 
+# Email outbox: requests queue mail in the database and the
+# `python manage.py process_email_outbox` worker delivers it
+EMAIL_USE_OUTBOX = env.bool('EMAIL_USE_OUTBOX', default=not DEBUG)
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5  # then the message is moved to the dead letter state
+EMAIL_OUTBOX_RETRY_BACKOFF = 60  # seconds, doubled after every failed attempt
+EMAIL_BATCH_MAX_SIZE = env.int('EMAIL_BATCH_MAX_SIZE', default=100)  # messages per SMTP connection
+EMAIL_CONNECTION_IDLE_TIMEOUT = env.int('EMAIL_CONNECTION_IDLE_TIMEOUT', default=30)  # seconds
+
+# Blog post views are buffered (Redis or in-process) and written in batches;
+# without Redis each web process flushes its buffer this often
+BLOG_VIEW_FLUSH_INTERVAL = env.int('BLOG_VIEW_FLUSH_INTERVAL', default=60)  # seconds
+
+# Read admin notifications older than this are moved to the archive table
+# by `python manage.py archive_admin_notifications`
+ADMIN_NOTIFICATION_RETENTION_DAYS = env.int('ADMIN_NOTIFICATION_RETENTION_DAYS', default=90)
+
+# Each worker samples CPU, memory, disk and load in the background for
+# /monitoring/status/, keeping the last MONITORING_SAMPLE_HISTORY samples
+MONITORING_SAMPLE_INTERVAL = env.int('MONITORING_SAMPLE_INTERVAL', default=5)  # seconds
+MONITORING_SAMPLE_HISTORY = 60
+# /monitoring/health/ reruns its dependency checks at most this often per worker
+HEALTH_CHECK_CACHE_SECONDS = env.int('HEALTH_CHECK_CACHE_SECONDS', default=5)
+# /monitoring/metrics answers scrapes sent straight to the app server from
+# METRICS_ALLOWED_IPS; through nginx it needs `Authorization: Bearer METRICS_TOKEN`
+METRICS_ALLOWED_IPS = env.list('METRICS_ALLOWED_IPS', default=['127.0.0.1', '::1'])
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+
 # Security Settings
 SECURE_SSL_REDIRECT = env('SECURE_SSL_REDIRECT')
 SESSION_COOKIE_SECURE = env('SESSION_COOKIE_SECURE')
@@ -296,10 +340,10 @@ if DEBUG:
         }
     }
 else:
-    # Use Redis for production
+    # Use Redis for production; the monitoring subclass counts hits and misses
     CACHES = {
         'default': {
-            'BACKEND': 'django_redis.cache.RedisCache',
+            'BACKEND': 'monitoring.cache.RedisCache',
             'LOCATION': env('REDIS_URL', default='redis://127.0.0.1:6379/1'),
             'OPTIONS': {
                 'CLIENT_CLASS': 'django_redis.client.DefaultClient',
@@ -320,3 +364,11 @@ SESSION_COOKIE_NAME = 'sessionid'
 ADMIN_SESSION_COOKIE_NAME = 'admin_sessionid'
 CUSTOMER_SESSION_COOKIE_NAME = 'customer_sessionid'
 
+# (path prefix, cookie name, session engine) routes used by
+# core.middleware.SessionRouterMiddleware; None keeps SESSION_ENGINE
+SESSION_ROUTES = [
+    ('/admin/', ADMIN_SESSION_COOKIE_NAME, None),
+    ('/core/admin/', ADMIN_SESSION_COOKIE_NAME, None),  # admin JSON APIs
+    ('/portal/', CUSTOMER_SESSION_COOKIE_NAME, None),
+]
+
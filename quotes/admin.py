@@ -22,7 +22,7 @@ class QuoteRequestAdmin(admin.ModelAdmin):
     list_filter = ['status', 'service', 'created_at']
     list_editable = ['final_quote']
     readonly_fields = ['selected_options', 'estimated_total', 'created_at']
-    actions = ['mark_as_quoted', 'mark_as_accepted', 'mark_as_declined']
+    actions = ['mark_as_quoted', 'mark_as_accepted', 'mark_as_declined', 'recalculate_estimates']
     
     def status_dropdown(self, obj):
         return format_html(
@@ -58,8 +58,14 @@ class QuoteRequestAdmin(admin.ModelAdmin):
         self.message_user(request, f'{updated} quote(s) marked as declined.')
     mark_as_declined.short_description = "Mark selected quotes as declined"
     
+    def recalculate_estimates(self, request, queryset):
+        from .pricing import reprice_quotes
+        result = reprice_quotes(queryset, statuses=None)
+        self.message_user(request, f"{result['updated']} of {result['scanned']} estimate(s) updated from current rates.")
+    recalculate_estimates.short_description = "Recalculate estimates from current rates"
+    
     def changelist_view(self, request, extra_context=None):
-        from core.models import AdminNotification
+        from core.notifications import get_unread_count
         extra_context = extra_context or {}
-        extra_context['unread_notifications'] = AdminNotification.objects.filter(is_read=False, type='quote').count()
+        extra_context['unread_notifications'] = get_unread_count('quote')
         return super().changelist_view(request, extra_context=extra_context)
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Calculator payloads for the quote calculator page.
+
+Payloads are built from one prefetched query and cached as ready-to-send
+JSON together with an ETag and Last-Modified value. Cache keys carry the
+version counters of the source models (core.cache_versions), which
+quotes.signals bumps whenever a calculator or option is saved or deleted.
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.cache_versions import versioned_key
+
+from .models import QuoteCalculator
+
+CALCULATOR_CACHE_SOURCES = ('quotes.quotecalculator', 'quotes.quoteoption', 'services.service')
+CALCULATOR_CACHE_TIMEOUT = 3600  # seconds
+
+
+class CalculatorPayload:
+    """Serialized JSON body with the validators used for conditional requests"""
+
+    def __init__(self, data, last_modified):
+        self.found = data is not None
+        self.body = json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+        self.etag = '"%s"' % hashlib.md5(self.body).hexdigest()
+        self.last_modified = last_modified
+
+
+def active_calculators():
+    return (
+        QuoteCalculator.objects.filter(is_active=True)
+        .select_related('service')
+        .prefetch_related('options')
+    )
+
+
+def serialize_calculator(calculator):
+    options = list(calculator.options.all())
+    return {
+        'service_id': calculator.service_id,
+        'service_name': calculator.service.name,
+        'base_price': float(calculator.base_price),
+        'labor_rate': float(calculator.labor_rate_per_hour),
+        'estimated_hours': float(calculator.estimated_hours),
+        'options': [
+            {
+                'id': option.id,
+                'name': option.name,
+                'description': option.description,
+                'price': float(option.price_modifier),
+                'required': option.is_required,
+            }
+            for option in options
+        ]
+    }
+
+
+def last_modified_for(calculators):
+    timestamps = [calculator.updated_at for calculator in calculators]
+    for calculator in calculators:
+        timestamps.extend(option.updated_at for option in calculator.options.all())
+    return max(timestamps) if timestamps else None
+
+
+def _cached_payload(key, build):
+    payload = cache.get(key)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, CALCULATOR_CACHE_TIMEOUT)
+    return payload
+
+
+def get_calculator_payload(service_id):
+    """Payload for one service's calculator; its data is None when there is no active calculator"""
+    def build():
+        calculator = active_calculators().filter(service_id=service_id).first()
+        if calculator is None:
+            return CalculatorPayload(None, None)
+        return CalculatorPayload(serialize_calculator(calculator), last_modified_for([calculator]))
+
+    return _cached_payload(versioned_key(f'quotes:calculator:{service_id}', *CALCULATOR_CACHE_SOURCES), build)
+
+
+def get_all_calculators_payload():
+    """Every active calculator keyed by service id, for preloading the calculator page"""
+    def build():
+        calculators = list(active_calculators().filter(service__is_active=True))
+        data = {
+            'calculators': {
+                str(calculator.service_id): serialize_calculator(calculator) for calculator in calculators
+            }
+        }
+        return CalculatorPayload(data, last_modified_for(calculators))
+
+    return _cached_payload(versioned_key('quotes:calculators', *CALCULATOR_CACHE_SOURCES), build)
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0002_quoterequest_admin_notes_quoterequest_customer_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quoterequest',
+            index=models.Index(fields=['email', 'created_at'], name='quote_email_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quoterequest',
+            index=models.Index(fields=['customer', 'created_at'], name='quote_customer_created_idx'),
+        ),
+    ]
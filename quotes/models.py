@@ -8,6 +8,7 @@ class QuoteCalculator(models.Model):
     labor_rate_per_hour = models.DecimalField(max_digits=6, decimal_places=2)
     estimated_hours = models.DecimalField(max_digits=4, decimal_places=1)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"Calculator for {self.service.name}"
@@ -20,6 +21,7 @@ class QuoteOption(models.Model):
     price_modifier = models.DecimalField(max_digits=6, decimal_places=2, help_text="Additional cost")
     is_required = models.BooleanField(default=False)
     order = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['order']
@@ -62,6 +64,11 @@ class QuoteRequest(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Customer portal lookups: filter by email or customer, newest first
+            models.Index(fields=['email', 'created_at'], name='quote_email_created_idx'),
+            models.Index(fields=['customer', 'created_at'], name='quote_customer_created_idx'),
+        ]
     
     def __str__(self):
         return f"Quote for {self.customer_name} - {self.service.name}"
\ No newline at end of file
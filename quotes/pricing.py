@@ -0,0 +1,149 @@
+"""
+Quote pricing engine.
+
+    total = base price + labor rate x estimated hours + selected option modifiers
+
+Prices are computed with Decimal and rounded to cents. The calculators
+and options are compiled into a price table once and shared through the
+cache (keyed on the quote model version counters bumped by
+quotes.signals), so pricing a quote or re-pricing thousands of stored
+requests never goes back to the database for rates.
+"""
+from collections import namedtuple
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from core.cache_versions import versioned_key
+from customers.dashboard import invalidate_dashboard
+
+from .models import QuoteCalculator, QuoteRequest
+
+CENTS = Decimal('0.01')
+PRICE_TABLE_SOURCES = ('quotes.quotecalculator', 'quotes.quoteoption')
+PRICE_TABLE_TIMEOUT = 3600  # seconds
+
+# Quotes that have not been priced by staff yet; quoted/accepted ones keep their price
+REPRICE_STATUSES = ('pending', 'in_review')
+
+CalculatorPrice = namedtuple('CalculatorPrice', 'base labor options required is_active')
+QuotePrice = namedtuple('QuotePrice', 'base labor options_total total option_ids')
+
+
+class PricingError(ValueError):
+    pass
+
+
+def to_cents(value):
+    return Decimal(value).quantize(CENTS, rounding=ROUND_HALF_UP)
+
+
+def build_price_table():
+    """Compile every calculator into {service_id: CalculatorPrice} with one prefetched query"""
+    table = {}
+    for calculator in QuoteCalculator.objects.prefetch_related('options'):
+        options = list(calculator.options.all())
+        table[calculator.service_id] = CalculatorPrice(
+            base=calculator.base_price,
+            labor=calculator.labor_rate_per_hour * calculator.estimated_hours,
+            options={option.id: option.price_modifier for option in options},
+            required=frozenset(option.id for option in options if option.is_required),
+            is_active=calculator.is_active,
+        )
+    return table
+
+
+_local_table = (None, None)
+
+
+def get_price_table():
+    global _local_table
+    key = versioned_key('quotes:price_table', *PRICE_TABLE_SOURCES)
+    cached_key, table = _local_table
+    if cached_key == key:
+        return table
+    table = cache.get(key)
+    if table is None:
+        table = build_price_table()
+        cache.set(key, table, PRICE_TABLE_TIMEOUT)
+    _local_table = (key, table)
+    return table
+
+
+def price_quote(service_id, option_ids, table=None, strict=True):
+    """
+    Price a quote for a service and selected option ids. Required options
+    are always included. With strict=True an inactive calculator or an
+    unknown option raises PricingError; otherwise unknown options (e.g.
+    deleted since the quote was made) are skipped.
+    """
+    table = get_price_table() if table is None else table
+    try:
+        calculator = table.get(int(service_id))
+    except (TypeError, ValueError):
+        calculator = None
+    if calculator is None or (strict and not calculator.is_active):
+        raise PricingError(f'No quote calculator for service {service_id}')
+
+    try:
+        selected = {int(option_id) for option_id in option_ids or []}
+    except (TypeError, ValueError):
+        raise PricingError('Selected options must be option ids')
+    unknown = selected - calculator.options.keys()
+    if unknown and strict:
+        raise PricingError(f'Unknown options: {sorted(unknown)}')
+    applied = sorted((selected - unknown) | calculator.required)
+
+    options_total = sum((calculator.options[option_id] for option_id in applied), Decimal('0'))
+    return QuotePrice(
+        base=to_cents(calculator.base),
+        labor=to_cents(calculator.labor),
+        options_total=to_cents(options_total),
+        total=to_cents(calculator.base + calculator.labor + options_total),
+        option_ids=applied,
+    )
+
+
+def reprice_quotes(queryset=None, statuses=REPRICE_STATUSES, chunk_size=500):
+    """
+    Recompute estimated_total for stored quote requests from current rates,
+    writing only the changed rows with one bulk_update per chunk.
+    statuses=None reprices every status. Returns a dict of
+    scanned/updated/skipped counts.
+    """
+    table = get_price_table()
+    queryset = QuoteRequest.objects.all() if queryset is None else queryset
+    if statuses is not None:
+        queryset = queryset.filter(status__in=statuses)
+    queryset = queryset.only('id', 'service_id', 'selected_options', 'estimated_total', 'customer_id')
+
+    scanned = updated = skipped = 0
+    last_id = 0
+    while True:
+        chunk = list(queryset.filter(id__gt=last_id).order_by('id')[:chunk_size])
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+        scanned += len(chunk)
+
+        changed = []
+        now = timezone.now()
+        for quote in chunk:
+            try:
+                price = price_quote(quote.service_id, quote.selected_options, table=table, strict=False)
+            except PricingError:
+                skipped += 1
+                continue
+            if price.total != quote.estimated_total:
+                quote.estimated_total = price.total
+                quote.updated_at = now
+                changed.append(quote)
+        if changed:
+            with transaction.atomic():
+                QuoteRequest.objects.bulk_update(changed, ['estimated_total', 'updated_at'])
+            # bulk_update skips save signals
+            invalidate_dashboard(quote.customer_id for quote in changed)
+            updated += len(changed)
+    return {'scanned': scanned, 'updated': updated, 'skipped': skipped}
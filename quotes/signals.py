@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.cache_versions import bump_version
+
+from .models import QuoteCalculator, QuoteOption
+
+
+@receiver(post_save, sender=QuoteCalculator)
+@receiver(post_delete, sender=QuoteCalculator)
+@receiver(post_save, sender=QuoteOption)
+@receiver(post_delete, sender=QuoteOption)
+def calculator_changed(sender, **kwargs):
+    bump_version(sender._meta.label_lower)
@@ -1,8 +1,13 @@
-from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.shortcuts import render
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
 from services.models import Service
-from .models import QuoteCalculator, QuoteRequest
+from .models import QuoteRequest
+from .calculator_data import get_all_calculators_payload, get_calculator_payload
+from .pricing import PricingError, price_quote
 from core.email_utils import send_quote_confirmation_email, send_admin_quote_notification
 import json
 import logging
@@ -15,38 +20,53 @@ def quote_calculator(request):
     return render(request, 'quotes/calculator.html', {'services': services})
 
 
+def calculator_response(request, payload):
+    """JSON response for a cached payload, or a 304 when the client's copy is current"""
+    response = get_conditional_response(
+        request,
+        etag=payload.etag,
+        last_modified=payload.last_modified and int(payload.last_modified.timestamp()),
+    )
+    if response is None:
+        response = HttpResponse(payload.body, content_type='application/json')
+    response['ETag'] = payload.etag
+    if payload.last_modified:
+        response['Last-Modified'] = http_date(payload.last_modified.timestamp())
+    # Let browsers and nginx keep a copy but revalidate it every time
+    response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+    return response
+
+
+@require_GET
 def get_calculator_data(request, service_id):
-    calculator = get_object_or_404(QuoteCalculator, service_id=service_id, is_active=True)
-    data = {
-        'base_price': float(calculator.base_price),
-        'labor_rate': float(calculator.labor_rate_per_hour),
-        'estimated_hours': float(calculator.estimated_hours),
-        'options': [
-            {
-                'id': option.id,
-                'name': option.name,
-                'description': option.description,
-                'price': float(option.price_modifier),
-                'required': option.is_required,
-            }
-            for option in calculator.options.all()
-        ]
-    }
-    return JsonResponse(data)
+    payload = get_calculator_payload(service_id)
+    if not payload.found:
+        raise Http404('No active calculator for this service')
+    return calculator_response(request, payload)
+
+
+@require_GET
+def get_all_calculator_data(request):
+    return calculator_response(request, get_all_calculators_payload())
 
 
 @csrf_exempt
 def submit_quote_request(request):
     if request.method == 'POST':
         data = json.loads(request.body)
+        # Price on the server; the browser's estimate is display-only
+        try:
+            price = price_quote(data['service_id'], data.get('selected_options', []))
+        except PricingError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
         quote_request = QuoteRequest.objects.create(
             service_id=data['service_id'],
             customer_name=data['customer_name'],
             email=data['email'],
             phone=data['phone'],
             address=data['address'],
-            selected_options=data['selected_options'],
-            estimated_total=data['estimated_total'],
+            selected_options=price.option_ids,
+            estimated_total=price.total,
             notes=data.get('notes', ''),
         )
         
@@ -62,6 +82,7 @@ def submit_quote_request(request):
         return JsonResponse({
             'success': True, 
             'quote_id': quote_request.id,
+            'estimated_total': str(price.total),
             'email_sent': email_sent
         })
     return JsonResponse({'success': False})
\ No newline at end of file
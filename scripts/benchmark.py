@@ -0,0 +1,438 @@
+#!/usr/bin/env python
+"""
+Load-test benchmark for the public and portal endpoints.
+
+Drives each endpoint with a fixed number of requests at a given
+concurrency and reports p50/p95/p99 latency, throughput and (in-process)
+database queries per request. Results can be saved as a JSON baseline
+and compared with a later run to catch regressions between commits.
+
+Runs against the database in the current settings, seeded with the
+scripts/populate_* data (python scripts/populate_all_data.py) or
+`python manage.py generate_synthetic_data`:
+
+    # In-process through Django's test client; counts queries
+    python scripts/benchmark.py --requests 200 --concurrency 4 --save benchmarks/baseline.json
+
+    # Over HTTP against a running server (gunicorn or runserver on the same database)
+    python scripts/benchmark.py --base-url http://127.0.0.1:8000 --concurrency 16
+
+    # Compare with a saved baseline; exits 1 on a regression
+    python scripts/benchmark.py --compare benchmarks/baseline.json
+
+In-process numbers share one interpreter with the benchmark threads, so
+they are best for comparing commits; use --base-url for real
+concurrency. Throughput counts only the measured requests, not the
+warmup. Bookings created by the benchmark, their admin notifications,
+the emails they queued and the benchmark customer are deleted
+afterwards. In-process, emails go to the in-memory backend instead of
+the outbox; over HTTP the server's emails can't be intercepted, so
+booking_post is refused when the outbox or SMTP is configured.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import count
+from pathlib import Path
+
+import django
+
+# Add the project directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Set up Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'plumber_site.settings')
+django.setup()
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from areas.models import ServiceArea
+from blog.models import BlogPost
+from bookings.models import Booking
+from core.models import AdminNotification, EmailOutbox
+from core.query_budget import record_queries
+from customers.models import CustomerProfile
+from quotes.models import QuoteCalculator
+from services.models import Service
+
+BENCHMARK_EMAIL = 'benchmark@example.com'
+BENCHMARK_USER = 'benchmark-customer'
+BENCHMARK_PASSWORD = 'benchmark-Pa55!'
+PERCENTILES = (50, 95, 99)
+
+
+def load_fixtures():
+    """Slugs and ids to rotate through, from the seeded database"""
+    fixtures = {
+        'locations': list(ServiceArea.objects.filter(is_active=True).values_list('slug', flat=True)[:10]),
+        'posts': list(BlogPost.objects.filter(is_published=True).values_list('slug', flat=True)[:10]),
+        'calculators': list(
+            QuoteCalculator.objects.filter(is_active=True, service__is_active=True).values_list('service_id', flat=True)[:10]
+        ),
+        'services': list(Service.objects.filter(is_active=True).values_list('id', flat=True)[:10]),
+        'areas': list(ServiceArea.objects.filter(is_active=True).values_list('id', flat=True)[:10]),
+    }
+    missing = [name for name, values in fixtures.items() if not values]
+    if missing:
+        sys.exit(f"No {', '.join(missing)} in the database; seed it with scripts/populate_all_data.py first")
+    return fixtures
+
+
+def booking_data(fixtures, n):
+    return {
+        'customer_name': 'Benchmark Customer',
+        'email': BENCHMARK_EMAIL,
+        'phone': '506-234-5678',
+        'address': '1 Benchmark Street',
+        'service': fixtures['services'][n % len(fixtures['services'])],
+        'service_area': fixtures['areas'][n % len(fixtures['areas'])],
+        'urgency': 'medium',
+        'preferred_date': (timezone.localtime() + timedelta(days=3)).strftime('%Y-%m-%dT%H:%M'),
+        'description': 'Benchmark booking',
+    }
+
+
+def endpoints(fixtures):
+    """name -> (method, url(n), POST data(n) or None, needs a logged in customer)"""
+    def rotate(key, build):
+        values = fixtures[key]
+        return lambda n: build(values[n % len(values)])
+
+    return {
+        'home': ('GET', lambda n: reverse('main:home'), None, False),
+        'location_home': ('GET', rotate('locations', lambda slug: reverse('location_home', args=[slug])), None, False),
+        'location_services': (
+            'GET', rotate('locations', lambda slug: reverse('location_services', args=[slug])), None, False
+        ),
+        'gallery': ('GET', lambda n: reverse('main:gallery'), None, False),
+        'blog_list': ('GET', lambda n: reverse('blog:blog_list'), None, False),
+        'blog_detail': ('GET', rotate('posts', lambda slug: reverse('blog:blog_detail', args=[slug])), None, False),
+        'calculator_json': (
+            'GET', rotate('calculators', lambda sid: reverse('quotes:calculator_data', args=[sid])), None, False
+        ),
+        'all_calculators_json': ('GET', lambda n: reverse('quotes:all_calculator_data'), None, False),
+        'booking_post': ('POST', lambda n: reverse('main:booking'), lambda n: booking_data(fixtures, n), False),
+        'portal_dashboard': ('GET', lambda n: reverse('customers:dashboard'), None, True),
+    }
+
+
+def ensure_benchmark_customer():
+    user, created = User.objects.get_or_create(
+        username=BENCHMARK_USER, defaults={'email': BENCHMARK_EMAIL, 'first_name': 'Benchmark'}
+    )
+    if created or not user.check_password(BENCHMARK_PASSWORD):
+        user.set_password(BENCHMARK_PASSWORD)
+        user.save()
+    CustomerProfile.objects.get_or_create(user=user)
+    return user.username, BENCHMARK_PASSWORD
+
+
+class InProcessSession:
+    """Django test client for one benchmark thread; records queries per request"""
+    counts_queries = True
+
+    def __init__(self):
+        self.client = Client()
+
+    def login(self, username, password):
+        self.client.post(reverse('customers:login'), {'username': username, 'password': password})
+
+    def request(self, method, url, data=None):
+        with record_queries() as recorder:
+            if method == 'POST':
+                response = self.client.post(url, data)
+            else:
+                response = self.client.get(url)
+        return response.status_code, recorder.count
+
+
+class HTTPSession:
+    """urllib session with cookies and CSRF handling for one benchmark thread"""
+    counts_queries = False
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), NoRedirect()
+        )
+
+    def csrf_token(self, url):
+        self.request('GET', url)
+        for cookie in self.cookies:
+            if cookie.name == settings.CSRF_COOKIE_NAME:
+                return cookie.value
+        return ''
+
+    def login(self, username, password):
+        url = reverse('customers:login')
+        token = self.csrf_token(url)
+        self.request('POST', url, {'username': username, 'password': password, 'csrfmiddlewaretoken': token})
+
+    def request(self, method, url, data=None):
+        full_url = self.base_url + url
+        body = None
+        headers = {'Referer': full_url}
+        if method == 'POST':
+            data = dict(data)
+            data.setdefault('csrfmiddlewaretoken', next(
+                (cookie.value for cookie in self.cookies if cookie.name == settings.CSRF_COOKIE_NAME), ''
+            ))
+            body = urllib.parse.urlencode(data).encode()
+        try:
+            with self.opener.open(urllib.request.Request(full_url, body, headers, method=method), timeout=30) as r:
+                r.read()
+                return r.status, None
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code, None
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def run_endpoint(name, spec, sessions, requests, warmup):
+    method, url_for, data_for, needs_login = spec
+    counter = count()
+    lock = threading.Lock()
+    latencies, queries = [], []
+    errors = 0
+
+    def worker(session, total, measured):
+        nonlocal errors
+        for _ in range(total):
+            with lock:
+                n = next(counter)
+            url = url_for(n)
+            data = data_for(n) if data_for else None
+            start = time.perf_counter()
+            try:
+                status, query_count = session.request(method, url, data)
+            except Exception:
+                status, query_count = None, None
+            elapsed = time.perf_counter() - start
+            if not measured:
+                continue
+            with lock:
+                latencies.append(elapsed)
+                if query_count is not None:
+                    queries.append(query_count)
+                # A redirected GET (e.g. to the login page) did not serve the endpoint
+                if status is None or status >= 400 or (method == 'GET' and status >= 300):
+                    errors += 1
+
+    def drive(total, measured):
+        per_thread = [total // len(sessions) + (1 if i < total % len(sessions) else 0) for i in range(len(sessions))]
+        with ThreadPoolExecutor(max_workers=len(sessions)) as pool:
+            for future in [pool.submit(worker, session, n, measured) for session, n in zip(sessions, per_thread)]:
+                future.result()
+
+    drive(warmup, measured=False)
+    started = time.perf_counter()
+    drive(requests, measured=True)
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    result = {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / wall, 1) if wall else None,
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+    }
+    for pct in PERCENTILES:
+        value = percentile(latencies, pct)
+        result[f'p{pct}_ms'] = round(value * 1000, 2) if value is not None else None
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent.parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results):
+    print(f"\n{'endpoint':<22} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'queries':>8} {'errors':>7}")
+    for name, result in results.items():
+        print(
+            f"{name:<22} {fmt(result['p50_ms']):>8} {fmt(result['p95_ms']):>8} {fmt(result['p99_ms']):>8} "
+            f"{fmt(result['throughput_rps']):>8} {fmt(result['queries_per_request']):>8} {result['errors']:>7}"
+        )
+
+
+def fmt(value):
+    return '-' if value is None else f'{value:.1f}' if isinstance(value, float) else str(value)
+
+
+def compare(results, meta, baseline, threshold):
+    """Print the change against a baseline; returns the regressions"""
+    regressions = []
+    for key in ('mode', 'database', 'concurrency'):
+        if baseline['meta'].get(key) != meta[key]:
+            print(f"Warning: baseline {key} was {baseline['meta'].get(key)}, this run is {meta[key]}")
+    print(f"\nCompared with {baseline['meta'].get('commit') or 'baseline'} ({baseline['meta'].get('created_at')}):")
+    print(f"{'endpoint':<22} {'p50':>9} {'p95':>9} {'queries':>9}")
+    for name, result in results.items():
+        old = baseline['results'].get(name)
+        if not old:
+            print(f'{name:<22} (not in baseline)')
+            continue
+        changes = []
+        for key in ('p50_ms', 'p95_ms'):
+            if old.get(key) and result.get(key) is not None:
+                change = (result[key] - old[key]) / old[key] * 100
+                changes.append(f'{change:+.0f}%')
+                if key == 'p95_ms' and change > threshold:
+                    regressions.append(f'{name}: p95 {old[key]} ms -> {result[key]} ms ({change:+.0f}%)')
+            else:
+                changes.append('-')
+        old_queries, new_queries = old.get('queries_per_request'), result.get('queries_per_request')
+        if old_queries is not None and new_queries is not None:
+            changes.append(f'{new_queries - old_queries:+.1f}')
+            if new_queries > old_queries + 0.5:
+                regressions.append(f'{name}: queries per request {old_queries} -> {new_queries}')
+        else:
+            changes.append('-')
+        print(f'{name:<22} {changes[0]:>9} {changes[1]:>9} {changes[2]:>9}')
+    return regressions
+
+
+def sends_real_email():
+    return getattr(settings, 'EMAIL_USE_OUTBOX', False) or settings.EMAIL_BACKEND.endswith('smtp.EmailBackend')
+
+
+def cleanup(outbox_mark):
+    """
+    Delete what the benchmark created: booking_post's bookings, their admin
+    notifications and any emails they queued after outbox_mark (the
+    customer confirmations and the admin copies, which quote the customer's
+    email), and the benchmark customer.
+    """
+    booking_ids = list(Booking.objects.filter(email=BENCHMARK_EMAIL).values_list('id', flat=True))
+    AdminNotification.objects.filter(type='booking', related_id__in=booking_ids).delete()
+    Booking.objects.filter(id__in=booking_ids).delete()
+    queued = EmailOutbox.objects.filter(id__gt=outbox_mark).exclude(status='sent')
+    emails = [
+        entry.id for entry in queued.only('id', 'to', 'body')
+        if BENCHMARK_EMAIL in entry.to or BENCHMARK_EMAIL in entry.body
+    ]
+    EmailOutbox.objects.filter(id__in=emails).delete()
+    # Deletes the profile too
+    User.objects.filter(username=BENCHMARK_USER).delete()
+    return len(booking_ids), len(emails)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the public and portal endpoints')
+    parser.add_argument('--requests', type=int, default=100, help='Measured requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per endpoint first')
+    parser.add_argument('--concurrency', type=int, default=4, help='Parallel clients')
+    parser.add_argument('--base-url', help='Benchmark a running server over HTTP instead of in-process')
+    parser.add_argument('--endpoints', nargs='+', help='Endpoints to run (default: all)')
+    parser.add_argument('--save', help='Write the results as a JSON baseline to this path')
+    parser.add_argument('--compare', help='Baseline JSON to compare with; exits 1 on a regression')
+    parser.add_argument('--threshold', type=float, default=15, help='p95 slowdown in percent counted as a regression')
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    specs = endpoints(fixtures)
+    names = args.endpoints or list(specs)
+    unknown = set(names) - set(specs)
+    if unknown:
+        sys.exit(f"Unknown endpoints: {', '.join(sorted(unknown))}. Available: {', '.join(specs)}")
+
+    if args.base_url:
+        if 'booking_post' in names and sends_real_email():
+            sys.exit(
+                'booking_post would make the server queue or send real emails (EMAIL_USE_OUTBOX or SMTP); '
+                'leave it out with --endpoints or benchmark in-process'
+            )
+        sessions = [HTTPSession(args.base_url) for _ in range(args.concurrency)]
+    else:
+        setup_test_environment()  # test client host, in-memory email backend
+        # Send the booking emails to the in-memory backend instead of queueing them for the worker
+        override_settings(EMAIL_USE_OUTBOX=False).enable()
+        sessions = [InProcessSession() for _ in range(args.concurrency)]
+    outbox_mark = EmailOutbox.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    if any(specs[name][3] for name in names):
+        username, password = ensure_benchmark_customer()
+        for session in sessions:
+            session.login(username, password)
+
+    mode = f'http {args.base_url}' if args.base_url else 'in-process'
+    print(f'Benchmarking {len(names)} endpoint(s) {mode}, {args.requests} requests at concurrency {args.concurrency}')
+    results = {}
+    try:
+        for name in names:
+            results[name] = run_endpoint(name, specs[name], sessions, args.requests, args.warmup)
+            print(f"  {name}: p95 {fmt(results[name]['p95_ms'])} ms")
+    finally:
+        bookings, emails = cleanup(outbox_mark)
+        if bookings or emails:
+            print(f'Removed {bookings} benchmark booking(s) and {emails} queued email(s)')
+
+    print_results(results)
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': timezone.now().isoformat(),
+            'mode': mode,
+            'database': connection.vendor,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        },
+        'results': results,
+    }
+    if args.save:
+        path = Path(args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2) + '\n')
+        print(f'\nSaved baseline to {path}')
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(results, report['meta'], baseline, args.threshold)
+        if regressions:
+            print('\nRegressions:')
+            for regression in regressions:
+                print(f'  {regression}')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,7 @@ class ServiceAdmin(admin.ModelAdmin):
 @admin.register(Testimonial)
 class TestimonialAdmin(admin.ModelAdmin):
     list_display = ['customer_name', 'service', 'location', 'rating_stars', 'is_approved', 'is_verified', 'created_at']
+    list_select_related = ['service', 'location']
     list_filter = ['rating', 'is_approved', 'is_verified', 'created_at', 'service', 'location']
     search_fields = ['customer_name', 'email', 'comment', 'title']
     list_editable = ['is_approved', 'is_verified']